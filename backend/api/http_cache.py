@@ -0,0 +1,72 @@
+"""
+ETags and conditional GET for catalog responses
+
+ETags are derived from versions instead of hashing response bodies, so a
+matching If-None-Match is answered with 304 after one primary-key read and
+before any serialization runs. A tag is built from the change counters the
+database keeps by trigger (catalog_state.get_stored_versions), which count
+every write from every process, so the same content gets the same tag from
+any worker and across restarts. Likes still in this process's write-behind
+buffer add a digest of the buffered state.
+"""
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from core.config import HttpCacheSettings
+from services.catalog_state import get_stored_versions
+from services.like_buffer import get_like_write_buffer
+
+
+def version_etag(*versions) -> str:
+    """Weak ETag for a representation that only changes with the given versions"""
+    return f'W/"{"-".join(str(version) for version in versions)}"'
+
+
+def catalog_etag(db: Session, likes: bool = True) -> str:
+    """
+    ETag of catalog content
+
+    Args:
+        likes: The representation includes like counts or like state, so it
+            also follows like writes and buffered likes
+    """
+    recipes_version, likes_version = get_stored_versions(db)
+    if not likes:
+        return version_etag(recipes_version)
+    buffer = get_like_write_buffer()
+    digest = buffer.state_digest() if buffer is not None else None
+    if digest is None:
+        return version_etag(recipes_version, likes_version)
+    return version_etag(recipes_version, likes_version, digest)
+
+
+def cache_control_for(user_id: Optional[int]) -> str:
+    """
+    Anonymous responses may be cached by browsers and CDNs; per-user ones
+    only privately, and always revalidated
+    """
+    if user_id:
+        return "private, no-cache"
+    return f"public, max-age={HttpCacheSettings.PUBLIC_MAX_AGE_SECONDS}"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak If-None-Match comparison against the current ETag"""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque for tag in header.split(','))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': cache_control})
+
+
+def with_cache_headers(response: Response, etag: str, cache_control: str) -> Response:
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = cache_control
+    return response
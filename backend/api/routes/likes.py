@@ -3,58 +3,63 @@ Recipe likes API routes
 """
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from datetime import datetime
 import logging
 
 from core.database import get_db
 from core.models import Recipe, User, Like
-from core.schemas import LikeResponse, RecipeLikeCount
+from core.schemas import LikeQueuedResponse, LikeResponse, RecipeLikeCount, RecipeLikesBulkRequest
+from core.responses import FastJSONResponse
+from services.like_buffer import get_like_write_buffer
+from services.like_service import add_like, remove_like
+from services.recipe_query_service import get_recipe_like_counts, get_user_liked_recipe_ids
+from services.recipe_read_model import load_records, select_records
+from services.user_liked_cache import get_user_liked_set
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/recipes", tags=["likes"])
 
+# Write-behind mode (LikeWriteBehindSettings) answers 202 once the change is
+# queued; the like row, and so its id and created_at, only exist after a flush
+_QUEUED_RESPONSE = {202: {'model': LikeQueuedResponse, 'description': "Change queued by the write-behind buffer"}}
 
-@router.post('/{recipe_id}/like/{user_id}', response_model=LikeResponse)
+
+def _queued(recipe_id: int, user_id: int, liked: bool, changed: bool) -> FastJSONResponse:
+    return FastJSONResponse(
+        LikeQueuedResponse(recipe_id=recipe_id, user_id=user_id, liked=liked, changed=changed).model_dump(),
+        status_code=202
+    )
+
+
+@router.post('/{recipe_id}/like/{user_id}', response_model=LikeResponse, responses=_QUEUED_RESPONSE)
 async def like_recipe(recipe_id: int, user_id: int, db: Session = Depends(get_db)):
     """Like a recipe (user can only like once)"""
     try:
         logger.info(f"User {user_id} attempting to like recipe {recipe_id}")
-        
-        # Check if recipe exists
-        recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
-        if not recipe:
-            raise HTTPException(status_code=404, detail="Recipe not found")
-        
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Check if user already liked this recipe
-        existing_like = db.query(Like).filter(
-            Like.user_id == user_id, 
-            Like.recipe_id == recipe_id
-        ).first()
-        
-        if existing_like:
+
+        # Write-behind mode: acknowledge once queued, the row id comes later
+        buffer = get_like_write_buffer()
+        if buffer is not None:
+            try:
+                created = buffer.enqueue(db, user_id, recipe_id, liked=True)
+            except ValueError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            return _queued(recipe_id, user_id, liked=True, changed=created)
+        
+        # Create the like in one statement (no-op if it already exists);
+        # the insert itself checks that the recipe and user exist
+        try:
+            like, created = add_like(db, user_id, recipe_id)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        
+        if not created:
             # Already liked - just return the existing like
             logger.info(f"User {user_id} already liked recipe {recipe_id}")
-            return existing_like
-        
-        # Create new like
-        new_like = Like(
-            user_id=user_id,
-            recipe_id=recipe_id,
-            created_at=datetime.utcnow()
-        )
-        
-        db.add(new_like)
-        db.commit()
-        db.refresh(new_like)
+            return like
         
         logger.info(f"User {user_id} successfully liked recipe {recipe_id}")
-        return new_like
+        return like
         
     except HTTPException:
         raise
@@ -63,6 +68,36 @@ async def like_recipe(recipe_id: int, user_id: int, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail="Failed to like recipe")
 
 
+@router.post('/likes/bulk')
+async def get_recipe_likes_bulk(request: RecipeLikesBulkRequest, db: Session = Depends(get_db)):
+    """
+    Like counts and `user_has_liked` for a page of recipes in one request
+
+    Runs one query for the counts and one for the user's likes among them,
+    whatever the number of recipes. Results follow the requested order;
+    unknown ids are reported in `missing_ids`.
+    """
+    try:
+        recipe_ids = list(dict.fromkeys(request.recipe_ids))
+        like_counts = get_recipe_like_counts(db, recipe_ids)
+        liked_ids = get_user_liked_recipe_ids(db, request.user_id, like_counts)
+
+        return FastJSONResponse({
+            'likes': [
+                {
+                    'recipe_id': recipe_id,
+                    'like_count': like_counts[recipe_id],
+                    'user_has_liked': recipe_id in liked_ids
+                }
+                for recipe_id in recipe_ids if recipe_id in like_counts
+            ],
+            'missing_ids': [recipe_id for recipe_id in recipe_ids if recipe_id not in like_counts]
+        })
+    except Exception as e:
+        logger.error(f"Error getting bulk like info: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get like information")
+
+
 @router.get('/{recipe_id}/likes/{user_id}', response_model=RecipeLikeCount)
 async def get_recipe_like_info(recipe_id: int, user_id: int, db: Session = Depends(get_db)):
     """Get like count for a recipe and whether current user has liked it"""
@@ -72,14 +107,17 @@ async def get_recipe_like_info(recipe_id: int, user_id: int, db: Session = Depen
         if not recipe:
             raise HTTPException(status_code=404, detail="Recipe not found")
         
-        # Count total likes for this recipe
-        like_count = db.query(Like).filter(Like.recipe_id == recipe_id).count()
+        # Like count is denormalized onto the recipe row
+        like_count = recipe.like_count
         
-        # Check if current user has liked this recipe
-        user_has_liked = db.query(Like).filter(
-            Like.user_id == user_id, 
-            Like.recipe_id == recipe_id
-        ).first() is not None
+        # Check if current user has liked this recipe (cached liked set)
+        user_has_liked = recipe_id in get_user_liked_set(db, user_id)
+
+        # Likes not yet written by the write-behind buffer
+        buffer = get_like_write_buffer()
+        if buffer is not None:
+            like_count += buffer.count_delta(recipe_id)
+            user_has_liked = buffer.user_overrides(user_id).get(recipe_id, user_has_liked)
         
         return RecipeLikeCount(
             recipe_id=recipe_id,
@@ -94,31 +132,30 @@ async def get_recipe_like_info(recipe_id: int, user_id: int, db: Session = Depen
         raise HTTPException(status_code=500, detail="Failed to get like information")
 
 
-@router.delete('/{recipe_id}/unlike/{user_id}')
+@router.delete('/{recipe_id}/unlike/{user_id}', responses=_QUEUED_RESPONSE)
 async def unlike_recipe(recipe_id: int, user_id: int, db: Session = Depends(get_db)):
     """Unlike a recipe (remove like)"""
     try:
         logger.info(f"User {user_id} attempting to unlike recipe {recipe_id}")
-        
-        # Check if recipe exists
-        recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
-        if not recipe:
-            raise HTTPException(status_code=404, detail="Recipe not found")
-        
-        # Find the existing like
-        existing_like = db.query(Like).filter(
-            Like.user_id == user_id, 
-            Like.recipe_id == recipe_id
-        ).first()
-        
-        if not existing_like:
+
+        buffer = get_like_write_buffer()
+        if buffer is not None:
+            try:
+                removed = buffer.enqueue(db, user_id, recipe_id, liked=False)
+            except ValueError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            if not removed:
+                raise HTTPException(status_code=404, detail="Like not found")
+            return _queued(recipe_id, user_id, liked=False, changed=True)
+        
+        # Delete the like and decrement the counter in one statement
+        if not remove_like(db, user_id, recipe_id):
+            # Only now find out which of the two is missing
+            if db.query(Recipe.id).filter(Recipe.id == recipe_id).first() is None:
+                raise HTTPException(status_code=404, detail="Recipe not found")
             # User hasn't liked this recipe
             raise HTTPException(status_code=404, detail="Like not found")
         
-        # Delete the like
-        db.delete(existing_like)
-        db.commit()
-        
         logger.info(f"User {user_id} successfully unliked recipe {recipe_id}")
         return {"message": "Recipe unliked successfully"}
         
@@ -140,13 +177,24 @@ async def get_user_liked_recipes(user_id: int, db: Session = Depends(get_db)):
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Get all recipes liked by this user
-        liked_recipes = db.query(Recipe).join(Like).filter(
-            Like.user_id == user_id
-        ).all()
+        # Get all recipes liked by this user (plain records, encoded directly)
+        liked_recipes = load_records(db, select_records().join(
+            Like, Like.recipe_id == Recipe.id
+        ).where(Like.user_id == user_id))
+
+        # Likes and unlikes not yet written by the write-behind buffer
+        buffer = get_like_write_buffer()
+        overrides = buffer.user_overrides(user_id) if buffer is not None else None
+        if overrides:
+            liked_recipes = [recipe for recipe in liked_recipes if overrides.get(recipe.id, True)]
+            listed_ids = {recipe.id for recipe in liked_recipes}
+            queued_ids = [recipe_id for recipe_id, liked in overrides.items()
+                          if liked and recipe_id not in listed_ids]
+            if queued_ids:
+                liked_recipes += load_records(db, select_records().where(Recipe.id.in_(queued_ids)))
         
         logger.info(f"Found {len(liked_recipes)} liked recipes for user {user_id}")
-        return liked_recipes
+        return FastJSONResponse(liked_recipes)
         
     except HTTPException:
         raise
@@ -1,83 +1,466 @@
 """
 Recipe-related API routes
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 import logging
 
+from api.http_cache import cache_control_for, catalog_etag, etag_matches, not_modified, with_cache_headers
 from core.database import get_db
-from core.models import Recipe, DietaryRestriction, UserPreferences, Like
-from core.schemas import RecipeResponse
-from core.config import DefaultPreferences
+from core.models import Recipe, DietaryRestriction, UserPreferences
+from core.schemas import RecipeBatchRequest, RecipeResponse
+from core.config import DefaultPreferences, PaginationLimits, PantrySettings, TrendingSettings
+from core.responses import FastJSONResponse
 from services.recommendation_service import get_recipe_recommendations
+from services.recipe_query_service import get_recipe_page, get_recipes_by_ids, get_user_liked_recipe_ids
+from services.facet_service import get_recipe_facets
+from services.pantry_index import match_pantry
+from services.recipe_export import EXPORT_MEDIA_TYPES, iter_recipe_export
+from services.recipe_search_service import search_recipe_ids
+from services.trending import get_trending_page
+from services.recipe_serializer import (
+    encode_listing_response,
+    encode_recipe_detail,
+    encode_recipe_listing,
+    encode_recipe_listings,
+    listing_columns,
+    parse_listing_fields
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
 
+def _validate_page_window(limit: int, offset: int) -> None:
+    """Reject page sizes and offsets outside PaginationLimits"""
+    if limit < 1 or limit > PaginationLimits.MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Limit must be between 1 and {PaginationLimits.MAX_PAGE_SIZE}"
+        )
+    if offset < 0 or offset > PaginationLimits.MAX_OFFSET:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Offset must be between 0 and {PaginationLimits.MAX_OFFSET}; use cursor for deeper pages"
+        )
+
+
+def _parse_fields(fields: str = None):
+    """Listing projection from a `fields` parameter; unknown fields are a 400"""
+    try:
+        return parse_listing_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _json_response(body: bytes) -> Response:
+    """Send an already encoded JSON body as is"""
+    return Response(content=body, media_type="application/json")
+
+
+def _parse_diet_filter(dietary_restrictions: str = None):
+    """Optional diet filter from a query parameter; unknown values are a 400"""
+    if dietary_restrictions is None:
+        return None
+    try:
+        return DietaryRestriction(dietary_restrictions)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Unknown dietary restriction: {dietary_restrictions}")
+
+
 @router.get("/")
-async def get_all_recipes(user_id: int = None, db: Session = Depends(get_db)):
-    """Get all recipes with like information"""
+async def get_all_recipes(
+    request: Request,
+    user_id: int = None,
+    limit: int = PaginationLimits.DEFAULT_PAGE_SIZE,
+    cursor: str = None,
+    offset: int = 0,
+    sort: str = 'id',
+    order: str = 'asc',
+    fields: str = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get one page of recipes with like information
+
+    Pages are keyset-paginated: pass the returned `next_cursor` back as
+    `cursor` to fetch the following page. `offset` is only accepted for
+    shallow pages (up to PaginationLimits.MAX_OFFSET).
+
+    Args:
+        user_id: Optional user ID for `user_has_liked`
+        limit: Page size (1..PaginationLimits.MAX_PAGE_SIZE)
+        cursor: Cursor from the previous page
+        offset: Number of recipes to skip when no cursor is given
+        sort: One of id, budget, cooking_time, likes. The likes order
+            counts buffered (not yet written) likes only when the catalog
+            snapshot is enabled
+        order: asc or desc
+        fields: Comma-separated listing fields, or "summary" for card
+            fields only; unrequested columns are not read from the database
+    """
+    _validate_page_window(limit, offset)
+    projection = _parse_fields(fields)
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either cursor or offset, not both")
+
+    # Listings carry like_count, so they change with likes too
+    etag = catalog_etag(db)
+    cache_control = cache_control_for(user_id)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+
     try:
-        recipes = db.query(Recipe).all()
-        result = []
-        
-        for recipe in recipes:
-            # Parse JSON fields
-            import json
-            ingredients = json.loads(recipe.ingredients) if recipe.ingredients else []
-            instructions = json.loads(recipe.instructions) if recipe.instructions else []
-            
-            # Get like information
-            like_count = db.query(Like).filter(Like.recipe_id == recipe.id).count()
-            user_has_liked = False
-            if user_id:
-                user_has_liked = db.query(Like).filter(
-                    Like.user_id == user_id, 
-                    Like.recipe_id == recipe.id
-                ).first() is not None
-            
-            recipe_data = {
-                'id': recipe.id,
-                'title': recipe.title,
-                'description': recipe.description,
-                'ingredients': ingredients,
-                'instructions': instructions,
-                'cooking_time': recipe.cooking_time,
-                'prep_time': recipe.prep_time,
-                'difficulty': recipe.difficulty.value,
-                'servings': recipe.servings,
-                'budget': recipe.budget,
-                'calories_per_serving': recipe.calories_per_serving,
-                'cuisine': recipe.cuisine,
-                'dietary_restrictions': recipe.dietary_restrictions.value,
-                'image_url': recipe.image_url,
-                'is_featured': bool(recipe.is_featured),
-                'average_rating': recipe.average_rating,
-                'created_at': recipe.created_at,
-                'like_count': like_count,
-                'user_has_liked': user_has_liked
+        page, next_cursor = get_recipe_page(
+            db, sort, order, limit, cursor, offset, listing_columns(projection)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        liked_ids = get_user_liked_recipe_ids(db, user_id, [recipe.id for recipe, _ in page])
+        result = encode_recipe_listings(
+            ((recipe, like_count, recipe.id in liked_ids) for recipe, like_count in page),
+            projection
+        )
+
+        return with_cache_headers(_json_response(encode_listing_response(
+            result,
+            pagination={
+                'limit': limit,
+                'offset': offset,
+                'sort': sort,
+                'order': order,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
             }
-            result.append(recipe_data)
-        
-        return result
+        )), etag, cache_control)
     except Exception as e:
         logger.error(f"Error retrieving recipes: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve recipes")
 
 
+@router.get("/search")
+async def search_recipes(
+    request: Request,
+    q: str,
+    user_id: int = None,
+    limit: int = PaginationLimits.DEFAULT_PAGE_SIZE,
+    offset: int = 0,
+    max_budget: float = None,
+    max_cooking_time: int = None,
+    dietary_restrictions: str = None,
+    fields: str = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over recipe titles, descriptions, cuisines and ingredients
+
+    Results are ranked by BM25 (title matches weigh most) and every word is
+    matched as a prefix, so "chick cur" finds "Chicken Curry".
+
+    Args:
+        q: Search text
+        user_id: Optional user ID for `user_has_liked`
+        limit: Page size (1..PaginationLimits.MAX_PAGE_SIZE)
+        offset: Number of matches to skip (up to PaginationLimits.MAX_OFFSET)
+        max_budget: Optional budget filter
+        max_cooking_time: Optional cooking time filter
+        dietary_restrictions: Optional diet filter (e.g. vegan)
+        fields: Comma-separated listing fields, or "summary"
+    """
+    _validate_page_window(limit, offset)
+    diet = _parse_diet_filter(dietary_restrictions)
+    projection = _parse_fields(fields)
+
+    etag = catalog_etag(db)
+    cache_control = cache_control_for(user_id)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+
+    try:
+        recipe_ids, has_more = search_recipe_ids(
+            db, q, limit, offset, max_budget, max_cooking_time, diet
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        recipes = get_recipes_by_ids(db, recipe_ids, listing_columns(projection))
+        liked_ids = get_user_liked_recipe_ids(db, user_id, recipe_ids)
+        result = encode_recipe_listings(
+            ((recipe, recipe.like_count, recipe.id in liked_ids) for recipe in recipes),
+            projection
+        )
+
+        return with_cache_headers(_json_response(encode_listing_response(
+            result,
+            query=q,
+            pagination={
+                'limit': limit,
+                'offset': offset,
+                'has_more': has_more
+            }
+        )), etag, cache_control)
+    except Exception as e:
+        logger.error(f"Error searching recipes for {q!r}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to search recipes")
+
+
+@router.post("/batch")
+async def get_recipes_batch(request: RecipeBatchRequest, db: Session = Depends(get_db)):
+    """
+    Get several recipes by id with like information
+
+    Replaces one GET /api/recipes/{recipe_id} per recipe: the recipes are
+    loaded with one IN query and the user's likes with one more. Recipes are
+    returned in request order (duplicates once); ids that do not exist are
+    listed in `missing_ids`.
+
+    Args:
+        request: Up to PaginationLimits.MAX_BATCH_SIZE recipe ids, an
+            optional user ID for `user_has_liked` and optional `fields`
+    """
+    recipe_ids = list(dict.fromkeys(request.recipe_ids))
+    projection = _parse_fields(request.fields)
+
+    try:
+        recipes = get_recipes_by_ids(db, recipe_ids, listing_columns(projection))
+        liked_ids = get_user_liked_recipe_ids(db, request.user_id, recipe_ids)
+        found_ids = {recipe.id for recipe in recipes}
+
+        result = encode_recipe_listings(
+            ((recipe, recipe.like_count, recipe.id in liked_ids) for recipe in recipes),
+            projection
+        )
+
+        return _json_response(encode_listing_response(
+            result,
+            missing_ids=[recipe_id for recipe_id in recipe_ids if recipe_id not in found_ids]
+        ))
+    except Exception as e:
+        logger.error(f"Error retrieving recipe batch: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve recipes")
+
+
+@router.get("/facets")
+async def get_facets(
+    request: Request,
+    max_budget: float = None,
+    max_cooking_time: int = None,
+    dietary_restrictions: str = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Recipe counts per cuisine, diet, difficulty, budget and cooking time
+    bucket for the recipes matching the current filter
+
+    Args:
+        max_budget: Optional budget filter
+        max_cooking_time: Optional cooking time filter
+        dietary_restrictions: Optional diet filter (e.g. vegan)
+    """
+    diet = _parse_diet_filter(dietary_restrictions)
+
+    etag = catalog_etag(db, likes=False)
+    cache_control = cache_control_for(None)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+
+    try:
+        facets = get_recipe_facets(db, max_budget, max_cooking_time, diet)
+        return with_cache_headers(FastJSONResponse(facets), etag, cache_control)
+    except Exception as e:
+        logger.error(f"Error computing recipe facets: {e}")
+        raise HTTPException(status_code=500, detail="Failed to compute recipe facets")
+
+
+@router.get("/export")
+async def export_recipes(
+    export_format: str = Query('ndjson', alias='format'),
+    fields: str = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the whole catalog in id order as NDJSON (one recipe object per
+    line) or CSV
+
+    Rows are read in ExportSettings.BATCH_SIZE keyset batches, each in its
+    own short read, and sent as they are encoded, so memory use does not
+    grow with the catalog, the first rows arrive right away and a slow
+    client never blocks writers.
+
+    Args:
+        format: ndjson or csv
+        fields: Comma-separated listing fields, or "summary"; like_count is
+            always included
+    """
+    projection = _parse_fields(fields)
+    try:
+        chunks = iter_recipe_export(db, export_format, projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="recipes.{export_format}"'}
+    )
+
+
+@router.get("/pantry-match")
+async def pantry_match(
+    ingredients: List[str] = Query(...),
+    user_id: int = None,
+    limit: int = PaginationLimits.DEFAULT_PAGE_SIZE,
+    offset: int = 0,
+    min_coverage: int = 1,
+    max_budget: float = None,
+    max_cooking_time: int = None,
+    dietary_restrictions: str = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Rank recipes by how many of the user's pantry ingredients they use
+
+    Each result carries `pantry_match` with the number of pantry ingredients
+    covered and the number of recipe ingredients still missing. Recipes using
+    more pantry items come first, then those missing fewer ingredients.
+
+    Args:
+        ingredients: Pantry items; repeat the parameter or separate with commas
+        user_id: Optional user ID for `user_has_liked`
+        limit: Page size (1..PaginationLimits.MAX_PAGE_SIZE)
+        offset: Number of matches to skip (up to PaginationLimits.MAX_OFFSET)
+        min_coverage: Minimum number of pantry items a recipe must use
+        max_budget: Optional budget filter
+        max_cooking_time: Optional cooking time filter
+        dietary_restrictions: Optional diet filter (e.g. vegan)
+    """
+    _validate_page_window(limit, offset)
+    diet = _parse_diet_filter(dietary_restrictions)
+
+    pantry = [item.strip() for value in ingredients for item in value.split(',') if item.strip()]
+    if not pantry:
+        raise HTTPException(status_code=400, detail="At least one pantry ingredient is required")
+    if len(pantry) > PantrySettings.MAX_PANTRY_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {PantrySettings.MAX_PANTRY_ITEMS} pantry ingredients are supported"
+        )
+
+    try:
+        matches, total_count, unknown = match_pantry(
+            db, pantry, limit, offset, max_budget, max_cooking_time, diet, min_coverage
+        )
+
+        recipe_ids = [recipe_id for recipe_id, _, _ in matches]
+        recipes = {recipe.id: recipe for recipe in get_recipes_by_ids(db, recipe_ids)}
+        liked_ids = get_user_liked_recipe_ids(db, user_id, recipe_ids)
+
+        result = b'[' + b','.join(
+            encode_recipe_listing(
+                recipes[recipe_id], recipes[recipe_id].like_count, recipe_id in liked_ids,
+                pantry_match={'covered': covered, 'missing': missing}
+            )
+            for recipe_id, covered, missing in matches
+            if recipe_id in recipes
+        ) + b']'
+
+        return _json_response(encode_listing_response(
+            result,
+            pantry=pantry,
+            unknown_ingredients=unknown,
+            total_count=total_count,
+            pagination={
+                'limit': limit,
+                'offset': offset,
+                'has_more': offset + len(matches) < total_count
+            }
+        ))
+    except Exception as e:
+        logger.error(f"Error matching pantry {pantry}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to match pantry")
+
+
+@router.get("/trending")
+async def get_trending_recipes(
+    user_id: int = None,
+    limit: int = PaginationLimits.DEFAULT_PAGE_SIZE,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Recipes ranked by recent likes
+
+    A like counts half as much every TrendingSettings.HALF_LIFE_HOURS, so the
+    order follows what is being liked now rather than all-time totals. Each
+    result carries `trending_score` (its likes, decayed to now).
+
+    Args:
+        user_id: Optional user ID for `user_has_liked`
+        limit: Page size (1..PaginationLimits.MAX_PAGE_SIZE)
+        offset: Number of recipes to skip (up to PaginationLimits.MAX_OFFSET)
+    """
+    _validate_page_window(limit, offset)
+
+    try:
+        scored, total_count = get_trending_page(db, limit, offset)
+
+        recipe_ids = [recipe_id for recipe_id, _ in scored]
+        recipes = {recipe.id: recipe for recipe in get_recipes_by_ids(db, recipe_ids)}
+        liked_ids = get_user_liked_recipe_ids(db, user_id, recipe_ids)
+
+        result = b'[' + b','.join(
+            encode_recipe_listing(
+                recipes[recipe_id], recipes[recipe_id].like_count, recipe_id in liked_ids,
+                trending_score=round(score, 4)
+            )
+            for recipe_id, score in scored
+            if recipe_id in recipes
+        ) + b']'
+
+        return _json_response(encode_listing_response(
+            result,
+            half_life_hours=TrendingSettings.HALF_LIFE_HOURS,
+            total_count=total_count,
+            pagination={
+                'limit': limit,
+                'offset': offset,
+                'has_more': offset + len(scored) < total_count
+            }
+        ))
+    except Exception as e:
+        logger.error(f"Error getting trending recipes: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get trending recipes")
+
+
 @router.get("/{recipe_id}", response_model=RecipeResponse)
-async def get_recipe_detail(recipe_id: int, db: Session = Depends(get_db)):
-    """Get detailed information for a specific recipe"""
+async def get_recipe_detail(recipe_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Get detailed information for a specific recipe
+
+    The body is the recipe's cached listing fragment, so response_model only
+    documents the shape and is not re-validated per request. It has no like
+    fields, so its ETag follows recipe writes alone.
+    """
+    etag = catalog_etag(db, likes=False)
+    cache_control = cache_control_for(None)
+    # Tags are catalog-wide (and * matches anything): a missing recipe is
+    # still a 404
+    if etag_matches(request, etag) and db.query(Recipe.id).filter(Recipe.id == recipe_id).first() is not None:
+        return not_modified(etag, cache_control)
+
     try:
         recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
 
         if not recipe:
             raise HTTPException(status_code=404, detail="Recipe not found")
 
-        return RecipeResponse.from_orm(recipe)
+        return with_cache_headers(_json_response(encode_recipe_detail(recipe)), etag, cache_control)
     except HTTPException:
         raise
     except Exception as e:
@@ -114,6 +497,7 @@ async def recommend_recipe(
     max_cooking_time: int = None, 
     dietary_restrictions: str = None,
     enable_ai: bool = True,
+    include_total: bool = True,
     db: Session = Depends(get_db)
 ):
     """
@@ -130,6 +514,8 @@ async def recommend_recipe(
         max_cooking_time: Optional cooking time override  
         dietary_restrictions: Optional dietary restriction override
         enable_ai: Whether to include AI-powered recommendations (default: True)
+        include_total: Whether to compute total_count; when False only
+            pagination.has_more is reported, which is cheaper (default: True)
     """
     try:
         # Get user preferences from database
@@ -161,7 +547,8 @@ async def recommend_recipe(
             final_budget=final_budget,
             final_cooking_time=final_cooking_time,
             final_dietary_restrictions=final_dietary_restrictions,
-            include_ai=enable_ai
+            include_ai=enable_ai,
+            include_total=include_total
         )
         
         # Extract recipes list from new paginated response
@@ -195,7 +582,8 @@ async def recommend_recipe(
             response['message'] = "No recipes found matching your criteria. Try increasing your budget or cooking time."
         
         logger.info(f"Returning {len(recommended_recipes)} recommendations for budget=${final_budget}, time={final_cooking_time}min")
-        return response
+        # Rendered directly by orjson, skipping jsonable_encoder
+        return FastJSONResponse(response)
         
     except HTTPException:
         raise
@@ -0,0 +1,64 @@
+"""
+Benchmark: recommendation and catalog pages from SQL vs the columnar snapshot
+
+Times get_filtered_recipes_page and get_recipe_page with the in-memory
+catalog snapshot disabled (indexed SQL) and enabled (NumPy masks and
+presorted columns, then one IN query for the page rows).
+
+Usage (from backend/):
+  python -m benchmarks.bench_catalog_snapshot [--recipes 1000000]
+"""
+import argparse
+import time
+from unittest.mock import patch
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from core.config import CatalogSnapshotSettings
+from core.models import DietaryRestriction
+from services.catalog_snapshot import get_catalog_snapshot
+from services.recipe_query_service import get_filtered_recipes_page, get_recipe_page
+
+RECOMMENDATION_CASES = [
+    (DietaryRestriction.NONE, 20.0, 30, 0),
+    (DietaryRestriction.VEGAN, 20.0, 30, 0),
+    (DietaryRestriction.KETO, 10.0, 20, 500),
+]
+CATALOG_CASES = [('id', 'asc'), ('budget', 'desc'), ('likes', 'desc')]
+
+
+def _run_cases(db, repeat: int):
+    for diet, budget, cooking_time, offset in RECOMMENDATION_CASES:
+        ms = timed(lambda: get_filtered_recipes_page(
+            db, None, budget, cooking_time, diet, limit=50, offset=offset
+        ), repeat)
+        print(f"  recommend {diet.value:>8} budget<={budget:<5} time<={cooking_time:<4}"
+              f"offset {offset:<4} {ms:8.2f} ms")
+
+    for sort, order in CATALOG_CASES:
+        _, cursor = get_recipe_page(db, sort=sort, order=order, limit=50)
+        ms = timed(lambda: get_recipe_page(db, sort=sort, order=order, limit=50, cursor=cursor), repeat)
+        print(f"  catalog   {sort:>12} {order:<4} (second page)      {ms:8.2f} ms")
+
+
+def run(n_recipes: int, repeat: int):
+    db = open_session(build_catalog(n_recipes))
+    print(f"Recommendation/catalog pages at {n_recipes:,} recipes (median of {repeat})")
+
+    print("\n== SQL ==")
+    with patch.object(CatalogSnapshotSettings, 'ENABLED', False):
+        _run_cases(db, repeat)
+
+    started = time.perf_counter()
+    get_catalog_snapshot(db)
+    print(f"\n== snapshot (built in {(time.perf_counter() - started) * 1000:.0f} ms) ==")
+    _run_cases(db, repeat)
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat)
@@ -0,0 +1,75 @@
+"""
+Benchmark: gzip CPU cost against bytes saved for listing responses
+
+Encodes real listing bodies (full and summary projections, several page
+sizes) and gzips them at each compression level, the way GZipMiddleware
+does. Reports compression time, compressed size and the transfer time
+saved on a slow mobile link, to tune CompressionSettings.
+
+Usage (from backend/):
+  python -m benchmarks.bench_compression [--recipes 1000000] [--link-kbps 1000]
+"""
+import argparse
+import gzip
+import io
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from services.recipe_query_service import get_recipe_page
+from services.recipe_serializer import (
+    encode_listing_response,
+    encode_recipe_listings,
+    listing_columns,
+    parse_listing_fields
+)
+
+LEVELS = (1, 3, 5, 6, 9)
+PAGE_SIZES = (10, 50, 200)
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    """Same stream GZipMiddleware produces for a single-chunk body"""
+    buffer = io.BytesIO()
+    with gzip.GzipFile(mode="wb", fileobj=buffer, compresslevel=level) as gzip_file:
+        gzip_file.write(body)
+    return buffer.getvalue()
+
+
+def _listing_body(db, fields, limit) -> bytes:
+    projection = parse_listing_fields(fields)
+    page, _ = get_recipe_page(db, 'id', 'asc', limit, None, 0, listing_columns(projection))
+    recipes = encode_recipe_listings(
+        ((recipe, like_count, False) for recipe, like_count in page), projection
+    )
+    return encode_listing_response(recipes, pagination={'limit': limit, 'offset': 0, 'has_more': True})
+
+
+def run(n_recipes: int, repeat: int, link_kbps: int):
+    path = build_catalog(n_recipes)
+    db = open_session(path)
+    bytes_per_ms = link_kbps * 1000 / 8 / 1000
+    print(f"gzip cost vs savings (median of {repeat}; transfer at {link_kbps} kbit/s)")
+    print(f"  {'body':<18} {'raw KiB':>8} {'level':>5} {'gz KiB':>7} {'ratio':>6} "
+          f"{'cpu ms':>7} {'saved ms':>9}")
+
+    for fields in (None, "summary"):
+        for limit in PAGE_SIZES:
+            body = _listing_body(db, fields, limit)
+            label = f"{fields or 'full'} x {limit}"
+            for level in LEVELS:
+                compressed = _gzip(body, level)
+                cpu_ms = timed(lambda: _gzip(body, level), repeat)
+                saved_ms = (len(body) - len(compressed)) / bytes_per_ms
+                print(f"  {label:<18} {len(body) / 1024:8.1f} {level:5d} "
+                      f"{len(compressed) / 1024:7.1f} {len(body) / len(compressed):6.1f} "
+                      f"{cpu_ms:7.2f} {saved_ms:9.0f}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=21)
+    parser.add_argument('--link-kbps', type=int, default=1000)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat, args.link_kbps)
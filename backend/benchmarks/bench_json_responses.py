@@ -0,0 +1,75 @@
+"""
+Benchmark: response rendering with stdlib json vs orjson
+
+Renders a recommendation payload and recipe detail bodies the way FastAPI
+did before (jsonable_encoder + stdlib JSONResponse, pydantic response_model
+for the detail route) and the way the routes do now (FastJSONResponse
+directly, pre-encoded detail fragments).
+
+Usage (from backend/):
+  python -m benchmarks.bench_json_responses [--recipes 1000000]
+"""
+import argparse
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from core.responses import FastJSONResponse
+from core.schemas import RecipeResponse
+from services.recipe_query_service import get_recipes_by_ids
+from services.recipe_serializer import encode_recipe_detail, serialize_recipe_data
+
+
+def _recommendation_payload(recipes):
+    return {
+        'filters': {'max_budget': 20.0, 'max_cooking_time': 30, 'dietary_restrictions': 'none'},
+        'recommendations': [
+            serialize_recipe_data(recipe, recipe.like_count, False, recommendation_type='regular')
+            for recipe in recipes
+        ],
+        'total_count': 123456,
+        'pagination': {'limit': len(recipes), 'offset': 0, 'has_more': True},
+    }
+
+
+def _detail_before(recipes):
+    for recipe in recipes:
+        model = RecipeResponse.model_validate(RecipeResponse.from_orm(recipe))
+        JSONResponse(jsonable_encoder(model)).body
+
+
+def _detail_after(recipes):
+    for recipe in recipes:
+        encode_recipe_detail(recipe)
+
+
+def run(n_recipes: int, repeat: int, page_size: int):
+    path = build_catalog(n_recipes)
+    db = open_session(path)
+    recipes = get_recipes_by_ids(db, list(range(1, page_size + 1)))
+    payload = _recommendation_payload(recipes)
+    _detail_after(recipes)
+    print(f"Rendering responses for {page_size} recipes (median of {repeat})")
+
+    cases = [
+        ("recommendations, json + jsonable_encoder", lambda: JSONResponse(jsonable_encoder(payload)).body),
+        ("recommendations, orjson + jsonable_encoder", lambda: FastJSONResponse(jsonable_encoder(payload)).body),
+        ("recommendations, orjson direct", lambda: FastJSONResponse(payload).body),
+        ("detail x page, pydantic + json", lambda: _detail_before(recipes)),
+        ("detail x page, cached fragment", lambda: _detail_after(recipes)),
+    ]
+    for label, render in cases:
+        ms = timed(render, repeat)
+        print(f"  {label:<44} {ms:8.2f} ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=21)
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat, args.page_size)
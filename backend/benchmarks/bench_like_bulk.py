@@ -0,0 +1,57 @@
+"""
+Benchmark: like status for a grid of cards, one request per card vs bulk
+
+Times the queries behind GET /api/recipes/{id}/likes/{user_id} repeated for
+every card (recipe lookup plus like lookup each) against the two queries of
+POST /api/recipes/likes/bulk. HTTP overhead, which multiplies with the
+per-card requests, is not included.
+
+Usage (from backend/):
+  python -m benchmarks.bench_like_bulk [--recipes 100000] [--cards 50]
+"""
+import argparse
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from core.models import Like, Recipe
+from services.recipe_query_service import get_recipe_like_counts, get_user_liked_recipe_ids
+
+
+def _per_card(db, user_id, recipe_ids):
+    status = {}
+    for recipe_id in recipe_ids:
+        recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
+        user_has_liked = db.query(Like).filter(
+            Like.user_id == user_id, Like.recipe_id == recipe_id
+        ).first() is not None
+        status[recipe_id] = (recipe.like_count, user_has_liked)
+    return status
+
+
+def _bulk(db, user_id, recipe_ids):
+    like_counts = get_recipe_like_counts(db, recipe_ids)
+    liked_ids = get_user_liked_recipe_ids(db, user_id, like_counts)
+    return {recipe_id: (count, recipe_id in liked_ids) for recipe_id, count in like_counts.items()}
+
+
+def run(n_recipes: int, n_cards: int, repeat: int):
+    path = build_catalog(n_recipes, n_users=1000, n_likes=1000)
+    db = open_session(path)
+    recipe_ids = list(range(1, n_cards + 1))
+    assert _per_card(db, 1, recipe_ids) == _bulk(db, 1, recipe_ids)
+
+    print(f"Like status for {n_cards} cards (median of {repeat})")
+    for label, fn in (("per card", _per_card), ("bulk", _bulk)):
+        db.expunge_all()
+        ms = timed(lambda: fn(db, 1, recipe_ids), repeat)
+        print(f"  {label:<10} {ms:8.2f} ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=100_000)
+    parser.add_argument('--cards', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=21)
+    args = parser.parse_args()
+    run(args.recipes, args.cards, args.repeat)
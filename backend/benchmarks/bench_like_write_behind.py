@@ -0,0 +1,86 @@
+"""
+Benchmark: write-behind like ingestion vs one transaction per like
+
+Likes random (user, recipe) pairs on a copy of the benchmark database, once
+through add_like (one commit each) and once through the write-behind buffer
+with a flush every --batch likes, then unlikes them the same way. Reports
+the time to acknowledge one request and the total time per like including
+the flushes.
+
+Usage (from backend/):
+  python -m benchmarks.bench_like_write_behind [--recipes 100000] [--ops 2000] [--batch 500]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.dataset import build_catalog, open_session
+from core.models import Like
+from services.like_buffer import LikeWriteBuffer
+from services.like_service import add_like, remove_like
+
+
+def _direct(db, pairs, liked, batch):
+    started = time.perf_counter()
+    for user_id, recipe_id in pairs:
+        if liked:
+            add_like(db, user_id, recipe_id)
+        else:
+            remove_like(db, user_id, recipe_id)
+    total = time.perf_counter() - started
+    return total, total
+
+
+def _buffered(db, pairs, liked, batch):
+    buffer = LikeWriteBuffer(sessionmaker(bind=db.get_bind()), max_pending=len(pairs) + 1)
+    acknowledge = 0.0
+    started = time.perf_counter()
+    for i, (user_id, recipe_id) in enumerate(pairs, 1):
+        t = time.perf_counter()
+        buffer.enqueue(db, user_id, recipe_id, liked)
+        db.rollback()  # end the request's read transaction, as get_db does
+        acknowledge += time.perf_counter() - t
+        if i % batch == 0:
+            buffer.flush()
+    buffer.flush()
+    return acknowledge, time.perf_counter() - started
+
+
+def run(n_recipes: int, n_ops: int, batch: int):
+    source = build_catalog(n_recipes, n_users=1000, n_likes=1000)
+    path = os.path.join(tempfile.gettempdir(), "biteberry_bench_like_write_behind.db")
+    shutil.copy(source, path)
+    db = open_session(path)
+
+    rng = random.Random(11)
+    existing = {(user_id, recipe_id) for user_id, recipe_id in db.query(Like.user_id, Like.recipe_id)}
+    pairs = set()
+    while len(pairs) < n_ops:
+        pair = (rng.randint(1, 1000), rng.randint(1, n_recipes))
+        if pair not in existing:
+            pairs.add(pair)
+    pairs = list(pairs)
+
+    print(f"Per like over {n_ops} new likes, then unliking them (flush every {batch})")
+    print(f"  {'path':<14} {'op':<7} {'acknowledge':>12} {'incl. writes':>13}")
+    for label, ingest in (("per-like txn", _direct), ("write-behind", _buffered)):
+        for op, liked in (("like", True), ("unlike", False)):
+            acknowledge, total = ingest(db, pairs, liked, batch)
+            print(f"  {label:<14} {op:<7} {acknowledge * 1e6 / n_ops:9.0f} us {total * 1e6 / n_ops:10.0f} us")
+
+    db.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=100_000)
+    parser.add_argument('--ops', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=500)
+    args = parser.parse_args()
+    run(args.recipes, args.ops, args.batch)
@@ -0,0 +1,98 @@
+"""
+Benchmark: single-statement like/unlike vs the previous lookup-then-write path
+
+Likes and unlikes random (user, recipe) pairs on a copy of the benchmark
+database, once through add_like/remove_like and once replaying the earlier
+sequence (recipe, user and existing-like lookups, ORM insert, counter
+update, commit and refresh; recipe lookup, delete, counter update, commit).
+Runs with and without fsync on commit, since the fsync alone can dominate.
+
+Usage (from backend/):
+  python -m benchmarks.bench_like_writes [--recipes 100000] [--ops 2000]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.dataset import build_catalog, open_session
+from core.models import Like, Recipe, User
+from services.like_service import _adjust_like_count, add_like, remove_like
+
+
+def _legacy_like(db, user_id, recipe_id):
+    db.query(Recipe).filter(Recipe.id == recipe_id).first()
+    db.query(User).filter(User.id == user_id).first()
+    if db.query(Like).filter(Like.user_id == user_id, Like.recipe_id == recipe_id).first():
+        return
+    like = Like(user_id=user_id, recipe_id=recipe_id, created_at=datetime.utcnow())
+    db.add(like)
+    db.flush()
+    _adjust_like_count(db, recipe_id, 1)
+    db.commit()
+    db.refresh(like)
+
+
+def _legacy_unlike(db, user_id, recipe_id):
+    db.query(Recipe).filter(Recipe.id == recipe_id).first()
+    deleted = db.query(Like).filter(
+        Like.user_id == user_id, Like.recipe_id == recipe_id
+    ).delete(synchronize_session=False)
+    _adjust_like_count(db, recipe_id, -deleted)
+    db.commit()
+
+
+def _run(db, like, unlike, pairs):
+    started = time.perf_counter()
+    for user_id, recipe_id in pairs:
+        like(db, user_id, recipe_id)
+    like_us = (time.perf_counter() - started) * 1e6 / len(pairs)
+
+    started = time.perf_counter()
+    for user_id, recipe_id in pairs:
+        unlike(db, user_id, recipe_id)
+    unlike_us = (time.perf_counter() - started) * 1e6 / len(pairs)
+    return like_us, unlike_us
+
+
+def run(n_recipes: int, n_ops: int):
+    source = build_catalog(n_recipes, n_users=1000, n_likes=1000)
+    path = os.path.join(tempfile.gettempdir(), "biteberry_bench_like_writes.db")
+    shutil.copy(source, path)
+    db = open_session(path)
+
+    rng = random.Random(7)
+    existing = {(user_id, recipe_id) for user_id, recipe_id in db.query(Like.user_id, Like.recipe_id)}
+    pairs = set()
+    while len(pairs) < n_ops:
+        pair = (rng.randint(1, 1000), rng.randint(1, n_recipes))
+        if pair not in existing:
+            pairs.add(pair)
+    pairs = list(pairs)
+
+    print(f"Per operation over {n_ops} new likes, then unliking them")
+    # With synchronous=OFF commits skip fsync, which leaves the statement cost
+    for synchronous in ('FULL', 'OFF'):
+        db.connection().exec_driver_sql(f"PRAGMA synchronous={synchronous}")
+        db.commit()
+        print(f"  synchronous={synchronous}")
+        for label, like, unlike in (
+            ("lookups + ORM insert", _legacy_like, _legacy_unlike),
+            ("single statement", add_like, remove_like),
+        ):
+            like_us, unlike_us = _run(db, like, unlike, pairs)
+            print(f"    {label:<22} like {like_us:7.0f} us   unlike {unlike_us:7.0f} us")
+
+    db.close()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=100_000)
+    parser.add_argument('--ops', type=int, default=2000)
+    args = parser.parse_args()
+    run(args.recipes, args.ops)
@@ -0,0 +1,76 @@
+"""
+Benchmark: pantry matching over ingredient bitsets
+
+Builds the ingredient bitsets for the benchmark catalog and times
+match_pantry for small and large pantries, with and without filters,
+against the naive approach of parsing every recipe's JSON ingredient list.
+
+Usage (from backend/):
+  python -m benchmarks.bench_pantry_match [--recipes 1000000]
+"""
+import argparse
+import json
+import time
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.dataset import INGREDIENTS, build_catalog, open_session, timed
+from core.database import ensure_ingredient_index
+from core.models import Base, DietaryRestriction
+from services.pantry_index import get_ingredient_bitsets, match_pantry
+
+SMALL_PANTRY = ['tofu', 'rice', 'garlic', 'soy sauce', 'onion']
+LARGE_PANTRY = INGREDIENTS[:40] + SMALL_PANTRY
+
+
+def _naive_match(db, pantry):
+    """Parse every JSON blob and score in Python"""
+    pantry = set(pantry)
+    scored = []
+    for recipe_id, ingredients in db.execute(text("SELECT id, ingredients FROM recipes")):
+        names = set(json.loads(ingredients))
+        covered = len(names & pantry)
+        if covered:
+            scored.append((-covered, len(names) - covered, recipe_id))
+    scored.sort()
+    return scored[:50]
+
+
+def run(n_recipes: int, repeat: int):
+    path = build_catalog(n_recipes)
+    # Catalogs cached before recipe_ingredients existed need the migration
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    ensure_ingredient_index(engine)
+    engine.dispose()
+
+    db = open_session(path)
+    started = time.perf_counter()
+    _, bitsets = get_ingredient_bitsets(db)
+    print(f"Bitsets built in {(time.perf_counter() - started):.1f}s "
+          f"({len(bitsets.vocabulary)} ingredients, {bitsets.bits.nbytes / 1e6:.0f} MB)")
+    print(f"Pantry match at {n_recipes:,} recipes (median of {repeat}, first page of 50)")
+
+    cases = [
+        ("5 items", SMALL_PANTRY, {}),
+        ("5 items, budget/time/vegan", SMALL_PANTRY,
+         {'budget': 15.0, 'cooking_time': 30, 'dietary_restrictions': DietaryRestriction.VEGAN}),
+        ("45 items", LARGE_PANTRY, {}),
+        ("45 items, min coverage 3", LARGE_PANTRY, {'min_coverage': 3}),
+    ]
+    for label, pantry, options in cases:
+        ms = timed(lambda: match_pantry(db, pantry, limit=50, **options), repeat)
+        print(f"  bitsets  {label:<28} {ms:8.2f} ms")
+
+    ms = timed(lambda: _naive_match(db, SMALL_PANTRY), 1)
+    print(f"  JSON     {'5 items':<28} {ms:8.2f} ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat)
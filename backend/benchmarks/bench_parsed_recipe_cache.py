@@ -0,0 +1,49 @@
+"""
+Benchmark: parsed recipe cache
+
+Serializes pages of recipes with the listing serializer, with the parsed
+recipe cache cleared before every run (each recipe's JSON columns are
+decoded, as before the cache) and with a warm cache.
+
+Usage (from backend/):
+  python -m benchmarks.bench_parsed_recipe_cache [--recipes 1000000]
+"""
+import argparse
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from services import parsed_recipe_cache
+from services.recipe_query_service import get_recipes_by_ids
+from services.recipe_serializer import serialize_recipe_listing
+
+
+def _serialize_listing(recipes):
+    return [serialize_recipe_listing(recipe, recipe.like_count, False) for recipe in recipes]
+
+
+def _cold(serialize, recipes):
+    parsed_recipe_cache._parsed_recipe_cache.clear()
+    return serialize(recipes)
+
+
+def run(n_recipes: int, repeat: int, page_size: int):
+    path = build_catalog(n_recipes)
+    db = open_session(path)
+    recipes = get_recipes_by_ids(db, list(range(1, page_size + 1)))
+    print(f"Serializing {page_size} recipes (median of {repeat})")
+
+    cold = timed(lambda: _cold(_serialize_listing, recipes), repeat)
+    _serialize_listing(recipes)
+    warm = timed(lambda: _serialize_listing(recipes), repeat)
+    print(f"  listing  uncached {cold:7.2f} ms   cached {warm:7.2f} ms   ({cold / warm:.1f}x)")
+
+    print(f"  cache stats: {parsed_recipe_cache._parsed_recipe_cache.stats()}")
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=21)
+    parser.add_argument('--page-size', type=int, default=200)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat, args.page_size)
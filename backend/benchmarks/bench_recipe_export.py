@@ -0,0 +1,84 @@
+"""
+Benchmark: streaming catalog export vs building the whole listing in memory
+
+Exports the full catalog as NDJSON and CSV through iter_recipe_export and
+compares time to first chunk, total time and peak Python heap (tracemalloc,
+measured in a separate pass) with loading every Recipe and encoding one
+listing body, which is what paging through /api/recipes/ without a limit
+amounted to.
+
+Usage (from backend/):
+  python -m benchmarks.bench_recipe_export [--recipes 200000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.dataset import build_catalog, open_session
+from core.models import Recipe
+from services import parsed_recipe_cache, recipe_serializer
+from services.recipe_export import iter_recipe_export
+from services.recipe_serializer import encode_recipe_listings
+
+
+def _stream(db, export_format):
+    first_chunk_ms = None
+    total_bytes = 0
+    started = time.perf_counter()
+    for chunk in iter_recipe_export(db, export_format):
+        if first_chunk_ms is None:
+            first_chunk_ms = (time.perf_counter() - started) * 1000
+        total_bytes += len(chunk)
+    return first_chunk_ms, total_bytes
+
+
+def _materialize(db, _format):
+    started = time.perf_counter()
+    recipes = db.query(Recipe).order_by(Recipe.id).all()
+    body = encode_recipe_listings((recipe, recipe.like_count, False) for recipe in recipes)
+    # Nothing can be sent before the whole body exists
+    first_chunk_ms = (time.perf_counter() - started) * 1000
+    return first_chunk_ms, len(body)
+
+
+def _measure(db, fn, export_format):
+    db.expunge_all()
+    parsed_recipe_cache._parsed_recipe_cache.clear()
+    recipe_serializer._listing_fragment_cache.clear()
+    started = time.perf_counter()
+    first_chunk_ms, total_bytes = fn(db, export_format)
+    total_ms = (time.perf_counter() - started) * 1000
+
+    db.expunge_all()
+    parsed_recipe_cache._parsed_recipe_cache.clear()
+    recipe_serializer._listing_fragment_cache.clear()
+    tracemalloc.start()
+    fn(db, export_format)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_chunk_ms, total_ms, total_bytes, peak
+
+
+def run(n_recipes: int):
+    path = build_catalog(n_recipes)
+    db = open_session(path)
+    print(f"Exporting {n_recipes} recipes")
+    print(f"  {'path':<22} {'first chunk':>12} {'total':>10} {'output':>10} {'peak heap':>10}")
+
+    for label, fn, export_format in (
+        ("stream ndjson", _stream, 'ndjson'),
+        ("stream csv", _stream, 'csv'),
+        ("load all + encode", _materialize, None),
+    ):
+        first_chunk_ms, total_ms, total_bytes, peak = _measure(db, fn, export_format)
+        print(f"  {label:<22} {first_chunk_ms:9.1f} ms {total_ms:7.0f} ms "
+              f"{total_bytes / 2**20:6.1f} MiB {peak / 2**20:6.1f} MiB")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=200_000)
+    args = parser.parse_args()
+    run(args.recipes)
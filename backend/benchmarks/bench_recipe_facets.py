@@ -0,0 +1,83 @@
+"""
+Benchmark: facet counts for the recipe filter UI
+
+Times get_recipe_facets on the catalog snapshot and on the grouped-query
+fallback, both uncached, against one GROUP BY query per facet, and the
+cached lookup that repeated filters hit.
+
+Usage (from backend/):
+  python -m benchmarks.bench_recipe_facets [--recipes 1000000]
+"""
+import argparse
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from core.models import DietaryRestriction
+from services import facet_service
+from services.catalog_snapshot import get_catalog_snapshot
+from services.facet_service import get_recipe_facets
+
+FILTERS = [
+    ("no filter", {}),
+    ("budget/time", {'budget': 15.0, 'cooking_time': 30}),
+    ("budget/time/vegan", {'budget': 15.0, 'cooking_time': 30,
+                           'dietary_restrictions': DietaryRestriction.VEGAN}),
+]
+
+PER_FACET_SQL = [
+    "SELECT cuisine, COUNT(*) FROM recipes {where} GROUP BY cuisine",
+    "SELECT dietary_restrictions, COUNT(*) FROM recipes {where} GROUP BY dietary_restrictions",
+    "SELECT difficulty, COUNT(*) FROM recipes {where} GROUP BY difficulty",
+    "SELECT CAST(budget / 5 AS INTEGER), COUNT(*) FROM recipes {where} GROUP BY 1",
+    "SELECT CAST(cooking_time / 15 AS INTEGER), COUNT(*) FROM recipes {where} GROUP BY 1",
+]
+
+
+def _per_facet_queries(db, budget=None, cooking_time=None, dietary_restrictions=None):
+    """One grouped query per facet, as the UI would otherwise need"""
+    conditions = []
+    if budget is not None:
+        conditions.append(f"budget <= {budget}")
+    if cooking_time is not None:
+        conditions.append(f"cooking_time <= {cooking_time}")
+    if dietary_restrictions is not None:
+        conditions.append(f"dietary_restrictions = '{dietary_restrictions.name}'")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    for sql in PER_FACET_SQL:
+        db.execute(text(sql.format(where=where))).fetchall()
+
+
+def _uncached(db, **filters):
+    facet_service._facet_cache.clear()
+    return get_recipe_facets(db, **filters)
+
+
+def run(n_recipes: int, repeat: int):
+    path = build_catalog(n_recipes)
+    db = open_session(path)
+    get_catalog_snapshot(db)
+    print(f"Facet counts at {n_recipes:,} recipes (median of {repeat})")
+
+    for label, filters in FILTERS:
+        ms = timed(lambda: _uncached(db, **filters), repeat)
+        print(f"  snapshot, uncached     {label:<20} {ms:8.2f} ms")
+        with patch.object(facet_service.CatalogSnapshotSettings, 'ENABLED', False):
+            ms = timed(lambda: _uncached(db, **filters), repeat)
+        print(f"  grouped query          {label:<20} {ms:8.2f} ms")
+        ms = timed(lambda: _per_facet_queries(db, **filters), repeat)
+        print(f"  one query per facet    {label:<20} {ms:8.2f} ms")
+        get_recipe_facets(db, **filters)
+        ms = timed(lambda: get_recipe_facets(db, **filters), repeat)
+        print(f"  cached                 {label:<20} {ms:8.3f} ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat)
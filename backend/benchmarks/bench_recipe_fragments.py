@@ -0,0 +1,74 @@
+"""
+Benchmark: pre-encoded recipe listing fragments
+
+Renders a listing response body for a page of recipes the way FastAPI does
+for a returned dict (serialize_recipe_listing, jsonable_encoder,
+JSONResponse) and as a byte-join of cached fragments with the like fields
+spliced in.
+
+Usage (from backend/):
+  python -m benchmarks.bench_recipe_fragments [--recipes 1000000]
+"""
+import argparse
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from services import recipe_serializer
+from services.recipe_query_service import get_recipes_by_ids
+from services.recipe_serializer import (
+    encode_listing_response,
+    encode_recipe_listings,
+    serialize_recipe_listing
+)
+
+PAGINATION = {'limit': 500, 'offset': 0, 'has_more': True}
+
+
+def _dict_response(recipes):
+    body = {
+        'recipes': [serialize_recipe_listing(recipe, recipe.like_count, False) for recipe in recipes],
+        'pagination': PAGINATION,
+    }
+    return JSONResponse(content=jsonable_encoder(body)).body
+
+
+def _fragment_response(recipes):
+    return encode_listing_response(
+        encode_recipe_listings((recipe, recipe.like_count, False) for recipe in recipes),
+        pagination=PAGINATION
+    )
+
+
+def _cold_fragment_response(recipes):
+    recipe_serializer._listing_fragment_cache.clear()
+    return _fragment_response(recipes)
+
+
+def run(n_recipes: int, repeat: int, page_size: int):
+    path = build_catalog(n_recipes)
+    db = open_session(path)
+    recipes = get_recipes_by_ids(db, list(range(1, page_size + 1)))
+    # Parsed JSON columns are cached for every variant
+    _dict_response(recipes)
+    print(f"Rendering a {page_size}-recipe listing body (median of {repeat})")
+
+    for label, render in (
+        ("dict + jsonable_encoder", _dict_response),
+        ("fragments, cold", _cold_fragment_response),
+        ("fragments, cached", _fragment_response),
+    ):
+        ms = timed(lambda: render(recipes), repeat)
+        print(f"  {label:<26} {ms:8.2f} ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=21)
+    parser.add_argument('--page-size', type=int, default=500)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat, args.page_size)
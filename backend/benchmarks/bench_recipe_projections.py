@@ -0,0 +1,49 @@
+"""
+Benchmark: full vs summary recipe listings
+
+Loads and encodes catalog pages with every column and with the summary
+projection (load_only), with the serialization caches cleared before every
+run so each page is read and encoded from scratch.
+
+Usage (from backend/):
+  python -m benchmarks.bench_recipe_projections [--recipes 1000000]
+"""
+import argparse
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from services import parsed_recipe_cache, recipe_serializer
+from services.recipe_query_service import get_recipe_page
+from services.recipe_serializer import encode_recipe_listings, listing_columns, parse_listing_fields
+
+
+def _render_page(db, projection, limit, offset):
+    parsed_recipe_cache._parsed_recipe_cache.clear()
+    recipe_serializer._listing_fragment_cache.clear()
+    db.expunge_all()
+    page, _ = get_recipe_page(db, 'id', 'asc', limit, None, offset, listing_columns(projection))
+    return encode_recipe_listings(
+        ((recipe, like_count, False) for recipe, like_count in page), projection
+    )
+
+
+def run(n_recipes: int, repeat: int, page_size: int):
+    path = build_catalog(n_recipes)
+    db = open_session(path)
+    print(f"Loading and encoding a {page_size}-recipe page (median of {repeat}, caches cleared)")
+
+    for label, fields in (("full", None), ("summary", "summary"), ("title,budget", "title,budget")):
+        projection = parse_listing_fields(fields)
+        body = _render_page(db, projection, page_size, 0)
+        ms = timed(lambda: _render_page(db, projection, page_size, 500), repeat)
+        print(f"  {label:<14} {ms:8.2f} ms   {len(body) / 1024:7.1f} KiB")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=21)
+    parser.add_argument('--page-size', type=int, default=200)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat, args.page_size)
@@ -0,0 +1,71 @@
+"""
+Benchmark: Recipe ORM entities vs RecipeRecord rows on read paths
+
+Loads 1000 recipes by id as ORM entities (what get_recipes_by_ids did) and as
+read-model records, then encodes them as a listing body with the
+serialization caches cleared. Reports time per 1k recipes and the Python
+heap held by the loaded objects (tracemalloc).
+
+Usage (from backend/):
+  python -m benchmarks.bench_recipe_read_model [--recipes 1000000]
+"""
+import argparse
+import tracemalloc
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from core.models import Recipe
+from services import parsed_recipe_cache, recipe_serializer
+from services.recipe_query_service import get_recipes_by_ids
+from services.recipe_serializer import encode_recipe_listings
+
+
+def _load_entities(db, ids):
+    db.expunge_all()
+    return db.query(Recipe).filter(Recipe.id.in_(ids)).all()
+
+
+def _load_records(db, ids):
+    db.expunge_all()
+    return get_recipes_by_ids(db, ids)
+
+
+def _load_and_encode(db, load, ids):
+    parsed_recipe_cache._parsed_recipe_cache.clear()
+    recipe_serializer._listing_fragment_cache.clear()
+    recipes = load(db, ids)
+    return encode_recipe_listings((recipe, recipe.like_count, False) for recipe in recipes)
+
+
+def _held_bytes(db, load, ids):
+    db.expunge_all()
+    tracemalloc.start()
+    recipes = load(db, ids)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del recipes
+    return held
+
+
+def run(n_recipes: int, repeat: int, batch: int):
+    path = build_catalog(n_recipes)
+    db = open_session(path)
+    ids = list(range(n_recipes // 2, n_recipes // 2 + batch))
+    print(f"Per {batch} recipes (median of {repeat})")
+    print(f"  {'path':<10} {'load':>9} {'load+encode':>12} {'heap held':>10}")
+
+    for label, load in (("ORM", _load_entities), ("records", _load_records)):
+        load_ms = timed(lambda: load(db, ids), repeat)
+        encode_ms = timed(lambda: _load_and_encode(db, load, ids), repeat)
+        held = _held_bytes(db, load, ids)
+        print(f"  {label:<10} {load_ms:6.2f} ms {encode_ms:9.2f} ms {held / 1024:6.0f} KiB")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=21)
+    parser.add_argument('--batch', type=int, default=1000)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat, args.batch)
@@ -0,0 +1,57 @@
+"""
+Benchmark: FTS5 recipe search
+
+Builds recipes_fts on the benchmark catalog (once; it is kept in the cached
+file) and times search_recipe_ids for rare, common and prefix queries, with
+and without filters: a cold query (ranking every match) and a later page
+served from the ranked-result cache.
+
+Usage (from backend/):
+  python -m benchmarks.bench_recipe_search [--recipes 1000000]
+"""
+import argparse
+import time
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from core.database import ensure_search_index
+from core.models import DietaryRestriction
+from services import recipe_search_service
+from services.recipe_search_service import search_recipe_ids
+
+CASES = [
+    ("tofu", {}),
+    ("tofu", {'budget': 10.0, 'cooking_time': 30}),
+    ("spicy curry", {}),
+    ("pasta", {}),
+    ("pasta", {'budget': 10.0, 'dietary_restrictions': DietaryRestriction.VEGAN}),
+    ("ga", {}),
+    ("garlic tom", {'cooking_time': 20}),
+]
+
+
+def run(n_recipes: int, repeat: int):
+    db = open_session(build_catalog(n_recipes))
+    started = time.perf_counter()
+    ensure_search_index(db.get_bind())
+    print(f"Search index ready in {time.perf_counter() - started:.1f}s")
+    print(f"FTS5 search at {n_recipes:,} recipes (median of {repeat}, pages of 50)")
+
+    def cold(query, filters):
+        recipe_search_service._search_result_cache.clear()
+        return search_recipe_ids(db, query, limit=50, **filters)
+
+    for query, filters in CASES:
+        cold_ms = timed(lambda: cold(query, filters), repeat)
+        cached_ms = timed(lambda: search_recipe_ids(db, query, limit=50, offset=950, **filters), repeat)
+        label = ", ".join(f"{k}={getattr(v, 'value', v)}" for k, v in filters.items()) or "no filters"
+        print(f"  {query!r:<14} {label:<40} cold {cold_ms:8.2f} ms  cached page {cached_ms:6.3f} ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat)
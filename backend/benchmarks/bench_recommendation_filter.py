@@ -0,0 +1,71 @@
+"""
+Benchmark: recommendation filter with single-column vs composite indexes
+
+Shows the planner's choice and page/count latency for the filter used by
+get_filtered_recipes_with_likes, with the old single-column diet index and
+with the composite ix_recipes_diet_budget_time / ix_recipes_budget_time pair.
+
+Usage (from backend/):
+  python -m benchmarks.bench_recommendation_filter [--recipes 1000000]
+"""
+import argparse
+
+from sqlalchemy import text
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from core.models import DietaryRestriction
+from services.query_plan_check import explain_query_plan
+from services.recipe_query_service import build_filtered_recipes_query
+
+COMPOSITE_INDEXES = {
+    'ix_recipes_diet_budget_time': "recipes (dietary_restrictions, budget, cooking_time)",
+    'ix_recipes_budget_time': "recipes (budget, cooking_time)",
+}
+CASES = [
+    (DietaryRestriction.NONE, 20.0, 30),
+    (DietaryRestriction.VEGAN, 20.0, 30),
+    (DietaryRestriction.KETO, 10.0, 20),
+]
+
+
+def _use_composite_index(db, enabled: bool):
+    """Swap between the composite indexes and the old single-column diet index"""
+    if enabled:
+        db.execute(text("DROP INDEX IF EXISTS ix_recipes_dietary_restrictions"))
+        for name, definition in COMPOSITE_INDEXES.items():
+            db.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"))
+    else:
+        for name in COMPOSITE_INDEXES:
+            db.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        db.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_recipes_dietary_restrictions "
+            "ON recipes (dietary_restrictions)"
+        ))
+    db.commit()
+
+
+def run(n_recipes: int, repeat: int):
+    db = open_session(build_catalog(n_recipes))
+    print(f"Recommendation filter at {n_recipes:,} recipes (median of {repeat})")
+
+    for label, enabled in (("single-column indexes", False), ("composite indexes", True)):
+        _use_composite_index(db, enabled)
+        print(f"\n== {label} ==")
+        for diet, budget, cooking_time in CASES:
+            query = build_filtered_recipes_query(db, budget, cooking_time, diet)
+            plan = "; ".join(explain_query_plan(db, query))
+            page_ms = timed(lambda: query.limit(50).all(), repeat)
+            count_ms = timed(query.count, repeat)
+            print(f"{diet.value:>8}  budget<={budget:<5} time<={cooking_time:<4}"
+                  f"page {page_ms:8.2f} ms  count {count_ms:8.2f} ms")
+            print(f"          plan: {plan}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.recipes, args.repeat)
@@ -0,0 +1,60 @@
+"""
+Benchmark: trending page from decayed scores vs the all-time GROUP BY
+
+Times a top-50 popularity page as the GROUP BY over the likes table (what
+cold-start recommendations ranked by before like_count was denormalized)
+and from the in-memory trending scores, both with the cached order and with
+a rerank. Also times one like event and the vectorized rebuild over every
+like.
+
+Usage (from backend/):
+  python -m benchmarks.bench_trending [--recipes 100000] [--likes 200000]
+"""
+import argparse
+import time
+
+from sqlalchemy import func
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from core.config import TrendingSettings
+from core.models import Like
+from services.trending import build_trending_scores
+
+
+def _group_by(db, limit):
+    return db.query(Like.recipe_id, func.count(Like.id)).group_by(Like.recipe_id).order_by(
+        func.count(Like.id).desc(), Like.recipe_id
+    ).limit(limit).all()
+
+
+def run(n_recipes: int, n_likes: int, limit: int, repeat: int):
+    path = build_catalog(n_recipes, n_users=1000, n_likes=n_likes)
+    db = open_session(path)
+
+    rebuild_ms = timed(lambda: build_trending_scores(db), 3)
+    scores = build_trending_scores(db)
+    now = time.time()
+
+    print(f"Top {limit} of {n_likes} likes over {n_recipes} recipes (median of {repeat})")
+    print(f"  all-time GROUP BY     {timed(lambda: _group_by(db, limit), repeat):8.2f} ms")
+    print(f"  trending, cached      {timed(lambda: scores.page(limit), repeat):8.3f} ms")
+    TrendingSettings.RERANK_INTERVAL_SECONDS = 0
+    print(f"  trending, reranked    {timed(lambda: scores.page(limit), repeat):8.3f} ms")
+
+    events = 100_000
+    started = time.perf_counter()
+    for i in range(events):
+        scores.record(i % n_recipes + 1, now, 1)
+    print(f"  like event            {(time.perf_counter() - started) * 1e6 / events:8.2f} us")
+    print(f"  full rebuild          {rebuild_ms:8.1f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=100_000)
+    parser.add_argument('--likes', type=int, default=200_000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=21)
+    args = parser.parse_args()
+    run(args.recipes, args.likes, args.limit, args.repeat)
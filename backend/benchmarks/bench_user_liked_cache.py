@@ -0,0 +1,67 @@
+"""
+Benchmark: "has this user liked X" per listing page, IN query vs cached set
+
+Times the user_has_liked lookup for a 50-card page as the previous
+per-page query (likes.user_id = ? AND recipe_id IN (...)) and through the
+per-user liked-set cache, warm and on a miss (loads the whole set). Also
+reports the memory of a cached set.
+
+Usage (from backend/):
+  python -m benchmarks.bench_user_liked_cache [--recipes 100000] [--likes 50000]
+"""
+import argparse
+import sys
+
+from sqlalchemy import func
+
+from benchmarks.dataset import build_catalog, open_session, timed
+from core.models import Like
+from services import user_liked_cache
+from services.recipe_query_service import get_user_liked_recipe_ids
+
+
+def _in_query(db, user_id, recipe_ids):
+    rows = db.query(Like.recipe_id).filter(Like.user_id == user_id, Like.recipe_id.in_(recipe_ids)).all()
+    return {recipe_id for recipe_id, in rows}
+
+
+def _cold(db, user_id, recipe_ids):
+    user_liked_cache.clear_user_liked_sets()
+    return get_user_liked_recipe_ids(db, user_id, recipe_ids)
+
+
+def run(n_recipes: int, n_likes: int, page: int, repeat: int):
+    path = build_catalog(n_recipes, n_users=1000, n_likes=n_likes)
+    db = open_session(path)
+    user_id, n_liked = db.query(Like.user_id, func.count()).group_by(Like.user_id).order_by(
+        func.count().desc()
+    ).first()
+    liked = {recipe_id for recipe_id, in db.query(Like.recipe_id).filter(Like.user_id == user_id)}
+    # Half of the page liked by the user, half not
+    not_liked = (recipe_id for recipe_id in range(1, n_recipes + 1) if recipe_id not in liked)
+    recipe_ids = sorted(liked)[:page // 2] + [next(not_liked) for _ in range(page - page // 2)]
+    assert _in_query(db, user_id, recipe_ids) == _cold(db, user_id, recipe_ids)
+
+    print(f"user_has_liked for a {page}-card page, user with {n_liked} likes (median of {repeat})")
+    for label, fn in (
+        ("IN query", _in_query),
+        ("cache miss", _cold),
+        ("cache hit", get_user_liked_recipe_ids),
+    ):
+        ms = timed(lambda: fn(db, user_id, recipe_ids), repeat)
+        print(f"  {label:<12} {ms * 1000:8.1f} us")
+
+    cached = user_liked_cache.get_user_liked_set(db, user_id)
+    size = sys.getsizeof(cached) + sum(sys.getsizeof(recipe_id) for recipe_id in cached)
+    print(f"  cached set: {size / 1024:.1f} KiB for {len(cached)} ids")
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--recipes', type=int, default=100_000)
+    parser.add_argument('--likes', type=int, default=50_000)
+    parser.add_argument('--page', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=201)
+    args = parser.parse_args()
+    run(args.recipes, args.likes, args.page, args.repeat)
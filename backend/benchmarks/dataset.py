@@ -0,0 +1,144 @@
+"""
+Synthetic recipe catalog used by the benchmarks
+
+Builds a SQLite file with the production schema and a deterministic random
+catalog. Files are cached by size and seed so repeated runs skip the build.
+"""
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.models import Base, DietaryRestriction, DifficultyLevel
+
+DIET_WEIGHTS = {
+    DietaryRestriction.NONE: 50,
+    DietaryRestriction.VEGETARIAN: 15,
+    DietaryRestriction.VEGAN: 10,
+    DietaryRestriction.GLUTEN_FREE: 10,
+    DietaryRestriction.DAIRY_FREE: 5,
+    DietaryRestriction.NUT_FREE: 4,
+    DietaryRestriction.KETO: 3,
+    DietaryRestriction.PALEO: 3,
+}
+CUISINES = ['Italian', 'Chinese', 'Mexican', 'Japanese', 'French', 'Indian', 'Thai',
+            'Korean', 'American', 'Mediterranean', 'Greek', 'Spanish', None]
+ADJECTIVES = ['Quick', 'Spicy', 'Creamy', 'Crispy', 'Smoky', 'Zesty', 'Hearty', 'Classic',
+              'Rustic', 'Golden', 'Garlicky', 'Sticky', 'Herby', 'Tangy', 'Sweet']
+DISHES = ['Curry', 'Stir Fry', 'Pasta', 'Salad', 'Soup', 'Tacos', 'Risotto', 'Bowl',
+          'Noodles', 'Stew', 'Omelette', 'Burger', 'Pizza', 'Pancakes', 'Fried Rice']
+INGREDIENTS = [f"ingredient {i}" for i in range(300)] + [
+    'tofu', 'chicken breast', 'rice', 'eggs', 'garlic', 'onion', 'tomatoes', 'salt',
+    'pepper', 'olive oil', 'soy sauce', 'pasta', 'cheese', 'butter', 'milk', 'flour',
+]
+
+
+def catalog_path(n_recipes: int, n_users: int, n_likes: int, seed: int) -> str:
+    """Location of the cached benchmark database for a given size"""
+    return os.path.join(
+        tempfile.gettempdir(), f"biteberry_bench_{n_recipes}_{n_users}_{n_likes}_{seed}.db"
+    )
+
+
+def build_catalog(n_recipes: int, n_users: int = 1000, n_likes: int = 0, seed: int = 42) -> str:
+    """
+    Create (or reuse) a benchmark database and return its path
+    """
+    path = catalog_path(n_recipes, n_users, n_likes, seed)
+    if os.path.exists(path):
+        return path
+
+    started = time.perf_counter()
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    rng = random.Random(seed)
+    diets = list(DIET_WEIGHTS)
+    weights = list(DIET_WEIGHTS.values())
+    difficulties = [d.name for d in DifficultyLevel]
+    now = datetime.utcnow()
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    def recipe_rows():
+        for i in range(1, n_recipes + 1):
+            ingredients = rng.sample(INGREDIENTS, rng.randint(4, 12))
+            yield (
+                i,
+                f"{rng.choice(ADJECTIVES)} {rng.choice(DISHES)} {i}",
+                f"A {rng.choice(ADJECTIVES).lower()} dish with {ingredients[0]} and {ingredients[1]}",
+                json.dumps(ingredients),
+                json.dumps([f"Step {s}" for s in range(1, rng.randint(3, 9))]),
+                rng.randint(5, 120),
+                rng.randint(5, 30),
+                rng.choice(difficulties),
+                rng.randint(1, 6),
+                round(rng.uniform(1.0, 40.0), 2),
+                rng.randint(150, 900),
+                rng.choice(CUISINES),
+                rng.choices(diets, weights)[0].name,
+                None,
+                now - timedelta(minutes=i),
+                now - timedelta(minutes=i),
+                0,
+                0.0,
+                0,
+            )
+
+    conn.executemany(
+        "INSERT INTO recipes (id, title, description, ingredients, instructions, cooking_time, "
+        "prep_time, difficulty, servings, budget, calories_per_serving, cuisine, "
+        "dietary_restrictions, image_url, created_at, updated_at, is_featured, "
+        "average_rating, like_count) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+        recipe_rows()
+    )
+
+    if n_likes:
+        conn.executemany(
+            "INSERT INTO users (id, username, email, password_hash, created_at) VALUES (?,?,?,?,?)",
+            ((u, f"user{u}", f"user{u}@example.com", "x", now) for u in range(1, n_users + 1))
+        )
+        pairs = set()
+        while len(pairs) < n_likes:
+            # Skew likes toward low ids so popularity is uneven
+            recipe_id = min(int(rng.paretovariate(1.2)), n_recipes)
+            pairs.add((rng.randint(1, n_users), recipe_id))
+        conn.executemany(
+            "INSERT INTO likes (user_id, recipe_id, created_at) VALUES (?,?,?)",
+            ((u, r, now - timedelta(seconds=rng.randint(0, 30 * 86400))) for u, r in pairs)
+        )
+        conn.execute(
+            "UPDATE recipes SET like_count = "
+            "(SELECT COUNT(*) FROM likes WHERE likes.recipe_id = recipes.id)"
+        )
+
+    conn.commit()
+    conn.close()
+    print(f"Built {path} in {time.perf_counter() - started:.1f}s")
+    return path
+
+
+def open_session(path: str):
+    """SQLAlchemy session on a benchmark database"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={'check_same_thread': False})
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def timed(fn, repeat: int = 5) -> float:
+    """Median wall time of fn() in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
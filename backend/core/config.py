@@ -13,4 +13,64 @@ class ValidationLimits:
     MIN_BUDGET = 0.0
     MAX_BUDGET = 100.0
     MIN_COOKING_TIME = 0
-    MAX_COOKING_TIME = 180
\ No newline at end of file
+    MAX_COOKING_TIME = 180
+
+class PaginationLimits:
+    """Page size and offset limits for recipe listings"""
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+    MAX_OFFSET = 1000  # deeper pages must use the keyset cursor
+    MAX_BATCH_SIZE = 500  # recipe ids per POST /api/recipes/batch
+
+class CacheSettings:
+    """Sizes and lifetimes of process-local caches"""
+    FILTER_COUNT_CACHE_SIZE = 1024  # (filter tuple, catalog version) -> total count
+    SEARCH_RESULT_CACHE_SIZE = 256  # (query, filters, catalog version) -> ranked ids
+    FACET_CACHE_SIZE = 256  # (filter tuple, catalog version) -> facet counts
+    PARSED_RECIPE_CACHE_SIZE = 10000  # (recipe id, updated_at) -> parsed JSON columns
+    RECIPE_FRAGMENT_CACHE_SIZE = 10000  # (recipe id, source hash) -> encoded listing fields
+    USER_LIKED_SET_CACHE_SIZE = 10000  # user id -> ids of the recipes the user liked
+    # Cached liked sets are reloaded after this long, to pick up likes written
+    # by other processes or by raw SQL (this process's writes apply at once)
+    USER_LIKED_SET_TTL_SECONDS = 60
+
+class CatalogSnapshotSettings:
+    """In-memory columnar catalog used for filtering and ordering"""
+    ENABLED = True
+    MAX_AGE_SECONDS = 300  # full rebuild even without observed changes
+    RERANK_INTERVAL_SECONDS = 5  # like-count orderings lag by at most this long
+
+class PantrySettings:
+    """Limits for pantry matching"""
+    MAX_PANTRY_ITEMS = 100
+
+class FacetSettings:
+    """Bucket upper bounds (inclusive) for the budget and cooking time facets"""
+    BUDGET_BUCKETS = (5.0, 10.0, 15.0, 20.0, 30.0)
+    COOKING_TIME_BUCKETS = (15, 30, 45, 60, 90)
+
+class HttpCacheSettings:
+    """Cache-Control for conditional catalog responses"""
+    PUBLIC_MAX_AGE_SECONDS = 60  # anonymous responses, browsers and CDNs
+
+class CompressionSettings:
+    """gzip for responses (see benchmarks/bench_compression.py for tuning)"""
+    MINIMUM_SIZE = 1024  # bytes; smaller bodies gain little and cost latency
+    LEVEL = 5  # zlib level 1-9
+
+class ExportSettings:
+    """Streaming catalog export"""
+    BATCH_SIZE = 1000  # rows read per keyset batch and sent per chunk
+
+class LikeWriteBehindSettings:
+    """Buffered like/unlike ingestion (off: each like commits its own transaction)"""
+    ENABLED = False
+    FLUSH_INTERVAL_MS = 200  # batch flush period
+    MAX_PENDING_EVENTS = 500  # flush early once this many changes are waiting
+    FLUSH_ON_SHUTDOWN = True  # write pending likes before the process exits
+
+class TrendingSettings:
+    """Time-decayed like scores behind /api/recipes/trending"""
+    HALF_LIFE_HOURS = 24  # a like counts half as much after this long
+    MIN_SCORE = 0.01  # lower scores (one like ~7 half-lives old) are not trending
+    RERANK_INTERVAL_SECONDS = 5  # trending order lags by at most this long
@@ -1,10 +1,14 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 import logging
 import os
 
-from .models import Base, UserPreferences, DietaryRestriction
+from .models import (
+    Base, UserPreferences, DietaryRestriction,
+    RECIPE_SEARCH_DDL, RECIPE_INGREDIENTS_DDL, RECIPE_INGREDIENTS_BACKFILL,
+    CHANGE_COUNTER_ROWS, CHANGE_COUNTER_DDL,
+)
 
 # Config logging
 logging.basicConfig(level=logging.INFO)
@@ -26,10 +30,88 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# Columns added after the first release: (table, column, DDL, backfill SQL).
+# create_all() never alters existing tables, so these are applied by hand.
+_COLUMN_UPGRADES = [
+    (
+        'recipes', 'like_count',
+        "ALTER TABLE recipes ADD COLUMN like_count INTEGER NOT NULL DEFAULT 0",
+        "UPDATE recipes SET like_count = "
+        "(SELECT COUNT(*) FROM likes WHERE likes.recipe_id = recipes.id)",
+    ),
+]
+
+
+def _upgrade_schema():
+    """Bring an existing database file up to the current model definitions."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table, column, ddl, backfill in _COLUMN_UPGRADES:
+            if table not in existing_tables:
+                continue
+            if column in {c['name'] for c in inspector.get_columns(table)}:
+                continue
+            logger.info(f"Adding column {table}.{column}")
+            conn.execute(text(ddl))
+            conn.execute(text(backfill))
+
+    # create_all() only creates indexes together with their table
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    ensure_search_index(engine)
+    ensure_ingredient_index(engine)
+    ensure_change_counters(engine)
+
+
+def ensure_search_index(bind) -> None:
+    """
+    Create the recipes_fts index and its triggers on a database that predates
+    them, populating it from the existing recipes.
+    """
+    with bind.begin() as conn:
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'recipes_fts'"
+        )).first()
+        for statement in RECIPE_SEARCH_DDL:
+            conn.execute(text(statement))
+        if not exists:
+            logger.info("Building full-text index recipes_fts")
+            conn.execute(text("INSERT INTO recipes_fts (recipes_fts) VALUES ('rebuild')"))
+
+
+def ensure_ingredient_index(bind) -> None:
+    """
+    Create the recipe_ingredients triggers and, if the table is still empty,
+    migrate the existing JSON ingredient lists into it (one-shot).
+    """
+    with bind.begin() as conn:
+        for statement in RECIPE_INGREDIENTS_DDL:
+            conn.execute(text(statement))
+        populated = conn.execute(text("SELECT 1 FROM recipe_ingredients LIMIT 1")).first()
+        has_recipes = conn.execute(text("SELECT 1 FROM recipes LIMIT 1")).first()
+        if has_recipes and not populated:
+            logger.info("Migrating recipe ingredients into recipe_ingredients")
+            for statement in RECIPE_INGREDIENTS_BACKFILL:
+                conn.execute(text(statement))
+
+
+def ensure_change_counters(bind) -> None:
+    """Create the change_counters rows and triggers on a database that predates them"""
+    with bind.begin() as conn:
+        conn.execute(text(CHANGE_COUNTER_ROWS))
+        for statement in CHANGE_COUNTER_DDL:
+            conn.execute(text(statement))
+
+
 def init_db():
     """Initialize the database by creating all tables."""
     try:
         Base.metadata.create_all(bind=engine)
+        _upgrade_schema()
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
@@ -0,0 +1,20 @@
+"""
+Parsing of JSON list columns (Recipe.ingredients, Recipe.instructions)
+"""
+from typing import Tuple
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def parse_json_list(json_str: str, recipe_id: int, field_name: str) -> Tuple:
+    """
+    Safely parse a JSON list column; invalid or non-list JSON is empty
+    """
+    try:
+        value = json.loads(json_str) if json_str else []
+    except (json.JSONDecodeError, TypeError):
+        logger.warning(f"Invalid {field_name} JSON for recipe {recipe_id}")
+        return ()
+    return tuple(value) if isinstance(value, list) else ()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Enum, ForeignKey, UniqueConstraint, Boolean
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Enum, ForeignKey, UniqueConstraint, Boolean, Index, DDL, event
 from sqlalchemy.orm import declarative_base, sessionmaker
 from pydantic import BaseModel, Field
 from typing import List, Optional
@@ -84,7 +84,7 @@ class Recipe(Base):
     
     # Categories
     cuisine = Column(String(50))  # Japanese, Italian, etc.
-    dietary_restrictions = Column(Enum(DietaryRestriction), default=DietaryRestriction.NONE, index=True)  # indexed for filtering
+    dietary_restrictions = Column(Enum(DietaryRestriction), default=DietaryRestriction.NONE)  # indexed via ix_recipes_diet_budget_time
     
     # Media and metadata
     image_url = Column(String(500))  # placeholder or real image URLs
@@ -95,9 +95,137 @@ class Recipe(Base):
     is_featured = Column(Integer, default=0)  # 0=no, 1=yes (boolean as int for SQLite)
     average_rating = Column(Float, default=0.0)  # for future rating system
 
+    # Denormalized count of rows in likes - maintained by services.like_service
+    like_count = Column(Integer, default=0, server_default='0', nullable=False, index=True)
+
+    # Recommendation filter: equality on diet, then range on budget. cooking_time
+    # is checked from the index entry without touching the table row. The
+    # second index serves the same filter when no diet is selected.
+    # ix_recipes_rank walks recipes in recommendation order (most liked, then
+    # id) and evaluates budget/time from the entry, so a ranked page stops
+    # after LIMIT matches instead of sorting the whole filtered set.
+    __table_args__ = (
+        Index('ix_recipes_diet_budget_time', 'dietary_restrictions', 'budget', 'cooking_time'),
+        Index('ix_recipes_budget_time', 'budget', 'cooking_time'),
+        Index('ix_recipes_rank', like_count.desc(), id, budget, cooking_time),
+    )
+
     def __repr__(self):
         return f"<Recipe(id={self.id}, title={self.title}, budget=£{self.budget})>"
 
+# Full-text index over recipes. It is an external-content FTS5 table: the text
+# lives only in recipes and the triggers below keep the index in step. The
+# update trigger only fires for indexed columns, so like_count bumps and other
+# metadata writes never touch it. ingredients is indexed as its JSON text; the
+# tokenizer drops the brackets and quotes.
+RECIPE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5("
+    "title, description, cuisine, ingredients, "
+    "content='recipes', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+
+    "CREATE TRIGGER IF NOT EXISTS recipes_fts_insert AFTER INSERT ON recipes BEGIN "
+    "INSERT INTO recipes_fts (rowid, title, description, cuisine, ingredients) "
+    "VALUES (new.id, new.title, new.description, new.cuisine, new.ingredients); "
+    "END",
+
+    "CREATE TRIGGER IF NOT EXISTS recipes_fts_delete AFTER DELETE ON recipes BEGIN "
+    "INSERT INTO recipes_fts (recipes_fts, rowid, title, description, cuisine, ingredients) "
+    "VALUES ('delete', old.id, old.title, old.description, old.cuisine, old.ingredients); "
+    "END",
+
+    "CREATE TRIGGER IF NOT EXISTS recipes_fts_update "
+    "AFTER UPDATE OF title, description, cuisine, ingredients ON recipes BEGIN "
+    "INSERT INTO recipes_fts (recipes_fts, rowid, title, description, cuisine, ingredients) "
+    "VALUES ('delete', old.id, old.title, old.description, old.cuisine, old.ingredients); "
+    "INSERT INTO recipes_fts (rowid, title, description, cuisine, ingredients) "
+    "VALUES (new.id, new.title, new.description, new.cuisine, new.ingredients); "
+    "END",
+]
+
+for _statement in RECIPE_SEARCH_DDL:
+    event.listen(Recipe.__table__, 'after_create', DDL(_statement))
+event.listen(Recipe.__table__, 'before_drop', DDL("DROP TABLE IF EXISTS recipes_fts"))
+
+class Ingredient(Base):
+    """Dictionary of distinct ingredient names (trimmed, case preserved)"""
+    __tablename__ = "ingredients"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(200), unique=True, nullable=False)
+
+    def __repr__(self):
+        return f"<Ingredient(id={self.id}, name={self.name})>"
+
+class RecipeIngredient(Base):
+    """
+    Normalized copy of Recipe.ingredients: one row per JSON array element.
+    position is the array index, so order and repeated entries survive.
+    """
+    __tablename__ = "recipe_ingredients"
+
+    recipe_id = Column(Integer, ForeignKey("recipes.id"), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id"), nullable=False)
+
+    # Inverted index: ingredient -> recipes
+    __table_args__ = (
+        Index('ix_recipe_ingredients_ingredient_recipe', 'ingredient_id', 'recipe_id'),
+    )
+
+    def __repr__(self):
+        return f"<RecipeIngredient(recipe_id={self.recipe_id}, ingredient_id={self.ingredient_id})>"
+
+# recipe_ingredients is derived from Recipe.ingredients by triggers, so every
+# writer (ORM, raw SQL, bulk loads) keeps both representations consistent.
+# Only text array elements are indexed; malformed JSON indexes nothing.
+# {recipe} is the row alias (new in triggers, recipes in the backfill) and
+# {source} the extra FROM item the backfill scans.
+_INGREDIENT_ITEMS = (
+    "{source}json_each(CASE WHEN json_valid({recipe}.ingredients) "
+    "THEN {recipe}.ingredients ELSE '[]' END) AS item"
+)
+_INSERT_INGREDIENT_NAMES = (
+    "INSERT OR IGNORE INTO ingredients (name) "
+    f"SELECT trim(item.value) FROM {_INGREDIENT_ITEMS} "
+    "WHERE item.type = 'text' AND trim(item.value) != ''"
+)
+_INSERT_RECIPE_INGREDIENTS = (
+    "INSERT INTO recipe_ingredients (recipe_id, position, ingredient_id) "
+    f"SELECT {{recipe}}.id, item.key, ingredients.id FROM {_INGREDIENT_ITEMS} "
+    "JOIN ingredients ON ingredients.name = trim(item.value) "
+    "WHERE item.type = 'text'"
+)
+
+# Set-based backfill over every recipe (one-shot migration / rebuild)
+RECIPE_INGREDIENTS_BACKFILL = [
+    "DELETE FROM recipe_ingredients",
+    _INSERT_INGREDIENT_NAMES.format(recipe='recipes', source='recipes, '),
+    _INSERT_RECIPE_INGREDIENTS.format(recipe='recipes', source='recipes, '),
+]
+
+RECIPE_INGREDIENTS_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS recipe_ingredients_insert AFTER INSERT ON recipes BEGIN "
+    f"{_INSERT_INGREDIENT_NAMES.format(recipe='new', source='')}; "
+    f"{_INSERT_RECIPE_INGREDIENTS.format(recipe='new', source='')}; "
+    "END",
+
+    "CREATE TRIGGER IF NOT EXISTS recipe_ingredients_delete AFTER DELETE ON recipes BEGIN "
+    "DELETE FROM recipe_ingredients WHERE recipe_id = old.id; "
+    "END",
+
+    "CREATE TRIGGER IF NOT EXISTS recipe_ingredients_update "
+    "AFTER UPDATE OF ingredients ON recipes BEGIN "
+    "DELETE FROM recipe_ingredients WHERE recipe_id = old.id; "
+    f"{_INSERT_INGREDIENT_NAMES.format(recipe='new', source='')}; "
+    f"{_INSERT_RECIPE_INGREDIENTS.format(recipe='new', source='')}; "
+    "END",
+]
+
+# The triggers reference all three tables; recipe_ingredients is created last
+for _statement in RECIPE_INGREDIENTS_DDL:
+    event.listen(RecipeIngredient.__table__, 'after_create', DDL(_statement))
+
 class Like(Base):
     __tablename__ = "likes"
 
@@ -106,14 +234,67 @@ class Like(Base):
     recipe_id = Column(Integer, ForeignKey("recipes.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    # Ensure one user can only like a recipe once
+    # Ensure one user can only like a recipe once. The unique index leads with
+    # user_id; the second index covers per-recipe counts and joins from recipes.
     __table_args__ = (
         UniqueConstraint('user_id', 'recipe_id', name='unique_user_recipe_like'),
+        Index('ix_likes_recipe_user', 'recipe_id', 'user_id'),
     )
 
     def __repr__(self):
         return f"<Like(user_id={self.user_id}, recipe_id={self.recipe_id})>"
 
+class ChangeCounter(Base):
+    """
+    Write counter kept by the triggers below; counts writes from every
+    process, including maintenance commands and scripts
+    """
+    __tablename__ = "change_counters"
+
+    name = Column(String, primary_key=True)  # 'recipes' or 'likes'
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ChangeCounter(name={self.name}, version={self.version})>"
+
+_BUMP_COUNTER = "UPDATE change_counters SET version = version + 1 WHERE name = '{name}'; "
+# Recipe columns other than like_count: like count changes bump 'likes' only.
+# updated_at is left out because like writes set it to itself.
+_RECIPE_CONTENT_COLUMNS = ", ".join(
+    column.name for column in Recipe.__table__.columns if column.name not in ('like_count', 'updated_at')
+)
+
+CHANGE_COUNTER_ROWS = (
+    "INSERT OR IGNORE INTO change_counters (name, version) VALUES ('recipes', 0), ('likes', 0)"
+)
+
+CHANGE_COUNTER_DDL = [
+    "CREATE TRIGGER IF NOT EXISTS change_counters_recipe_insert AFTER INSERT ON recipes BEGIN "
+    f"{_BUMP_COUNTER.format(name='recipes')}END",
+
+    "CREATE TRIGGER IF NOT EXISTS change_counters_recipe_delete AFTER DELETE ON recipes BEGIN "
+    f"{_BUMP_COUNTER.format(name='recipes')}END",
+
+    "CREATE TRIGGER IF NOT EXISTS change_counters_recipe_update "
+    f"AFTER UPDATE OF {_RECIPE_CONTENT_COLUMNS} ON recipes BEGIN "
+    f"{_BUMP_COUNTER.format(name='recipes')}END",
+
+    "CREATE TRIGGER IF NOT EXISTS change_counters_like_count "
+    "AFTER UPDATE OF like_count ON recipes BEGIN "
+    f"{_BUMP_COUNTER.format(name='likes')}END",
+
+    "CREATE TRIGGER IF NOT EXISTS change_counters_like_insert AFTER INSERT ON likes BEGIN "
+    f"{_BUMP_COUNTER.format(name='likes')}END",
+
+    "CREATE TRIGGER IF NOT EXISTS change_counters_like_delete AFTER DELETE ON likes BEGIN "
+    f"{_BUMP_COUNTER.format(name='likes')}END",
+]
+
+event.listen(ChangeCounter.__table__, 'after_create', DDL(CHANGE_COUNTER_ROWS))
+# The triggers are created with likes, which comes after recipes
+for _statement in CHANGE_COUNTER_DDL:
+    event.listen(Like.__table__, 'after_create', DDL(_statement))
+
 class ShoppingList(Base):
     __tablename__ = "shopping_lists"
     
@@ -0,0 +1,44 @@
+"""
+orjson-based JSON response used as the application default
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# datetimes and enums (DietaryRestriction, DifficultyLevel -> their values)
+# are handled natively; NumPy scalars/arrays come from the catalog snapshot
+# and the AI similarity scores
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not encode by itself"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value to compact UTF-8 JSON"""
+    return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson
+
+    Used as the app's default_response_class. Routes returning a plain dict
+    still pass through FastAPI's jsonable_encoder first; hot routes return a
+    FastJSONResponse themselves, which skips it along with any response_model
+    validation.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -2,8 +2,8 @@ from pydantic import BaseModel, Field, EmailStr
 from .models import DietaryRestriction, DifficultyLevel
 from typing import Optional, List
 from datetime import datetime
-from .config import DefaultPreferences, ValidationLimits
-import json
+from .config import DefaultPreferences, PaginationLimits, ValidationLimits
+from .json_columns import parse_json_list
 
 # ============================================
 # Pydantic Models - For API request
@@ -89,8 +89,8 @@ class RecipeResponse(BaseModel):
             id=recipe.id,
             title=recipe.title,
             description=recipe.description,
-            ingredients=json.loads(recipe.ingredients) if recipe.ingredients else [],
-            instructions=json.loads(recipe.instructions) if recipe.instructions else [],
+            ingredients=list(parse_json_list(recipe.ingredients, recipe.id, "ingredients")),
+            instructions=list(parse_json_list(recipe.instructions, recipe.id, "instructions")),
             cooking_time=recipe.cooking_time,
             prep_time=recipe.prep_time,
             difficulty=recipe.difficulty,
@@ -108,6 +108,11 @@ class RecipeResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RecipeBatchRequest(BaseModel):
+    recipe_ids: List[int] = Field(min_length=1, max_length=PaginationLimits.MAX_BATCH_SIZE)
+    user_id: Optional[int] = None
+    fields: Optional[str] = None  # comma-separated listing fields or "summary"
+
 # Like schemas
 class LikeCreate(BaseModel):
     recipe_id: int
@@ -121,11 +126,22 @@ class LikeResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class LikeQueuedResponse(BaseModel):
+    """202 body of a like or unlike taken by the write-behind buffer"""
+    recipe_id: int
+    user_id: int
+    liked: bool  # state the change sets
+    changed: bool  # False if the recipe was already in that state
+
 class RecipeLikeCount(BaseModel):
     recipe_id: int
     like_count: int
     user_has_liked: bool
 
+class RecipeLikesBulkRequest(BaseModel):
+    recipe_ids: List[int] = Field(min_length=1, max_length=PaginationLimits.MAX_BATCH_SIZE)
+    user_id: Optional[int] = None
+
 # Shopping List Schemas
 class ShoppingListItemBase(BaseModel):
     ingredient: str
@@ -2,13 +2,25 @@
 BiteBerry API - Main application entry point
 Streamlined and organized backend structure
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 import logging
 
 # Import core modules
-from core.database import init_db
+from core.database import init_db, SessionLocal
+from core.config import (
+    PaginationLimits, CatalogSnapshotSettings, CompressionSettings, LikeWriteBehindSettings
+)
+from core.responses import FastJSONResponse
+
+from services.catalog_snapshot import get_catalog_snapshot
+from services.like_buffer import start_like_write_buffer, stop_like_write_buffer
+from services.pantry_index import get_ingredient_bitsets
+from services.trending import get_trending_scores
+from services.lru_cache import get_cache_stats
+from services.query_plan_check import check_hot_query_plans
 
 # Import API routes
 from api.routes import recipes, auth, preferences, likes, shopping, meal_planning
@@ -28,18 +40,36 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
+
+    # Warn early if an index is missing for a hot query, and build the
+    # catalog snapshot (with its ingredient bitsets) and trending scores
+    # before the first request needs them
+    db = SessionLocal()
+    try:
+        check_hot_query_plans(db)
+        if CatalogSnapshotSettings.ENABLED:
+            get_catalog_snapshot(db)
+            get_ingredient_bitsets(db)
+        get_trending_scores(db)
+    finally:
+        db.close()
+
+    if LikeWriteBehindSettings.ENABLED:
+        start_like_write_buffer(SessionLocal)
     
     yield
     
     # Shutdown
     logger.info("Shutting down BiteBerry API...")
+    stop_like_write_buffer(flush=LikeWriteBehindSettings.FLUSH_ON_SHUTDOWN)
 
 
 app = FastAPI(
     title="BiteBerry API",
     description="Recipe recommendation system with user preferences",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -51,6 +81,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip JSON bodies above the threshold; 304s and small responses pass through
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=CompressionSettings.MINIMUM_SIZE,
+    compresslevel=CompressionSettings.LEVEL,
+)
+
 # Root endpoint
 @app.get('/')
 async def root():
@@ -62,13 +99,25 @@ async def root():
 
 # Legacy route for backward compatibility
 @app.get('/recipes')
-async def get_recipes_legacy():
+async def get_recipes_legacy(
+    request: Request,
+    user_id: int = None,
+    limit: int = PaginationLimits.DEFAULT_PAGE_SIZE,
+    cursor: str = None,
+    offset: int = 0,
+    sort: str = 'id',
+    order: str = 'asc',
+    fields: str = None
+):
     """Legacy endpoint - redirects to new structure"""
     from api.routes.recipes import get_all_recipes
     from core.database import get_db
     
     db = next(get_db())
-    return await get_all_recipes(db)
+    return await get_all_recipes(
+        request=request, user_id=user_id, limit=limit, cursor=cursor, offset=offset,
+        sort=sort, order=order, fields=fields, db=db
+    )
 
 # Legacy recommendation route for backward compatibility  
 @app.get('/recommend/{user_id}')
@@ -78,7 +127,7 @@ async def recommend_recipe_legacy(user_id: int, max_budget: float = None, max_co
     from core.database import get_db
     
     db = next(get_db())
-    return await recommend_recipe(user_id, max_budget, max_cooking_time, dietary_restrictions, db)
+    return await recommend_recipe(user_id, max_budget, max_cooking_time, dietary_restrictions, db=db)
 
 # Include all API routes
 app.include_router(recipes.router)
@@ -98,6 +147,12 @@ async def health_check():
     }
 
 
+@app.get('/health/caches')
+async def cache_stats():
+    """Size and hit/miss/eviction counters of the process-local caches"""
+    return get_cache_stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     import os
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Database maintenance commands
+
+Usage:
+  python maintenance.py reconcile-likes      # Rebuild recipe like counters from the likes table
+  python maintenance.py check-query-plans    # EXPLAIN the hot queries and report full scans
+  python maintenance.py rebuild-ingredients  # Rebuild recipe_ingredients from the JSON ingredient lists
+"""
+import argparse
+import sys
+
+from core.database import SessionLocal, init_db
+from services.ingredient_service import rebuild_recipe_ingredients
+from services.like_service import reconcile_like_counts
+from services.query_plan_check import check_hot_query_plans
+
+
+def reconcile_likes():
+    """Rebuild Recipe.like_count in one bulk update"""
+    db = SessionLocal()
+    try:
+        corrected = reconcile_like_counts(db)
+        print(f"✅ Like counts reconciled: {corrected} recipe(s) corrected")
+    finally:
+        db.close()
+
+
+def check_query_plans():
+    """Report hot queries whose plan falls back to a full table scan"""
+    db = SessionLocal()
+    try:
+        warnings = check_hot_query_plans(db)
+    finally:
+        db.close()
+
+    if warnings:
+        for warning in warnings:
+            print(f"⚠️  {warning}")
+        sys.exit(1)
+    print("✅ All hot queries use an index")
+
+
+def rebuild_ingredients():
+    """Re-derive recipe_ingredients from Recipe.ingredients"""
+    db = SessionLocal()
+    try:
+        rows = rebuild_recipe_ingredients(db)
+        print(f"✅ recipe_ingredients rebuilt: {rows} row(s)")
+    finally:
+        db.close()
+
+
+COMMANDS = {
+    'reconcile-likes': reconcile_likes,
+    'check-query-plans': check_query_plans,
+    'rebuild-ingredients': rebuild_ingredients,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BiteBerry database maintenance")
+    parser.add_argument('command', choices=sorted(COMMANDS))
+    args = parser.parse_args(argv)
+
+    init_db()
+    COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    main()
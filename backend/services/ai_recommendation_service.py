@@ -3,10 +3,14 @@ Simple AI-powered recipe recommendation service using SentenceTransformers
 """
 from sentence_transformers import SentenceTransformer
 from sqlalchemy.orm import Session
-from core.models import Recipe, Like
+from core.models import Recipe
+from services.ingredient_service import get_recipe_ingredient_names
+from services.parsed_recipe_cache import get_parsed_ingredients
+from services.like_buffer import get_like_write_buffer
+from services.trending import get_trending_page
+from services.user_liked_cache import get_user_liked_set
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
-import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,13 +26,18 @@ class AIRecommendationService:
             self.model = SentenceTransformer('all-MiniLM-L6-v2')
         return self.model
     
-    def _recipe_to_text(self, recipe: Recipe) -> str:
-        """Convert recipe to text for embedding generation"""
-        try:
-            ingredients = json.loads(recipe.ingredients) if recipe.ingredients else []
-            ingredients_text = " ".join(ingredients[:5])  # First 5 ingredients only
-        except (json.JSONDecodeError, TypeError):
-            ingredients_text = ""
+    def _recipe_to_text(self, recipe: Recipe, ingredients: list = None) -> str:
+        """
+        Convert recipe to text for embedding generation
+
+        Args:
+            recipe: Recipe to describe
+            ingredients: Ingredient names from recipe_ingredients; parsed from
+                the JSON column when not given
+        """
+        if ingredients is None:
+            ingredients = get_parsed_ingredients(recipe)
+        ingredients_text = " ".join(ingredients[:5])  # First 5 ingredients only
         
         text_parts = [
             recipe.title,
@@ -52,9 +61,8 @@ class AIRecommendationService:
             List of recommended recipe IDs with similarity scores
         """
         try:
-            # Get user's liked recipes
-            liked_recipe_ids = db.query(Like.recipe_id).filter(Like.user_id == user_id).all()
-            liked_recipe_ids = [id[0] for id in liked_recipe_ids]
+            # Get user's liked recipes, including likes not yet written
+            liked_recipe_ids = self._get_liked_recipe_ids(db, user_id)
             
             if not liked_recipe_ids:
                 logger.info(f"No liked recipes found for user {user_id}, using popular recipes")
@@ -78,9 +86,16 @@ class AIRecommendationService:
             # Generate embeddings
             model = self._get_model()
             
-            # Convert recipes to text
-            liked_texts = [self._recipe_to_text(recipe) for recipe in liked_recipes]
-            candidate_texts = [self._recipe_to_text(recipe) for recipe in candidate_recipes]
+            # Convert recipes to text (ingredients for the whole catalog in one query)
+            ingredients = get_recipe_ingredient_names(db)
+            liked_texts = [
+                self._recipe_to_text(recipe, ingredients.get(recipe.id, []))
+                for recipe in liked_recipes
+            ]
+            candidate_texts = [
+                self._recipe_to_text(recipe, ingredients.get(recipe.id, []))
+                for recipe in candidate_recipes
+            ]
             
             # Generate embeddings
             liked_embeddings = model.encode(liked_texts)
@@ -109,9 +124,32 @@ class AIRecommendationService:
             logger.error(f"Error generating AI recommendations: {e}")
             return []
     
+    def _get_liked_recipe_ids(self, db: Session, user_id: int) -> set:
+        """
+        Ids of the recipes a user likes, with the write-behind buffer's
+        queued likes and unlikes applied to a copy of the cached set
+        """
+        liked_recipe_ids = get_user_liked_set(db, user_id)
+        buffer = get_like_write_buffer()
+        if buffer is None:
+            return liked_recipe_ids
+        overrides = buffer.user_overrides(user_id)
+        if not overrides:
+            return liked_recipe_ids
+        liked_recipe_ids = set(liked_recipe_ids)
+        for recipe_id, liked in overrides.items():
+            if liked:
+                liked_recipe_ids.add(recipe_id)
+            else:
+                liked_recipe_ids.discard(recipe_id)
+        return liked_recipe_ids
+
     def _get_popular_recipes_for_new_users(self, db: Session, limit: int = 5) -> list:
         """
         Get popular recipes for new users who haven't liked anything yet
+
+        Popular means trending (recent likes weigh more, see services.trending);
+        when fewer recipes are trending, the most liked of all time fill in.
         
         Args:
             db: Database session
@@ -121,25 +159,29 @@ class AIRecommendationService:
             List of popular recipes formatted as recommendations
         """
         try:
-            # Get recipes ordered by like count (most popular first)
-            from sqlalchemy import func
-            
-            popular_recipes = (
-                db.query(Recipe, func.count(Like.id).label('like_count'))
-                .outerjoin(Like, Recipe.id == Like.recipe_id)
-                .group_by(Recipe.id)
-                .order_by(func.count(Like.id).desc(), Recipe.id.asc())
-                .limit(limit)
-                .all()
-            )
+            # Trending recipes first, scored by their decayed like counts
+            trending, _ = get_trending_page(db, limit)
+            recipes = {
+                recipe.id: recipe
+                for recipe in db.query(Recipe).filter(Recipe.id.in_([recipe_id for recipe_id, _ in trending]))
+            }
+            popular_recipes = [
+                (recipes[recipe_id], score) for recipe_id, score in trending if recipe_id in recipes
+            ]
+
+            # Then the most liked of all time, below every trending recipe
+            if len(popular_recipes) < limit:
+                popular_recipes += [
+                    (recipe, 0.0) for recipe in
+                    db.query(Recipe)
+                    .filter(Recipe.id.notin_(list(recipes)))
+                    .order_by(Recipe.like_count.desc(), Recipe.id.asc())
+                    .limit(limit - len(popular_recipes))
+                ]
 
             if not popular_recipes:
                 return []
             
-            like_counts = [like_count for _, like_count in popular_recipes]
-            max_like = max(like_counts)
-            min_like = min(like_counts)
-
             max_score = 0.95
             min_score = 0.60
             
@@ -156,18 +198,19 @@ class AIRecommendationService:
             #         'like_count': like_count
             #     })
 
-            for recipe, like_count in popular_recipes:
-                if max_like == min_like:
-                    similarity_score = (max_score + min_score) / 2
-                else:
-                    similarity_score = min_score + (like_count - min_like) * (max_score - min_score) / (max_like - min_like)
+            # Spread by rank: trending scores and all-time fill-ins are not
+            # on one scale, but the order between them is
+            step = (max_score - min_score) / max(len(popular_recipes) - 1, 1)
+            for rank, (recipe, score) in enumerate(popular_recipes):
+                similarity_score = max_score - rank * step
                 
                 recommendations.append({
                         'recipe_id': recipe.id,
                         'similarity_score': round(similarity_score, 3),
                         'recipe': recipe,
                         'recommendation_type': 'popular',
-                        'like_count': like_count
+                        'like_count': recipe.like_count,
+                        'trending_score': round(score, 4)
                     })
             
             logger.info(f"Generated {len(recommendations)} popular recipes for new user")
@@ -0,0 +1,508 @@
+"""
+In-memory columnar snapshot of the recipe catalog
+
+The columns used for filtering, ordering and faceting (id, budget,
+cooking_time, diet, difficulty, cuisine, like_count) are held as NumPy
+arrays. Recommendation and listing pages are then a vectorized mask plus a
+precomputed ordering, and only the final page's rows are loaded from the
+database.
+
+The snapshot follows the catalog version: recipe edits are patched in from
+the catalog_state change log, and like/unlike deltas are applied in place.
+When the log cannot tell what changed, or MAX_AGE_SECONDS have passed since
+the last full build, a background thread rebuilds the snapshot while the
+current one keeps serving; like counts of recipes liked meanwhile are
+reloaded before the new snapshot is swapped in.
+
+Orderings that depend on like_count are recomputed lazily, at most every
+CatalogSnapshotSettings.RERANK_INTERVAL_SECONDS, and include likes still
+queued in the write-behind buffer (add_pending_like_delta), which are kept
+apart from the written counts so rebuilds do not drop them. Like deltas and
+reranks hold a per-snapshot lock.
+
+Recommendation pages walk the ranking in growing chunks and stop once the
+page is filled, like the SQL path's walk of ix_recipes_rank; the total is
+counted once per filter tuple and snapshot.
+"""
+from sqlalchemy.orm import Session
+from threading import Lock, Thread
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import logging
+import time
+
+import numpy as np
+
+from core.config import CacheSettings, CatalogSnapshotSettings
+from core.models import DietaryRestriction, DifficultyLevel
+from services.catalog_state import get_catalog_version, get_recipe_changes_since
+from services.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Enum columns are stored by name; codes are positions in the enum
+DIET_CODES = {diet.name: code for code, diet in enumerate(DietaryRestriction)}
+DIETS = list(DietaryRestriction)
+DIFFICULTY_CODES = {level.name: code for code, level in enumerate(DifficultyLevel)}
+DIFFICULTIES = list(DifficultyLevel)
+
+# Ranked rows examined by the first chunk of a recommendation page walk
+_MIN_WALK_CHUNK = 4096
+
+# Matches per (snapshot, budget, cooking_time, diet); filters ignore like_count
+_match_count_cache = LRUCache(CacheSettings.FILTER_COUNT_CACHE_SIZE, 'snapshot_match_counts')
+
+_COLUMNS_SQL = (
+    "SELECT id, budget, cooking_time, dietary_restrictions, difficulty, cuisine, like_count "
+    "FROM recipes"
+)
+
+
+class CatalogSnapshot:
+    """Immutable-by-convention column arrays sorted by recipe id"""
+
+    def __init__(self, ids, budget, cooking_time, diet, difficulty, cuisine, like_count,
+                 cuisines: List[Optional[str]], version: int):
+        self.ids = ids
+        self.budget = budget
+        self.cooking_time = cooking_time
+        self.diet = diet
+        self.difficulty = difficulty
+        self.cuisine = cuisine
+        self.like_count = like_count
+        self.cuisines = cuisines
+        self.version = version
+        self.built_at = time.monotonic()
+        # Built on demand by services.pantry_index, carried through patches
+        # and rebuilt in the background with the snapshot
+        self.ingredient_bitsets = None
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        # Guards like_count and the like-based orderings
+        self._lock = Lock()
+        self._reindex()
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, db: Session, version: int) -> "CatalogSnapshot":
+        """Load the filter columns for the whole catalog"""
+        started = time.perf_counter()
+        rows = db.connection().exec_driver_sql(f"{_COLUMNS_SQL} ORDER BY id").fetchall()
+        snapshot = cls._from_rows(rows, [None], version)
+        logger.info(
+            f"Built catalog snapshot v{version}: {len(rows)} recipes in "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        return snapshot
+
+    @classmethod
+    def _from_rows(cls, rows: Sequence[tuple], cuisines: List[Optional[str]], version: int):
+        ids, budget, cooking_time, diet, difficulty, cuisine, like_count = (
+            zip(*rows) if rows else ((),) * 7
+        )
+        cuisine_codes = {name: code for code, name in enumerate(cuisines)}
+        for name in set(cuisine) - cuisine_codes.keys():
+            cuisine_codes[name] = len(cuisines)
+            cuisines.append(name)
+
+        return cls(
+            ids=np.array(ids, dtype=np.int64),
+            budget=np.array(budget, dtype=np.float64),
+            cooking_time=np.array(cooking_time, dtype=np.int32),
+            diet=np.array([DIET_CODES.get(name, 0) for name in diet], dtype=np.int8),
+            # Missing difficulty counts as the column default, EASY
+            difficulty=np.array([DIFFICULTY_CODES.get(name, 0) for name in difficulty], dtype=np.int8),
+            cuisine=np.array([cuisine_codes[name] for name in cuisine], dtype=np.int16),
+            like_count=np.array([count or 0 for count in like_count], dtype=np.int64),
+            cuisines=cuisines,
+            version=version,
+        )
+
+    def patched(self, db: Session, changed_ids: Iterable[int], version: int) -> "CatalogSnapshot":
+        """Return a new snapshot with the given recipes reloaded from the database"""
+        changed_ids = sorted(changed_ids)
+        placeholders = ",".join("?" * len(changed_ids))
+        rows = db.connection().exec_driver_sql(
+            f"{_COLUMNS_SQL} WHERE id IN ({placeholders})", tuple(changed_ids)
+        ).fetchall() if changed_ids else []
+
+        keep = ~np.isin(self.ids, changed_ids)
+        fresh = CatalogSnapshot._from_rows(rows, list(self.cuisines), version)
+
+        ids = np.concatenate([self.ids[keep], fresh.ids])
+        order = np.argsort(ids, kind='stable')
+        snapshot = CatalogSnapshot(
+            ids=ids[order],
+            budget=np.concatenate([self.budget[keep], fresh.budget])[order],
+            cooking_time=np.concatenate([self.cooking_time[keep], fresh.cooking_time])[order],
+            diet=np.concatenate([self.diet[keep], fresh.diet])[order],
+            difficulty=np.concatenate([self.difficulty[keep], fresh.difficulty])[order],
+            cuisine=np.concatenate([self.cuisine[keep], fresh.cuisine])[order],
+            like_count=np.concatenate([self.like_count[keep], fresh.like_count])[order],
+            cuisines=fresh.cuisines,
+            version=version,
+        )
+        # Age counts from the last full build, so MAX_AGE still applies
+        snapshot.built_at = self.built_at
+        if self.ingredient_bitsets is not None:
+            snapshot.ingredient_bitsets = self.ingredient_bitsets.patched(db, keep, fresh.ids, order)
+        return snapshot
+
+    def _reindex(self):
+        """Precompute (permutation, sorted values, sorted ids) per sort key"""
+        identity = np.arange(len(self.ids))
+        self._sorted['id'] = (identity, self.ids, self.ids)
+        for sort, values in (('budget', self.budget), ('cooking_time', self.cooking_time)):
+            perm = np.lexsort((self.ids, values))
+            self._sorted[sort] = (perm, values[perm], self.ids[perm])
+        self._rerank()
+
+    def _rerank(self):
+        """Recompute the orderings that depend on like_count"""
+        # Cleared first so a delta arriving during the rerank marks it again
+        self._ranks_dirty = False
+        like_count = self._with_pending_likes()
+        perm = np.lexsort((self.ids, like_count))
+        self._sorted['likes'] = (perm, like_count[perm], self.ids[perm])
+
+        # Recommendation order (like_count DESC, id ASC) with the filter
+        # columns laid out in that order so masks need no gather. Swapped in
+        # as one tuple so readers never mix two rankings.
+        rank = np.lexsort((self.ids, -like_count))
+        self._ranked = (self.ids[rank], self.budget[rank], self.cooking_time[rank], self.diet[rank])
+        self._ranked_at = time.monotonic()
+
+    def _with_pending_likes(self) -> np.ndarray:
+        """Like counts plus the buffered deltas not yet written"""
+        with _pending_lock:
+            pending = list(_pending_like_deltas.items())
+        if not pending:
+            return self.like_count
+        like_count = self.like_count.copy()
+        for recipe_id, delta in pending:
+            pos = self.position(recipe_id)
+            if pos is not None:
+                like_count[pos] += delta
+        return like_count
+
+    def _refresh_ranks(self):
+        if self._ranks_dirty and (
+            time.monotonic() - self._ranked_at >= CatalogSnapshotSettings.RERANK_INTERVAL_SECONDS
+        ):
+            with self._lock:
+                if self._ranks_dirty:
+                    self._rerank()
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def position(self, recipe_id: int) -> Optional[int]:
+        """Index of a recipe in the id-sorted columns"""
+        pos = int(np.searchsorted(self.ids, recipe_id))
+        if pos < len(self.ids) and self.ids[pos] == recipe_id:
+            return pos
+        return None
+
+    def apply_like_delta(self, recipe_id: int, delta: int) -> None:
+        """Adjust a recipe's like count; like-based orderings catch up lazily"""
+        pos = self.position(recipe_id)
+        if pos is not None:
+            with self._lock:
+                self.like_count[pos] += delta
+                self._ranks_dirty = True
+
+    def reload_like_counts(self, db: Session, recipe_ids: Iterable[int]) -> None:
+        """Set the like counts of the given recipes from the database"""
+        recipe_ids = sorted(recipe_ids)
+        if not recipe_ids:
+            return
+        placeholders = ",".join("?" * len(recipe_ids))
+        rows = db.connection().exec_driver_sql(
+            f"SELECT id, like_count FROM recipes WHERE id IN ({placeholders})", tuple(recipe_ids)
+        ).fetchall()
+        with self._lock:
+            for recipe_id, like_count in rows:
+                pos = self.position(recipe_id)
+                if pos is not None:
+                    self.like_count[pos] = like_count or 0
+            self._ranks_dirty = True
+
+    def is_expired(self) -> bool:
+        return time.monotonic() - self.built_at > CatalogSnapshotSettings.MAX_AGE_SECONDS
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def filter_mask(
+        self,
+        budget: Optional[float] = None,
+        cooking_time: Optional[int] = None,
+        dietary_restrictions: Optional[DietaryRestriction] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Boolean mask (id order) of recipes within the given limits
+
+        Returns:
+            The mask, or None when no filter applies
+        """
+        mask = None
+        if budget is not None:
+            mask = self.budget <= budget
+        if cooking_time is not None:
+            within = self.cooking_time <= cooking_time
+            mask = within if mask is None else mask & within
+        if dietary_restrictions is not None and dietary_restrictions != DietaryRestriction.NONE:
+            matches = self.diet == DIET_CODES[dietary_restrictions.name]
+            mask = matches if mask is None else mask & matches
+        return mask
+
+    def ranked_page(
+        self,
+        budget: float,
+        cooking_time: int,
+        dietary_restrictions: DietaryRestriction,
+        limit: int,
+        offset: int = 0,
+        exclude_ids: Sequence[int] = ()
+    ) -> Tuple[List[int], int]:
+        """
+        Filtered recipe ids in recommendation order
+
+        Returns:
+            Tuple of (page of recipe ids, total number of matches)
+        """
+        self._refresh_ranks()
+        ranked_ids, ranked_budget, ranked_cooking_time, ranked_diet = self._ranked
+        diet = None if dietary_restrictions == DietaryRestriction.NONE else DIET_CODES[dietary_restrictions.name]
+        excluded = np.unique(np.asarray(list(exclude_ids), dtype=np.int64)) if exclude_ids else None
+
+        # Only the first offset + limit matches are needed: walk the ranking
+        # in growing chunks instead of masking the whole catalog
+        wanted = offset + limit
+        found, n_found = [], 0
+        start, size, n = 0, max(2 * wanted, _MIN_WALK_CHUNK), len(ranked_ids)
+        while start < n and n_found < wanted:
+            stop = min(start + size, n)
+            mask = (ranked_budget[start:stop] <= budget) & (ranked_cooking_time[start:stop] <= cooking_time)
+            if diet is not None:
+                mask &= ranked_diet[start:stop] == diet
+            chunk = ranked_ids[start:stop][mask]
+            if excluded is not None:
+                chunk = chunk[~np.isin(chunk, excluded)]
+            found.append(chunk)
+            n_found += len(chunk)
+            start, size = stop, 4 * size
+        page = np.concatenate(found)[offset:wanted] if found else ranked_ids[:0]
+
+        total = self.match_count(budget, cooking_time, dietary_restrictions)
+        if excluded is not None:
+            total -= self.match_count(budget, cooking_time, dietary_restrictions, among=excluded)
+        return page.tolist(), total
+
+    def match_count(
+        self,
+        budget: float,
+        cooking_time: int,
+        dietary_restrictions: DietaryRestriction,
+        among: Optional[np.ndarray] = None
+    ) -> int:
+        """
+        Number of recipes within the limits, cached per snapshot unless
+        restricted to the (unique) recipe ids in `among`
+        """
+        if among is not None:
+            pos = np.searchsorted(self.ids, among).clip(max=max(len(self.ids) - 1, 0))
+            pos = pos[self.ids[pos] == among] if len(self.ids) else pos[:0]
+            mask = (self.budget[pos] <= budget) & (self.cooking_time[pos] <= cooking_time)
+            if dietary_restrictions != DietaryRestriction.NONE:
+                mask &= self.diet[pos] == DIET_CODES[dietary_restrictions.name]
+            return int(np.count_nonzero(mask))
+
+        key = (self.version, self.built_at, budget, cooking_time, dietary_restrictions)
+        count = _match_count_cache.get(key)
+        if count is None:
+            mask = self.filter_mask(budget, cooking_time, dietary_restrictions)
+            count = len(self.ids) if mask is None else int(np.count_nonzero(mask))
+            _match_count_cache.put(key, count)
+        return count
+
+    def keyset_page(
+        self,
+        sort: str,
+        order: str,
+        after: Optional[Tuple[Any, int]],
+        limit: int,
+        offset: int = 0
+    ) -> Tuple[List[int], List[Any]]:
+        """
+        Recipe ids for one catalog page ordered by (sort value, id)
+
+        Mirrors recipe_query_service.build_recipe_page_query: ascending pages
+        follow (value, id) ascending, descending pages the exact reverse.
+
+        Returns:
+            Tuple of (recipe ids, their sort values)
+        """
+        if sort == 'likes':
+            self._refresh_ranks()
+        perm, values, ids = self._sorted[sort]
+        n = len(ids)
+
+        if order == 'asc':
+            if after is None:
+                start = offset
+            else:
+                sort_value, last_id = after
+                lo = int(np.searchsorted(values, sort_value, 'left'))
+                hi = int(np.searchsorted(values, sort_value, 'right'))
+                start = lo + int(np.searchsorted(ids[lo:hi], last_id, 'right'))
+            window = slice(start, min(start + limit, n))
+        else:
+            if after is None:
+                end = n - offset
+            else:
+                sort_value, last_id = after
+                lo = int(np.searchsorted(values, sort_value, 'left'))
+                hi = int(np.searchsorted(values, sort_value, 'right'))
+                end = lo + int(np.searchsorted(ids[lo:hi], last_id, 'left'))
+            start = max(end - limit, 0)
+            window = slice(end - 1, start - 1 if start else None, -1)
+
+        return ids[window].tolist(), values[window].tolist()
+
+
+_snapshot: Optional[CatalogSnapshot] = None
+# Guards _snapshot, the rebuild state and like deltas applied to the snapshot
+_snapshot_lock = Lock()
+_rebuild_thread: Optional[Thread] = None
+# Recipes whose like count changed since the running rebuild started
+_rebuild_liked: Optional[Set[int]] = None
+# Bumped by reset_catalog_snapshot so an abandoned rebuild is not swapped in
+_generation = 0
+# Net like count change per recipe still queued in the write-behind buffer
+_pending_like_deltas: Dict[int, int] = {}
+_pending_lock = Lock()
+
+
+def get_catalog_snapshot(db: Session) -> CatalogSnapshot:
+    """
+    Current snapshot, built on first use and kept in step with the catalog version
+
+    Only the first build runs on the request path; later full rebuilds run in
+    the background and the previous snapshot is served until they finish.
+    """
+    global _snapshot
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is not None and (
+        _rebuild_thread is not None or (snapshot.version == version and not snapshot.is_expired())
+    ):
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is None:
+            snapshot = _snapshot = CatalogSnapshot.build(db, version)
+            return snapshot
+        if _rebuild_thread is not None:
+            return snapshot
+
+        if snapshot.version != version:
+            changed_ids = get_recipe_changes_since(snapshot.version)
+            if changed_ids is None:
+                _start_rebuild(db)
+                return snapshot
+            snapshot = _snapshot = snapshot.patched(db, changed_ids, version)
+        if snapshot.is_expired():
+            _start_rebuild(db)
+        return snapshot
+
+
+def _start_rebuild(db: Session) -> None:
+    """Rebuild the snapshot from a background thread (caller holds _snapshot_lock)"""
+    global _rebuild_thread, _rebuild_liked
+    _rebuild_liked = set()
+    _rebuild_thread = Thread(
+        target=_rebuild, args=(db.get_bind(), _generation), name="catalog-snapshot-rebuild", daemon=True
+    )
+    _rebuild_thread.start()
+
+
+def _rebuild(bind, generation: int) -> None:
+    global _snapshot, _rebuild_thread, _rebuild_liked
+    db = Session(bind=bind)
+    try:
+        # Read the version first: edits committed during the build are
+        # patched in afterwards
+        snapshot = CatalogSnapshot.build(db, get_catalog_version())
+        # Pantry matching is in use: build its bitsets here too rather than
+        # on the first pantry request after the swap
+        bitsets = _snapshot.ingredient_bitsets if _snapshot is not None else None
+        if bitsets is not None:
+            snapshot.ingredient_bitsets = bitsets.rebuilt(db, snapshot.ids)
+        with _snapshot_lock:
+            if generation == _generation:
+                # Likes committed while building may or may not have been read
+                snapshot.reload_like_counts(db, _rebuild_liked)
+                _snapshot = snapshot
+    except Exception as e:
+        logger.error(f"Failed to rebuild catalog snapshot: {e}")
+    finally:
+        db.close()
+        with _snapshot_lock:
+            if generation == _generation:
+                _rebuild_thread, _rebuild_liked = None, None
+
+
+def apply_like_delta(recipe_id: int, delta: int, buffered: bool = False) -> None:
+    """
+    Reflect a committed like/unlike in the current snapshot, if any
+
+    Args:
+        buffered: The change was queued with add_pending_like_delta and is
+            now written, so it moves from the pending deltas to like_count
+    """
+    if buffered:
+        with _pending_lock:
+            _add_pending(recipe_id, -delta)
+    with _snapshot_lock:
+        if _rebuild_liked is not None:
+            _rebuild_liked.add(recipe_id)
+        if _snapshot is not None:
+            _snapshot.apply_like_delta(recipe_id, delta)
+
+
+def add_pending_like_delta(recipe_id: int, delta: int) -> None:
+    """Reflect a like/unlike queued in the write-behind buffer in like-based orderings"""
+    with _pending_lock:
+        _add_pending(recipe_id, delta)
+    snapshot = _snapshot
+    if snapshot is not None:
+        snapshot._ranks_dirty = True
+
+
+def clear_pending_like_deltas() -> None:
+    """Forget every queued delta (the write-behind buffer was dropped)"""
+    with _pending_lock:
+        _pending_like_deltas.clear()
+
+
+def _add_pending(recipe_id: int, delta: int) -> None:
+    pending = _pending_like_deltas.get(recipe_id, 0) + delta
+    if pending:
+        _pending_like_deltas[recipe_id] = pending
+    else:
+        del _pending_like_deltas[recipe_id]
+
+
+def reset_catalog_snapshot() -> None:
+    """Drop the snapshot so the next request rebuilds it from the database"""
+    global _snapshot, _rebuild_thread, _rebuild_liked, _generation
+    with _snapshot_lock:
+        _snapshot = None
+        # A running rebuild finishes on its own but is not swapped in
+        _rebuild_thread, _rebuild_liked = None, None
+        _generation += 1
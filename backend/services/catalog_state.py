@@ -0,0 +1,119 @@
+"""
+Process-local catalog version used to invalidate derived recipe data
+
+The version is bumped after any committed transaction that inserted, updated
+or deleted Recipe rows through the ORM. Caches that depend on recipe content
+key their entries by the current version instead of tracking invalidations.
+A short log of which recipe ids changed at each version lets derived data be
+patched incrementally instead of rebuilt.
+
+Likes do not change the catalog version (they only move like_count); they
+bump a separate like version instead.
+
+Both versions only see this process's writes. Anything that must also follow
+writes from other processes (maintenance commands, scripts, other workers),
+such as HTTP ETags, adds the change counters the database keeps with
+triggers (get_stored_versions).
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from collections import deque
+from threading import Lock
+from typing import Iterable, Optional, Set, Tuple
+
+from core.models import Recipe
+
+CHANGE_LOG_SIZE = 256
+
+_STORED_VERSIONS_SQL = "SELECT name, version FROM change_counters"
+
+_version = 0
+_like_version = 0
+_version_lock = Lock()
+# (version, frozenset of recipe ids or None when the change set is unknown)
+_change_log = deque(maxlen=CHANGE_LOG_SIZE)
+
+
+def get_catalog_version() -> int:
+    """Current catalog version"""
+    return _version
+
+
+def bump_catalog_version(recipe_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Invalidate everything derived from recipe content
+
+    Args:
+        recipe_ids: Recipes that changed, or None if unknown (forces rebuilds)
+    """
+    global _version
+    with _version_lock:
+        _version += 1
+        _change_log.append((_version, frozenset(recipe_ids) if recipe_ids is not None else None))
+        return _version
+
+
+def get_like_version() -> int:
+    """Current like version, bumped whenever any recipe's like count changes"""
+    return _like_version
+
+
+def bump_like_version() -> int:
+    """Invalidate everything derived from like counts or like membership"""
+    global _like_version
+    with _version_lock:
+        _like_version += 1
+        return _like_version
+
+
+def get_stored_versions(db: Session) -> Tuple[int, int]:
+    """
+    Write counters kept by database triggers, counting every process's writes
+
+    Returns:
+        Tuple of (recipes counter, likes counter)
+    """
+    counters = dict(db.connection().exec_driver_sql(_STORED_VERSIONS_SQL).all())
+    return counters.get('recipes', 0), counters.get('likes', 0)
+
+
+def get_recipe_changes_since(version: int) -> Optional[Set[int]]:
+    """
+    Recipe ids changed after the given version
+
+    Returns:
+        Set of changed ids, or None if the change set cannot be reconstructed
+        (log truncated or an unknown change) and derived data must be rebuilt
+    """
+    with _version_lock:
+        if version == _version:
+            return set()
+        entries = [ids for v, ids in _change_log if v > version]
+        if len(entries) != _version - version:
+            return None
+
+    changed = set()
+    for ids in entries:
+        if ids is None:
+            return None
+        changed |= ids
+    return changed
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_recipe_changes(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Recipe):
+            session.info.setdefault('catalog_changed_ids', set()).add(instance.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_on_commit(session):
+    changed_ids = session.info.pop('catalog_changed_ids', None)
+    if changed_ids:
+        bump_catalog_version(changed_ids)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('catalog_changed_ids', None)
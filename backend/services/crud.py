@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from core.models import UserPreferences, DietaryRestriction, Like
 from core.schemas import UserPreferencesBase, UserPreferencesCreate, UserPreferencesUpdate
+from services.like_service import add_like, remove_like
 from typing import Optional
 import logging
 
@@ -74,10 +75,7 @@ def delete_user_preferences(db: Session, prefs_id: int) -> bool:
 def create_like(db: Session, user_id: int, recipe_id: int) -> Like:
     """Create a like for a recipe"""
     try:
-        like = Like(user_id=user_id, recipe_id=recipe_id)
-        db.add(like)
-        db.commit()
-        db.refresh(like)
+        like, _ = add_like(db, user_id, recipe_id)
         return like
     except Exception as e:
         db.rollback()
@@ -87,12 +85,7 @@ def create_like(db: Session, user_id: int, recipe_id: int) -> Like:
 def delete_like(db: Session, user_id: int, recipe_id: int) -> bool:
     """Delete a like for a recipe"""
     try:
-        like = db.query(Like).filter(Like.user_id == user_id, Like.recipe_id == recipe_id).first()
-        if not like:
-            return False
-        db.delete(like)
-        db.commit()
-        return True
+        return remove_like(db, user_id, recipe_id)
     except Exception as e:
         db.rollback()
         logger.error(f'Error deleting like: {e}')
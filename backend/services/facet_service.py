@@ -0,0 +1,164 @@
+"""
+Facet counts (cuisine, diet, difficulty, budget and cooking time buckets)
+for the recipe filter UI
+"""
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+from core.config import CacheSettings, CatalogSnapshotSettings, FacetSettings
+from core.models import DietaryRestriction
+from services.catalog_snapshot import (
+    DIET_CODES, DIETS, DIFFICULTY_CODES, DIFFICULTIES, get_catalog_snapshot
+)
+from services.catalog_state import get_catalog_version
+from services.lru_cache import LRUCache
+
+# Facet counts per (budget, cooking_time, diet, catalog version)
+_facet_cache = LRUCache(CacheSettings.FACET_CACHE_SIZE, 'facets')
+
+
+def get_recipe_facets(
+    db: Session,
+    budget: Optional[float] = None,
+    cooking_time: Optional[int] = None,
+    dietary_restrictions: Optional[DietaryRestriction] = None
+) -> Dict[str, Any]:
+    """
+    Count the recipes matching a filter per cuisine, diet, difficulty,
+    budget bucket and cooking time bucket
+
+    All histograms come from one vectorized pass over the catalog snapshot
+    (or one grouped query when the snapshot is disabled) and are cached per
+    filter tuple and catalog version. The result is shared between callers
+    and must not be modified.
+
+    Args:
+        db: Database session
+        budget: Optional maximum budget
+        cooking_time: Optional maximum cooking time
+        dietary_restrictions: Optional diet; NONE means no diet filter
+
+    Returns:
+        Dict with total_count plus one list of {value/min/max, count} per facet
+    """
+    if dietary_restrictions == DietaryRestriction.NONE:
+        dietary_restrictions = None
+
+    cache_key = (budget, cooking_time, dietary_restrictions, get_catalog_version())
+    facets = _facet_cache.get(cache_key)
+    if facets is None:
+        if CatalogSnapshotSettings.ENABLED:
+            facets = _snapshot_facets(db, budget, cooking_time, dietary_restrictions)
+        else:
+            facets = _query_facets(db, budget, cooking_time, dietary_restrictions)
+        _facet_cache.put(cache_key, facets)
+    return facets
+
+
+def _snapshot_facets(db, budget, cooking_time, dietary_restrictions) -> Dict[str, Any]:
+    """Histograms as bincounts over the masked snapshot columns"""
+    snapshot = get_catalog_snapshot(db)
+    mask = snapshot.filter_mask(budget, cooking_time, dietary_restrictions)
+
+    def column(values):
+        return values if mask is None else values[mask]
+
+    budget_edges = np.asarray(FacetSettings.BUDGET_BUCKETS, dtype=np.float64)
+    time_edges = np.asarray(FacetSettings.COOKING_TIME_BUCKETS, dtype=np.int64)
+    # side='left' puts a value equal to an upper bound in that bound's bucket
+    budget_buckets = np.searchsorted(budget_edges, column(snapshot.budget), 'left')
+    time_buckets = np.searchsorted(time_edges, column(snapshot.cooking_time), 'left')
+
+    cuisine_counts = np.bincount(column(snapshot.cuisine), minlength=len(snapshot.cuisines))
+    return _facets_from_counts(
+        total_count=len(snapshot.ids) if mask is None else int(np.count_nonzero(mask)),
+        cuisines=dict(zip(snapshot.cuisines, cuisine_counts.tolist())),
+        diets=np.bincount(column(snapshot.diet), minlength=len(DIETS)).tolist(),
+        difficulties=np.bincount(column(snapshot.difficulty), minlength=len(DIFFICULTIES)).tolist(),
+        budget_buckets=np.bincount(budget_buckets, minlength=len(budget_edges) + 1).tolist(),
+        time_buckets=np.bincount(time_buckets, minlength=len(time_edges) + 1).tolist(),
+    )
+
+
+def _bucket_case(column: str, edges: Sequence[float]) -> str:
+    whens = " ".join(f"WHEN {column} <= {edge} THEN {i}" for i, edge in enumerate(edges))
+    return f"CASE {whens} ELSE {len(edges)} END"
+
+
+def _query_facets(db, budget, cooking_time, dietary_restrictions) -> Dict[str, Any]:
+    """Histograms from one query grouped by every facet dimension at once"""
+    conditions, params = [], []
+    if budget is not None:
+        conditions.append("budget <= ?")
+        params.append(budget)
+    if cooking_time is not None:
+        conditions.append("cooking_time <= ?")
+        params.append(cooking_time)
+    if dietary_restrictions is not None:
+        # Enum columns are stored by name
+        conditions.append("dietary_restrictions = ?")
+        params.append(dietary_restrictions.name)
+    where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+
+    rows = db.connection().exec_driver_sql(
+        "SELECT cuisine, dietary_restrictions, difficulty, "
+        f"{_bucket_case('budget', FacetSettings.BUDGET_BUCKETS)}, "
+        f"{_bucket_case('cooking_time', FacetSettings.COOKING_TIME_BUCKETS)}, COUNT(*) "
+        f"FROM recipes {where}GROUP BY 1, 2, 3, 4, 5",
+        tuple(params)
+    ).fetchall()
+
+    cuisines: Dict[Optional[str], int] = {}
+    diets = [0] * len(DIETS)
+    difficulties = [0] * len(DIFFICULTIES)
+    budget_buckets = [0] * (len(FacetSettings.BUDGET_BUCKETS) + 1)
+    time_buckets = [0] * (len(FacetSettings.COOKING_TIME_BUCKETS) + 1)
+    for cuisine, diet, difficulty, budget_bucket, time_bucket, count in rows:
+        cuisines[cuisine] = cuisines.get(cuisine, 0) + count
+        # Missing values count as the column defaults, like the snapshot
+        diets[DIET_CODES.get(diet, 0)] += count
+        difficulties[DIFFICULTY_CODES.get(difficulty, 0)] += count
+        budget_buckets[budget_bucket] += count
+        time_buckets[time_bucket] += count
+
+    return _facets_from_counts(
+        sum(diets), cuisines, diets, difficulties, budget_buckets, time_buckets
+    )
+
+
+def _bucket_ranges(edges: Sequence[float], counts: List[int]) -> List[Dict[str, Any]]:
+    bounds = [None, *edges, None]
+    return [
+        {'min': bounds[i], 'max': bounds[i + 1], 'count': count}
+        for i, count in enumerate(counts)
+    ]
+
+
+def _facets_from_counts(
+    total_count: int,
+    cuisines: Dict[Optional[str], int],
+    diets: List[int],
+    difficulties: List[int],
+    budget_buckets: List[int],
+    time_buckets: List[int]
+) -> Dict[str, Any]:
+    """Response shape shared by the snapshot and SQL paths"""
+    # Cuisines are open-ended: list those present, most common first
+    cuisine_facet = sorted(
+        ({'value': name, 'count': count} for name, count in cuisines.items() if name and count),
+        key=lambda facet: (-facet['count'], facet['value'])
+    )
+    return {
+        'total_count': total_count,
+        'cuisine': cuisine_facet,
+        'dietary_restrictions': [
+            {'value': diet.value, 'count': count} for diet, count in zip(DIETS, diets)
+        ],
+        'difficulty': [
+            {'value': level.value, 'count': count} for level, count in zip(DIFFICULTIES, difficulties)
+        ],
+        # Buckets are (min, max]; None means unbounded
+        'budget': _bucket_ranges(FacetSettings.BUDGET_BUCKETS, budget_buckets),
+        'cooking_time': _bucket_ranges(FacetSettings.COOKING_TIME_BUCKETS, time_buckets),
+    }
@@ -0,0 +1,96 @@
+"""
+Ingredient lookups over the normalized recipe_ingredients table
+"""
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from core.models import Ingredient, RecipeIngredient, RECIPE_INGREDIENTS_BACKFILL
+
+logger = logging.getLogger(__name__)
+
+
+def get_recipe_ingredient_names(
+    db: Session,
+    recipe_ids: Optional[Iterable[int]] = None
+) -> Dict[int, List[str]]:
+    """
+    Get ingredient names per recipe in their original order with one query
+
+    Args:
+        db: Database session
+        recipe_ids: Recipes to load, or None for the whole catalog
+
+    Returns:
+        Dict of recipe id -> ingredient names (repeated entries kept)
+    """
+    query = db.query(RecipeIngredient.recipe_id, Ingredient.name).join(
+        Ingredient, Ingredient.id == RecipeIngredient.ingredient_id
+    )
+    if recipe_ids is not None:
+        recipe_ids = list(set(recipe_ids))
+        if not recipe_ids:
+            return {}
+        query = query.filter(RecipeIngredient.recipe_id.in_(recipe_ids))
+
+    ingredients: Dict[int, List[str]] = {}
+    for recipe_id, name in query.order_by(RecipeIngredient.recipe_id, RecipeIngredient.position):
+        ingredients.setdefault(recipe_id, []).append(name)
+    return ingredients
+
+
+def find_recipe_ids_by_ingredients(
+    db: Session,
+    names: Iterable[str],
+    match_all: bool = True
+) -> List[int]:
+    """
+    Find recipes using the given ingredients via the inverted index
+
+    Args:
+        db: Database session
+        names: Ingredient names (exact, surrounding whitespace ignored)
+        match_all: Require every ingredient (True) or any of them (False)
+
+    Returns:
+        Matching recipe ids in ascending order
+    """
+    names = {name.strip() for name in names if name and name.strip()}
+    if not names:
+        return []
+
+    ingredient_ids = [
+        ingredient_id for ingredient_id, in
+        db.query(Ingredient.id).filter(Ingredient.name.in_(names))
+    ]
+    if match_all and len(ingredient_ids) < len(names):
+        return []
+    if not ingredient_ids:
+        return []
+
+    query = db.query(RecipeIngredient.recipe_id).filter(
+        RecipeIngredient.ingredient_id.in_(ingredient_ids)
+    ).group_by(RecipeIngredient.recipe_id)
+    if match_all:
+        query = query.having(
+            func.count(func.distinct(RecipeIngredient.ingredient_id)) == len(ingredient_ids)
+        )
+
+    return [recipe_id for recipe_id, in query.order_by(RecipeIngredient.recipe_id)]
+
+
+def rebuild_recipe_ingredients(db: Session) -> int:
+    """
+    Rebuild recipe_ingredients from the JSON ingredient lists in bulk
+
+    Returns:
+        Number of recipe_ingredients rows written
+    """
+    for statement in RECIPE_INGREDIENTS_BACKFILL:
+        db.execute(text(statement))
+    db.commit()
+
+    total = db.query(func.count()).select_from(RecipeIngredient).scalar()
+    logger.info(f"Rebuilt recipe_ingredients: {total} rows")
+    return total
@@ -0,0 +1,396 @@
+"""
+Write-behind buffer for likes and unlikes
+
+When enabled (LikeWriteBehindSettings), like and unlike requests are
+acknowledged once the change is queued in process. A background thread
+writes the queue in one transaction per batch (write_like_batch) every
+FLUSH_INTERVAL_MS, or sooner once MAX_PENDING_EVENTS changes are waiting,
+instead of one SQLite write transaction per tap.
+
+Queued changes are visible to reads before they are written: read paths add
+the buffered like count deltas and the user's buffered likes on top of what
+the database returns (apply_buffered_counts, apply_buffered_likes), and
+like-based orderings of the catalog snapshot include them. The buffer lock
+only guards the in-memory state: a flush writes its batch outside it, so
+reads and new likes never wait on a flush's disk I/O. Written changes stay
+buffered until the commit and are then dropped in one step under the lock,
+so a read overlapping that instant may count a change twice but never
+misses one.
+
+Changes to the same (user, recipe) pair coalesce: a like followed by an
+unlike before the flush writes nothing. A failed flush puts its changes back
+in the queue. Changes still queued when the process dies are lost; a
+graceful shutdown flushes them (FLUSH_ON_SHUTDOWN).
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Sequence, Set, Tuple
+import hashlib
+import logging
+
+from core.config import LikeWriteBehindSettings
+from services import catalog_snapshot
+from services.catalog_state import bump_like_version
+from services.like_service import write_like_batch
+
+logger = logging.getLogger(__name__)
+
+# Recipe exists, user exists, like exists; one round trip per unseen pair
+_LIKE_STATE = text(
+    "SELECT EXISTS (SELECT 1 FROM recipes WHERE id = :recipe_id), "
+    "EXISTS (SELECT 1 FROM users WHERE id = :user_id), "
+    "EXISTS (SELECT 1 FROM likes WHERE user_id = :user_id AND recipe_id = :recipe_id)"
+)
+
+
+class _Change(NamedTuple):
+    """A queued like state and the state it replaces"""
+    liked: bool
+    base: bool  # state once everything queued before it is written
+    created_at: datetime
+
+
+class LikeWriteBuffer:
+    """
+    Queue of like state changes, flushed in batches
+
+    Each (user, recipe) pair has at most one queued change and at most one
+    change being written by the current flush, so the effective state of a
+    pair is the queued change, else the change being written, else the
+    database row.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_interval_ms: int = LikeWriteBehindSettings.FLUSH_INTERVAL_MS,
+        max_pending: int = LikeWriteBehindSettings.MAX_PENDING_EVENTS
+    ):
+        self._session_factory = session_factory
+        self._flush_interval = flush_interval_ms / 1000
+        self._max_pending = max_pending
+
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._pending: Dict[Tuple[int, int], _Change] = {}
+        self._flushing: Dict[Tuple[int, int], _Change] = {}
+        # Net like count change per recipe over queued and in-flight changes
+        self._count_deltas: Dict[int, int] = {}
+        # Recipe ids with a queued or in-flight change, per user
+        self._user_recipes: Dict[int, Set[int]] = {}
+        # Bumped when a flush commits, so a database lookup made across a
+        # commit is known to be stale
+        self._flushes = 0
+
+        self._wake = Event()
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def enqueue(self, db: Session, user_id: int, recipe_id: int, liked: bool) -> bool:
+        """
+        Queue a like (liked=True) or an unlike
+
+        Pairs without a queued or in-flight change are checked against the
+        database with one query first, outside the buffer lock.
+
+        Returns:
+            True if the user's effective like state changed, False if the
+            recipe was already liked (or already not liked)
+
+        Raises:
+            ValueError: If the recipe does not exist, or the user does not
+                exist when liking
+        """
+        key = (user_id, recipe_id)
+        stored = None
+        flushes = None
+        while True:
+            with self._lock:
+                base = self._base_state(key)
+                if base is None and flushes == self._flushes:
+                    base = stored
+                if base is not None:
+                    changed = self._queue(key, liked, base)
+                    pending = len(self._pending)
+                    break
+                flushes = self._flushes
+            # A flush committing during the lookup may have written the
+            # pair, so the lookup is only trusted if none did
+            stored = self._stored_state(db, key, liked)
+
+        if not changed:
+            return False
+        bump_like_version()
+        if pending >= self._max_pending:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """
+        Write every queued change in one transaction
+
+        The write runs outside the buffer lock; the written changes are
+        dropped from the buffer once it has committed. On failure they go
+        back in the queue (behind any change made to the same pair
+        meanwhile) and the error is logged.
+
+        Returns:
+            Number of changes written
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                self._flushing, self._pending = self._pending, {}
+                batch = list(self._flushing.items())
+
+            db = self._session_factory()
+            try:
+                write_like_batch(
+                    db,
+                    likes=[(user_id, recipe_id, change.created_at)
+                           for (user_id, recipe_id), change in batch if change.liked],
+                    unlikes=[key for key, change in batch if not change.liked]
+                )
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to flush {len(batch)} buffered likes: {e}")
+                with self._lock:
+                    self._requeue(batch)
+                return 0
+            finally:
+                db.close()
+
+            with self._lock:
+                self._flushing = {}
+                self._flushes += 1
+                for key, change in batch:
+                    delta = 1 if change.liked else -1
+                    self._add_count_delta(key[1], -delta)
+                    self._release(key)
+                    catalog_snapshot.apply_like_delta(key[1], delta, buffered=True)
+
+            bump_like_version()
+            logger.debug(f"Flushed {len(batch)} buffered likes")
+            return len(batch)
+
+    def _stored_state(self, db: Session, key: Tuple[int, int], liked: bool) -> bool:
+        """Whether the like row exists, checking the recipe (and user) exist"""
+        user_id, recipe_id = key
+        recipe_exists, user_exists, like_exists = db.execute(
+            _LIKE_STATE, {'user_id': user_id, 'recipe_id': recipe_id}
+        ).one()
+        if not recipe_exists:
+            raise ValueError("Recipe not found")
+        if liked and not user_exists:
+            raise ValueError("User not found")
+        return bool(like_exists)
+
+    def _queue(self, key: Tuple[int, int], liked: bool, base: bool) -> bool:
+        """Record a change over base under the lock; False if it changes nothing"""
+        current = self._pending.get(key)
+        effective = current.liked if current is not None else base
+        if liked == effective:
+            return False
+
+        user_id, recipe_id = key
+        if liked == base:
+            # Undoes the queued change
+            del self._pending[key]
+            self._release(key)
+        else:
+            self._pending[key] = _Change(liked, base, datetime.utcnow())
+            self._user_recipes.setdefault(user_id, set()).add(recipe_id)
+        self._add_count_delta(recipe_id, 1 if liked else -1)
+        catalog_snapshot.add_pending_like_delta(recipe_id, 1 if liked else -1)
+        return True
+
+    def _base_state(self, key: Tuple[int, int]) -> Optional[bool]:
+        """State a new change would replace, or None if only the database knows"""
+        current = self._pending.get(key)
+        if current is not None:
+            return current.base
+        in_flight = self._flushing.get(key)
+        return in_flight.liked if in_flight is not None else None
+
+    def _requeue(self, batch):
+        self._flushing = {}
+        for key, change in batch:
+            if key in self._pending:
+                # A later change to the same pair can only undo the failed one
+                del self._pending[key]
+                self._release(key)
+            else:
+                self._pending[key] = change
+
+    def _add_count_delta(self, recipe_id: int, delta: int) -> None:
+        count_delta = self._count_deltas.get(recipe_id, 0) + delta
+        if count_delta:
+            self._count_deltas[recipe_id] = count_delta
+        else:
+            del self._count_deltas[recipe_id]
+
+    def _release(self, key: Tuple[int, int]) -> None:
+        """Forget a pair in the per-user index once nothing is queued for it"""
+        if key in self._pending or key in self._flushing:
+            return
+        user_id, recipe_id = key
+        recipe_ids = self._user_recipes.get(user_id)
+        if recipe_ids is not None:
+            recipe_ids.discard(recipe_id)
+            if not recipe_ids:
+                del self._user_recipes[user_id]
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def pending_count(self) -> int:
+        """Changes queued or being written"""
+        with self._lock:
+            return len(self._pending) + len(self._flushing)
+
+    def count_delta(self, recipe_id: int) -> int:
+        """Like count change of a recipe not yet written"""
+        with self._lock:
+            return self._count_deltas.get(recipe_id, 0)
+
+    def count_deltas(self, recipe_ids: Iterable[int]) -> Dict[int, int]:
+        """Like count changes not yet written, for the recipes that have one"""
+        with self._lock:
+            deltas = self._count_deltas
+            if not deltas:
+                return {}
+            return {recipe_id: deltas[recipe_id] for recipe_id in recipe_ids if recipe_id in deltas}
+
+    def user_overrides(self, user_id: int) -> Dict[int, bool]:
+        """Buffered like state of a user's recipes, by recipe id"""
+        with self._lock:
+            overrides = {}
+            for recipe_id in self._user_recipes.get(user_id, ()):
+                key = (user_id, recipe_id)
+                change = self._pending.get(key) or self._flushing.get(key)
+                overrides[recipe_id] = change.liked
+            return overrides
+
+    def state_digest(self) -> Optional[str]:
+        """Short digest of every queued and in-flight like state, or None if there is none"""
+        with self._lock:
+            if not self._pending and not self._flushing:
+                return None
+            states = sorted(
+                (key, (self._pending.get(key) or self._flushing[key]).liked)
+                for key in self._pending.keys() | self._flushing.keys()
+            )
+        return hashlib.blake2b(repr(states).encode(), digest_size=8).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Background flushing
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Flush from a daemon thread until stop()"""
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name="like-write-buffer", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True) -> None:
+        """Stop the flush thread, then write what is still queued if asked to"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush()
+            if self.pending_count():
+                logger.error(f"{self.pending_count()} buffered likes were not written")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Like flush loop error: {e}")
+
+
+_buffer: Optional[LikeWriteBuffer] = None
+
+
+def get_like_write_buffer() -> Optional[LikeWriteBuffer]:
+    """The active buffer, or None when likes are written directly"""
+    return _buffer
+
+
+def start_like_write_buffer(
+    session_factory: Callable[[], Session],
+    start_thread: bool = True
+) -> LikeWriteBuffer:
+    """
+    Route likes through a write-behind buffer
+
+    Args:
+        session_factory: Creates the sessions flushes write with
+        start_thread: Flush in the background (off: only explicit flush())
+    """
+    global _buffer
+    if _buffer is not None:
+        stop_like_write_buffer()
+    _buffer = LikeWriteBuffer(session_factory)
+    if start_thread:
+        _buffer.start()
+    logger.info("Like write-behind buffer started")
+    return _buffer
+
+
+def stop_like_write_buffer(flush: bool = True) -> None:
+    """Go back to direct writes, flushing what is queued first if asked to"""
+    global _buffer
+    buffer, _buffer = _buffer, None
+    if buffer is not None:
+        buffer.stop(flush=flush)
+        # Whatever was not written is gone, so orderings must not count it
+        catalog_snapshot.clear_pending_like_deltas()
+        logger.info("Like write-behind buffer stopped")
+
+
+def apply_buffered_counts(records: Sequence) -> None:
+    """Add buffered like count changes to loaded records (in place)"""
+    buffer = _buffer
+    if buffer is None or not records:
+        return
+    deltas = buffer.count_deltas(record.id for record in records)
+    if deltas:
+        for record in records:
+            delta = deltas.get(record.id)
+            if delta and record.like_count is not None:
+                record.like_count += delta
+
+
+def apply_buffered_likes(user_id: Optional[int], liked_ids: Set[int], recipe_ids: Iterable[int]) -> Set[int]:
+    """
+    Apply a user's buffered likes and unlikes to the liked subset of recipe_ids
+
+    Returns:
+        liked_ids, updated in place
+    """
+    buffer = _buffer
+    if buffer is None or not user_id:
+        return liked_ids
+    overrides = buffer.user_overrides(user_id)
+    if overrides:
+        for recipe_id in recipe_ids:
+            liked = overrides.get(recipe_id)
+            if liked:
+                liked_ids.add(recipe_id)
+            elif liked is not None:
+                liked_ids.discard(recipe_id)
+    return liked_ids
@@ -0,0 +1,229 @@
+"""
+Like write paths that keep the denormalized Recipe.like_count in sync
+"""
+from sqlalchemy import bindparam, delete, func, select, text, tuple_, update
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Sequence, Tuple
+import json
+import logging
+
+from core.models import Recipe, Like
+from services import catalog_snapshot, trending
+from services.catalog_state import bump_like_version
+from services.user_liked_cache import record_like_changes
+
+logger = logging.getLogger(__name__)
+
+# Inserts only when both sides exist (SQLite does not enforce the foreign keys
+# here) and does nothing on a repeated like. Written as text because the
+# dialect's insert() with on_conflict_do_nothing() is not cacheable, and
+# recompiling it cost more than executing it.
+_INSERT_LIKE_SQL = (
+    "INSERT INTO likes (user_id, recipe_id, created_at) "
+    "SELECT :user_id, :recipe_id, :created_at "
+    "WHERE EXISTS (SELECT 1 FROM users WHERE id = :user_id) "
+    "AND EXISTS (SELECT 1 FROM recipes WHERE id = :recipe_id) "
+    "ON CONFLICT (user_id, recipe_id) DO NOTHING"
+)
+_INSERT_LIKE = text(_INSERT_LIKE_SQL + " RETURNING id").bindparams(
+    bindparam('created_at', type_=Like.created_at.type)
+)
+# Many likes in one statement for write_like_batch: the rows arrive as one
+# JSON array of [user_id, recipe_id, created_at], and RETURNING reports the
+# pairs actually inserted (executemany would drop the returned rows)
+_INSERT_LIKE_BATCH = text(
+    "INSERT INTO likes (user_id, recipe_id, created_at) "
+    "SELECT json_extract(item.value, '$[0]'), json_extract(item.value, '$[1]'), "
+    "json_extract(item.value, '$[2]') FROM json_each(:rows) AS item "
+    "WHERE EXISTS (SELECT 1 FROM users WHERE id = json_extract(item.value, '$[0]')) "
+    "AND EXISTS (SELECT 1 FROM recipes WHERE id = json_extract(item.value, '$[1]')) "
+    "ON CONFLICT (user_id, recipe_id) DO NOTHING "
+    "RETURNING user_id, recipe_id"
+)
+
+# Relative counter change. updated_at is set to itself: a like is not an edit
+# of the recipe, and this keeps the column's onupdate default from firing.
+_recipes = Recipe.__table__
+_ADJUST_LIKE_COUNT = (
+    update(_recipes)
+    .where(_recipes.c.id == bindparam('recipe_id'))
+    .values(like_count=_recipes.c.like_count + bindparam('delta'), updated_at=_recipes.c.updated_at)
+)
+
+_likes = Like.__table__
+_DELETE_LIKE_ROWS = delete(_likes).where(
+    _likes.c.user_id == bindparam('user_id'), _likes.c.recipe_id == bindparam('recipe_id')
+)
+_DELETE_LIKE = _DELETE_LIKE_ROWS.returning(_likes.c.created_at)
+
+# Exact counters for a set of recipes, from the likes table
+_RECOUNT_LIKES = (
+    update(_recipes)
+    .where(_recipes.c.id.in_(bindparam('recipe_ids', expanding=True)))
+    .values(
+        like_count=select(func.count()).where(_likes.c.recipe_id == _recipes.c.id).scalar_subquery(),
+        updated_at=_recipes.c.updated_at
+    )
+)
+
+
+def add_like(db: Session, user_id: int, recipe_id: int) -> Tuple[Like, bool]:
+    """
+    Record a like and increment the recipe's counter in the same transaction
+
+    The like is written with a single INSERT ... ON CONFLICT DO NOTHING
+    RETURNING that only inserts when the user and the recipe exist (SQLite
+    does not enforce the foreign keys here), so a new like costs one
+    statement plus the counter update. Lookups only run when nothing was
+    inserted, to tell a repeated tap from a missing user or recipe.
+
+    Returns:
+        Tuple of (like, created). created is False if the like already existed.
+
+    Raises:
+        ValueError: If the user or the recipe does not exist
+    """
+    created_at = datetime.utcnow()
+    like_id = db.execute(
+        _INSERT_LIKE, {'user_id': user_id, 'recipe_id': recipe_id, 'created_at': created_at}
+    ).scalar()
+
+    if like_id is None:
+        db.rollback()
+        existing_like = db.query(Like).filter(
+            Like.user_id == user_id,
+            Like.recipe_id == recipe_id
+        ).first()
+        if existing_like:
+            return existing_like, False
+        _raise_missing(db, user_id, recipe_id)
+
+    _adjust_like_count(db, recipe_id, 1)
+    db.commit()
+    catalog_snapshot.apply_like_delta(recipe_id, 1)
+    trending.record_like_event(recipe_id, created_at, 1)
+    record_like_changes([(user_id, recipe_id, True)])
+    bump_like_version()
+    # Not attached to the session; the row is already known
+    return Like(id=like_id, user_id=user_id, recipe_id=recipe_id, created_at=created_at), True
+
+
+def remove_like(db: Session, user_id: int, recipe_id: int) -> bool:
+    """
+    Delete a like and decrement the recipe's counter in the same transaction
+
+    The like is removed with a single DELETE ... RETURNING.
+
+    Returns:
+        True if a like was removed, False if none existed
+    """
+    # created_at of the removed like, to withdraw it from the trending scores
+    deleted = db.execute(_DELETE_LIKE, {'user_id': user_id, 'recipe_id': recipe_id}).scalars().all()
+
+    if not deleted:
+        db.rollback()
+        return False
+
+    _adjust_like_count(db, recipe_id, -len(deleted))
+    db.commit()
+    catalog_snapshot.apply_like_delta(recipe_id, -len(deleted))
+    for created_at in deleted:
+        trending.record_like_event(recipe_id, created_at, -1)
+    record_like_changes([(user_id, recipe_id, False)])
+    bump_like_version()
+    return True
+
+
+def write_like_batch(
+    db: Session,
+    likes: Sequence[Tuple[int, int, datetime]],
+    unlikes: Sequence[Tuple[int, int]]
+) -> None:
+    """
+    Write many likes and unlikes in one transaction
+
+    Used by the write-behind buffer (services.like_buffer). Inserts run as
+    one statement and deletes as one executemany; the counters of every
+    touched recipe are then recounted from the likes table, so they come out
+    exact even if some likes already existed or were already gone. Cached
+    liked sets and trending scores are updated with the likes actually
+    inserted and removed; the snapshot and like version are left to the
+    caller.
+
+    Args:
+        likes: (user_id, recipe_id, created_at) to insert
+        unlikes: (user_id, recipe_id) to delete
+    """
+    inserted = []
+    if likes:
+        # created_at in the column's storage format, as a bound DateTime would be
+        dialect = db.get_bind().dialect
+        store_created_at = Like.created_at.type.dialect_impl(dialect).bind_processor(dialect)
+        created = {(user_id, recipe_id): created_at for user_id, recipe_id, created_at in likes}
+        rows = json.dumps([
+            [user_id, recipe_id, store_created_at(created_at)] for user_id, recipe_id, created_at in likes
+        ])
+        inserted = [
+            (user_id, recipe_id, created[user_id, recipe_id])
+            for user_id, recipe_id in db.execute(_INSERT_LIKE_BATCH, {'rows': rows})
+        ]
+    removed = []
+    if unlikes:
+        # When the removed likes were made, for the trending scores
+        removed = db.execute(
+            select(_likes.c.user_id, _likes.c.recipe_id, _likes.c.created_at)
+            .where(tuple_(_likes.c.user_id, _likes.c.recipe_id).in_(list(unlikes)))
+        ).all()
+        db.execute(_DELETE_LIKE_ROWS, [
+            {'user_id': user_id, 'recipe_id': recipe_id} for user_id, recipe_id in unlikes
+        ])
+    recipe_ids = {recipe_id for _, recipe_id, _ in likes} | {recipe_id for _, recipe_id in unlikes}
+    if recipe_ids:
+        db.execute(_RECOUNT_LIKES, {'recipe_ids': sorted(recipe_ids)})
+    db.commit()
+    for _, recipe_id, created_at in inserted:
+        trending.record_like_event(recipe_id, created_at, 1)
+    for _, recipe_id, created_at in removed:
+        trending.record_like_event(recipe_id, created_at, -1)
+    record_like_changes([
+        *((user_id, recipe_id, True) for user_id, recipe_id, _ in inserted),
+        *((user_id, recipe_id, False) for user_id, recipe_id, _ in removed),
+    ])
+
+
+def _raise_missing(db: Session, user_id: int, recipe_id: int) -> None:
+    """Report which side of a like does not exist"""
+    if db.query(Recipe.id).filter(Recipe.id == recipe_id).first() is None:
+        raise ValueError("Recipe not found")
+    raise ValueError("User not found")
+
+
+def reconcile_like_counts(db: Session) -> int:
+    """
+    Rebuild Recipe.like_count from the likes table in one bulk UPDATE
+
+    Returns:
+        Number of recipes whose counter was corrected
+    """
+    actual_count = select(func.count(Like.id)).where(
+        Like.recipe_id == Recipe.id
+    ).scalar_subquery()
+
+    result = db.execute(
+        update(Recipe)
+        .where(Recipe.like_count != actual_count)
+        .values(like_count=actual_count, updated_at=Recipe.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    catalog_snapshot.reset_catalog_snapshot()
+    bump_like_version()
+
+    logger.info(f"Reconciled like counts for {result.rowcount} recipes")
+    return result.rowcount
+
+
+def _adjust_like_count(db: Session, recipe_id: int, delta: int) -> None:
+    """Apply a relative change to a recipe's like counter"""
+    db.execute(_ADJUST_LIKE_COUNT, {'recipe_id': recipe_id, 'delta': delta})
@@ -0,0 +1,330 @@
+"""
+Ingredient bitsets for "cook with what I have" pantry matching
+
+Every recipe gets a bitset over the ingredient vocabulary, stored column-wise
+as uint64 words aligned with the catalog snapshot's id order: bits[w][i] holds
+ingredients 64*w .. 64*w+63 of recipe i. Read down a column, a bit is the
+ingredient -> recipes inverted index; read across, it is the recipe's
+ingredient set. Coverage of a pantry is then one AND plus popcount per word
+the pantry touches, over the whole catalog at once.
+
+The bitsets hang off the CatalogSnapshot they were built for, so they share
+its version tracking, are patched together with it and are rebuilt by its
+background rebuilds. With the snapshot disabled
+(CatalogSnapshotSettings.ENABLED), matching runs as an SQL join on
+recipe_ingredients instead, with the same normalize_ingredient matching.
+"""
+from sqlalchemy import case, distinct, func, select
+from sqlalchemy.orm import Session, aliased
+from itertools import chain
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+import time
+
+import numpy as np
+
+from core.config import CatalogSnapshotSettings
+from core.models import DietaryRestriction, Recipe, RecipeIngredient
+from services.catalog_snapshot import CatalogSnapshot, get_catalog_snapshot
+
+logger = logging.getLogger(__name__)
+
+_PAIRS_SQL = "SELECT recipe_id, ingredient_id FROM recipe_ingredients"
+
+_build_lock = Lock()
+
+
+def normalize_ingredient(name: str) -> str:
+    """Key used to match pantry items against recipe ingredients"""
+    return " ".join(name.lower().split())
+
+
+class IngredientBitsets:
+    """Per-recipe ingredient bitsets plus distinct ingredient counts"""
+
+    def __init__(self, vocabulary: Dict[str, int], bits: np.ndarray, counts: np.ndarray):
+        self.vocabulary = vocabulary
+        self.bits = bits  # shape (words, recipes), uint64
+        self.counts = counts  # distinct ingredients per recipe
+
+    @classmethod
+    def build(
+        cls,
+        db: Session,
+        ids: np.ndarray,
+        vocabulary: Optional[Dict[str, int]] = None,
+        recipe_ids: Optional[Sequence[int]] = None
+    ) -> "IngredientBitsets":
+        """
+        Load bitsets from recipe_ingredients for the recipes in ids
+
+        Args:
+            db: Database session
+            ids: Sorted recipe ids the bitset columns are aligned with
+            vocabulary: Existing name -> bit assignments to extend
+            recipe_ids: Only load these recipes (ids must cover them)
+        """
+        conn = db.connection()
+        vocabulary = dict(vocabulary or {})
+
+        names = conn.exec_driver_sql("SELECT id, name FROM ingredients").fetchall()
+        code_by_ingredient = np.full(max((i for i, _ in names), default=0) + 1, -1, dtype=np.int64)
+        for ingredient_id, name in names:
+            code_by_ingredient[ingredient_id] = vocabulary.setdefault(
+                normalize_ingredient(name), len(vocabulary)
+            )
+
+        # Stream plain DBAPI tuples straight into one flat array; building
+        # Row objects for millions of pairs dominates otherwise
+        if recipe_ids is not None and not recipe_ids:
+            pairs = np.empty((0, 2), dtype=np.int64)
+        else:
+            cursor = conn.connection.cursor()
+            try:
+                if recipe_ids is None:
+                    cursor.execute(_PAIRS_SQL)
+                else:
+                    placeholders = ",".join("?" * len(recipe_ids))
+                    cursor.execute(
+                        f"{_PAIRS_SQL} WHERE recipe_id IN ({placeholders})", tuple(recipe_ids)
+                    )
+                pairs = np.fromiter(chain.from_iterable(cursor), dtype=np.int64).reshape(-1, 2)
+            finally:
+                cursor.close()
+
+        # Map recipe ids to columns; rows for recipes outside ids are dropped
+        positions = np.searchsorted(ids, pairs[:, 0])
+        known = positions < len(ids)
+        known[known] = ids[positions[known]] == pairs[known, 0]
+        positions = positions[known]
+        codes = code_by_ingredient[pairs[known, 1]]
+
+        # Distinct (recipe, ingredient) pairs: repeats and case variants collapse
+        n_codes = max(len(vocabulary), 1)
+        keys = np.unique(positions * n_codes + codes)
+        positions, codes = keys // n_codes, keys % n_codes
+
+        bits = np.zeros((_words_for(len(vocabulary)), len(ids)), dtype=np.uint64)
+        np.bitwise_or.at(
+            bits, (codes >> 6, positions),
+            np.left_shift(np.uint64(1), (codes & 63).astype(np.uint64))
+        )
+        counts = np.bincount(positions, minlength=len(ids)).astype(np.int32)
+        return cls(vocabulary, bits, counts)
+
+    def rebuilt(self, db: Session, ids: np.ndarray) -> "IngredientBitsets":
+        """Fresh bitsets for a rebuilt snapshot's ids, keeping this vocabulary's codes"""
+        return IngredientBitsets.build(db, ids, self.vocabulary)
+
+    def patched(
+        self,
+        db: Session,
+        keep: np.ndarray,
+        fresh_ids: np.ndarray,
+        order: np.ndarray
+    ) -> "IngredientBitsets":
+        """
+        Bitsets for a patched snapshot (see CatalogSnapshot.patched)
+
+        Args:
+            keep: Mask of this index's columns that are unchanged
+            fresh_ids: Sorted ids of the reloaded recipes
+            order: Permutation sorting concat(kept ids, fresh_ids) by id
+        """
+        fresh = IngredientBitsets.build(db, fresh_ids, self.vocabulary, fresh_ids.tolist())
+        words = fresh.bits.shape[0]
+        kept = self.bits[:, keep]
+        if kept.shape[0] < words:
+            kept = np.vstack([kept, np.zeros((words - kept.shape[0], kept.shape[1]), dtype=np.uint64)])
+        return IngredientBitsets(
+            fresh.vocabulary,
+            np.concatenate([kept, fresh.bits], axis=1)[:, order],
+            np.concatenate([self.counts[keep], fresh.counts])[order],
+        )
+
+    def pantry_words(self, pantry: Iterable[str]) -> Tuple[Dict[int, int], List[str]]:
+        """
+        Encode a pantry as {word index: bit mask}
+
+        Returns:
+            Tuple of (word masks, pantry items not used by any recipe)
+        """
+        words: Dict[int, int] = {}
+        unknown = []
+        for item in pantry:
+            code = self.vocabulary.get(normalize_ingredient(item))
+            if code is None:
+                unknown.append(item)
+                continue
+            words[code >> 6] = words.get(code >> 6, 0) | (1 << (code & 63))
+        return words, unknown
+
+    def coverage(self, words: Dict[int, int]) -> np.ndarray:
+        """Number of pantry ingredients each recipe uses"""
+        covered = np.zeros(self.bits.shape[1], dtype=np.int32)
+        for word, mask in words.items():
+            covered += np.bitwise_count(self.bits[word] & np.uint64(mask))
+        return covered
+
+
+def _words_for(n_codes: int) -> int:
+    return max(1, -(-n_codes // 64))
+
+
+def get_ingredient_bitsets(db: Session) -> Tuple[CatalogSnapshot, IngredientBitsets]:
+    """
+    Current catalog snapshot with its ingredient bitsets, built on first use
+    """
+    snapshot = get_catalog_snapshot(db)
+    if snapshot.ingredient_bitsets is None:
+        with _build_lock:
+            if snapshot.ingredient_bitsets is None:
+                started = time.perf_counter()
+                snapshot.ingredient_bitsets = IngredientBitsets.build(db, snapshot.ids)
+                bitsets = snapshot.ingredient_bitsets
+                logger.info(
+                    f"Built ingredient bitsets: {len(bitsets.vocabulary)} ingredients x "
+                    f"{len(snapshot.ids)} recipes ({bitsets.bits.nbytes / 1e6:.0f} MB) in "
+                    f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+    return snapshot, snapshot.ingredient_bitsets
+
+
+def match_pantry(
+    db: Session,
+    pantry: Sequence[str],
+    limit: int = 50,
+    offset: int = 0,
+    budget: Optional[float] = None,
+    cooking_time: Optional[int] = None,
+    dietary_restrictions=None,
+    min_coverage: int = 1
+) -> Tuple[List[Tuple[int, int, int]], int, List[str]]:
+    """
+    Rank recipes by how many pantry ingredients they use
+
+    Order: most pantry ingredients covered, then fewest missing ingredients,
+    then id.
+
+    Args:
+        db: Database session
+        pantry: Ingredient names the user has
+        limit: Maximum number of recipes to return
+        offset: Number of matches to skip
+        budget: Optional maximum budget
+        cooking_time: Optional maximum cooking time
+        dietary_restrictions: Optional DietaryRestriction; NONE means no filter
+        min_coverage: Minimum number of pantry ingredients a recipe must use
+
+    Returns:
+        Tuple of ([(recipe_id, covered, missing), ...], total matches,
+        pantry items unknown to the catalog)
+    """
+    if not CatalogSnapshotSettings.ENABLED:
+        return _match_pantry_sql(
+            db, pantry, limit, offset, budget, cooking_time, dietary_restrictions, min_coverage
+        )
+
+    snapshot, bitsets = get_ingredient_bitsets(db)
+    words, unknown = bitsets.pantry_words(pantry)
+
+    covered = bitsets.coverage(words)
+    mask = covered >= max(min_coverage, 1)
+    filters = snapshot.filter_mask(budget, cooking_time, dietary_restrictions)
+    if filters is not None:
+        mask &= filters
+
+    candidates = np.flatnonzero(mask)
+    total = len(candidates)
+    if not total or offset >= total:
+        return [], total, unknown
+
+    # One sortable key per candidate: coverage desc, missing asc, id asc
+    cand_covered = covered[candidates].astype(np.uint64)
+    cand_missing = (bitsets.counts[candidates] - covered[candidates]).astype(np.uint64)
+    keys = (
+        ((np.uint64(0xFFFF) - cand_covered) << np.uint64(48))
+        | (np.minimum(cand_missing, np.uint64(0xFFFF)) << np.uint64(32))
+        | snapshot.ids[candidates].astype(np.uint64)
+    )
+    window = min(offset + limit, total)
+    if window < total:
+        top = np.argpartition(keys, window - 1)[:window]
+        top = top[np.argsort(keys[top])]
+    else:
+        top = np.argsort(keys)
+    top = top[offset:window]
+
+    page = [
+        (int(snapshot.ids[candidates[i]]), int(cand_covered[i]), int(cand_missing[i]))
+        for i in top
+    ]
+    return page, total, unknown
+
+
+def _match_pantry_sql(
+    db: Session,
+    pantry: Sequence[str],
+    limit: int,
+    offset: int,
+    budget: Optional[float],
+    cooking_time: Optional[int],
+    dietary_restrictions,
+    min_coverage: int
+) -> Tuple[List[Tuple[int, int, int]], int, List[str]]:
+    """match_pantry as a join on recipe_ingredients, without the snapshot"""
+    # Pantry items are matched like the bitset vocabulary: every ingredient
+    # name with the same normalized form is the same pantry item
+    wanted = {normalize_ingredient(item) for item in pantry}
+    item_codes: Dict[str, int] = {}
+    codes: Dict[int, int] = {}  # ingredient id -> pantry item code
+    first_ids: Dict[str, int] = {}
+    aliases: Dict[int, int] = {}  # ingredient id -> first id with the same normalized name
+    for ingredient_id, name in db.connection().exec_driver_sql("SELECT id, name FROM ingredients ORDER BY id"):
+        key = normalize_ingredient(name)
+        first_id = first_ids.setdefault(key, ingredient_id)
+        if first_id != ingredient_id:
+            aliases[ingredient_id] = first_id
+        if key in wanted:
+            codes[ingredient_id] = item_codes.setdefault(key, len(item_codes))
+    unknown = [item for item in pantry if normalize_ingredient(item) not in item_codes]
+    if not codes:
+        return [], 0, unknown
+
+    covered = func.count(distinct(case(codes, value=RecipeIngredient.ingredient_id)))
+    matched = (
+        select(RecipeIngredient.recipe_id.label('recipe_id'), covered.label('covered'))
+        .where(RecipeIngredient.ingredient_id.in_(list(codes)))
+        .group_by(RecipeIngredient.recipe_id)
+        .having(covered >= max(min_coverage, 1))
+        .subquery()
+    )
+    # Distinct normalized ingredients per recipe: names that normalize alike
+    # count as their first ingredient id
+    others = aliased(RecipeIngredient)
+    ingredient = others.ingredient_id
+    if aliases:
+        ingredient = case(aliases, value=others.ingredient_id, else_=others.ingredient_id)
+    distinct_names = (
+        select(func.count(distinct(ingredient)))
+        .where(others.recipe_id == matched.c.recipe_id)
+        .scalar_subquery()
+    )
+    missing = (distinct_names - matched.c.covered).label('missing')
+
+    query = select(matched.c.recipe_id, matched.c.covered, missing).join(
+        Recipe, Recipe.id == matched.c.recipe_id
+    )
+    if budget is not None:
+        query = query.where(Recipe.budget <= budget)
+    if cooking_time is not None:
+        query = query.where(Recipe.cooking_time <= cooking_time)
+    if dietary_restrictions is not None and dietary_restrictions != DietaryRestriction.NONE:
+        query = query.where(Recipe.dietary_restrictions == dietary_restrictions)
+
+    total = db.execute(select(func.count()).select_from(query.subquery())).scalar()
+    rows = db.execute(
+        query.order_by(matched.c.covered.desc(), missing, matched.c.recipe_id).limit(limit).offset(offset)
+    ).all()
+    return [tuple(row) for row in rows], total, unknown
@@ -0,0 +1,49 @@
+"""
+Cache of parsed recipe JSON columns
+
+Recipe.ingredients and Recipe.instructions are JSON text. Every serializer
+used to json.loads them on each request; the parsed lists are instead
+cached per (recipe_id, updated_at), so a recipe is decoded once per edit.
+Entries also remember the raw text they were parsed from and are only used
+while it still matches, which keeps writes that bypass the ORM (and so do
+not touch updated_at) from serving stale lists.
+"""
+from typing import List, Tuple
+
+from core.config import CacheSettings
+from core.json_columns import parse_json_list
+from services.lru_cache import LRUCache
+
+# (recipe_id, updated_at) -> (raw ingredients, raw instructions, parsed ingredients, parsed instructions)
+_parsed_recipe_cache = LRUCache(CacheSettings.PARSED_RECIPE_CACHE_SIZE, 'parsed_recipes')
+
+
+def get_parsed_fields(recipe) -> Tuple[List, List]:
+    """
+    Parsed ingredients and instructions of a recipe
+
+    Args:
+        recipe: Recipe model instance (or any object with id, updated_at,
+            ingredients and instructions)
+
+    Returns:
+        Tuple of (ingredients, instructions) as new lists the caller may modify
+    """
+    key = (recipe.id, recipe.updated_at)
+    entry = _parsed_recipe_cache.get(key)
+    if entry is None or entry[0] != recipe.ingredients or entry[1] != recipe.instructions:
+        entry = (
+            recipe.ingredients,
+            recipe.instructions,
+            parse_json_list(recipe.ingredients, recipe.id, "ingredients"),
+            parse_json_list(recipe.instructions, recipe.id, "instructions"),
+        )
+        # Rows without updated_at have no version to key on
+        if recipe.updated_at is not None:
+            _parsed_recipe_cache.put(key, entry)
+    return list(entry[2]), list(entry[3])
+
+
+def get_parsed_ingredients(recipe) -> List:
+    """Parsed ingredient list of a recipe (see get_parsed_fields)"""
+    return get_parsed_fields(recipe)[0]
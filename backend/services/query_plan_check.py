@@ -0,0 +1,98 @@
+"""
+EXPLAIN QUERY PLAN checks for the hot recipe and like queries
+"""
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, List
+import logging
+
+from core.models import Recipe, Like, DietaryRestriction, Ingredient, RecipeIngredient
+from services.recipe_query_service import (
+    RECOMMENDATION_ORDER,
+    build_filtered_recipes_query,
+    build_recipe_page_query
+)
+from services.user_liked_cache import build_user_liked_set_query
+
+logger = logging.getLogger(__name__)
+
+# Representative parameters; only the shape of the query matters to the planner
+_SAMPLE_USER_ID = 1
+_SAMPLE_RECIPE_ID = 1
+_SAMPLE_RECIPE_IDS = [1, 2, 3]
+
+HOT_QUERIES: Dict[str, Callable[[Session], object]] = {
+    'catalog page by id': lambda db: build_recipe_page_query(db, 'id', 'asc', (0, 100)),
+    'catalog page by budget': lambda db: build_recipe_page_query(db, 'budget', 'asc', (5.0, 100)),
+    'catalog page by cooking time': lambda db: build_recipe_page_query(db, 'cooking_time', 'asc', (20, 100)),
+    'catalog page by likes': lambda db: build_recipe_page_query(db, 'likes', 'desc', (3, 100)),
+    'recommendation filter': lambda db: build_filtered_recipes_query(
+        db, 20.0, 30, DietaryRestriction.NONE
+    ),
+    'recommendation filter by diet': lambda db: build_filtered_recipes_query(
+        db, 20.0, 30, DietaryRestriction.VEGAN
+    ),
+    'recommendation ranking': lambda db: build_filtered_recipes_query(
+        db, 20.0, 30, DietaryRestriction.NONE
+    ).order_by(*RECOMMENDATION_ORDER).limit(50),
+    'user liked set': lambda db: build_user_liked_set_query(db, _SAMPLE_USER_ID),
+    'like lookup': lambda db: db.query(Like).filter(
+        Like.user_id == _SAMPLE_USER_ID, Like.recipe_id == _SAMPLE_RECIPE_ID
+    ),
+    'like count by recipe': lambda db: db.query(func.count(Like.id)).filter(
+        Like.recipe_id == _SAMPLE_RECIPE_ID
+    ),
+    'liked recipes for user': lambda db: db.query(Recipe).join(Like).filter(
+        Like.user_id == _SAMPLE_USER_ID
+    ),
+    'ingredient by name': lambda db: db.query(Ingredient.id).filter(Ingredient.name == 'tofu'),
+    'ingredients of recipes': lambda db: db.query(RecipeIngredient).filter(
+        RecipeIngredient.recipe_id.in_(_SAMPLE_RECIPE_IDS)
+    ),
+    'recipes by ingredient': lambda db: db.query(RecipeIngredient.recipe_id).filter(
+        RecipeIngredient.ingredient_id.in_(_SAMPLE_RECIPE_IDS)
+    ),
+}
+
+
+def explain_query_plan(db: Session, query) -> List[str]:
+    """
+    Return the EXPLAIN QUERY PLAN detail lines for a query
+    """
+    compiled = query.statement.compile(
+        dialect=db.get_bind().dialect,
+        compile_kwargs={'literal_binds': True}
+    )
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").fetchall()
+    return [row[-1] for row in rows]
+
+
+def is_full_scan(detail: str) -> bool:
+    """A plan step is a full scan when SQLite scans a table without any index"""
+    return detail.startswith('SCAN ') and 'USING' not in detail and 'CONSTANT ROW' not in detail
+
+
+def check_hot_query_plans(db: Session) -> List[str]:
+    """
+    Run EXPLAIN QUERY PLAN over HOT_QUERIES and log any full table scans
+
+    Returns:
+        Warning messages, one per query that falls back to a full scan
+    """
+    warnings = []
+    for name, build_query in HOT_QUERIES.items():
+        try:
+            plan = explain_query_plan(db, build_query(db))
+        except Exception as e:
+            logger.warning(f"Could not explain query '{name}': {e}")
+            continue
+
+        scans = [detail for detail in plan if is_full_scan(detail)]
+        if scans:
+            message = f"Query '{name}' falls back to a full scan: {'; '.join(scans)}"
+            logger.warning(message)
+            warnings.append(message)
+        else:
+            logger.debug(f"Query '{name}' plan: {'; '.join(plan)}")
+
+    return warnings
@@ -2,9 +2,46 @@
 Optimized recipe query service for scalable recommendations
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from core.models import Recipe, DietaryRestriction, Like
-from typing import List, Tuple, Optional
+from sqlalchemy import tuple_
+from core.config import CacheSettings, CatalogSnapshotSettings
+from core.models import Recipe, DietaryRestriction
+from services.catalog_snapshot import get_catalog_snapshot
+from services.catalog_state import get_catalog_version
+from services.like_buffer import apply_buffered_likes, get_like_write_buffer
+from services.lru_cache import LRUCache
+from services.user_liked_cache import get_user_liked_set
+from services.recipe_read_model import RecipeRecord, load_records, records_from_query, select_records
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple, Optional
+import base64
+import json
+import math
+
+# Sort keys accepted by the paginated catalog listing. Each one is paired with
+# Recipe.id as a tie-breaker so the (sort value, id) pair is unique and the
+# ordering is stable across pages. SQLite secondary indexes carry the rowid, so
+# the single-column budget/cooking_time/like_count indexes already serve
+# (value, id).
+RECIPE_SORT_COLUMNS = {
+    'id': Recipe.id,
+    'budget': Recipe.budget,
+    'cooking_time': Recipe.cooking_time,
+    'likes': Recipe.like_count,
+}
+SORT_ORDERS = ('asc', 'desc')
+# JSON types a cursor's sort value may have, per sort key
+_CURSOR_VALUE_TYPES = {
+    'id': (int,),
+    'budget': (int, float),
+    'cooking_time': (int, float),
+    'likes': (int, float),
+}
+
+# Global recommendation ranking: most liked first, id as the tie-breaker so
+# LIMIT/OFFSET windows never overlap or skip rows between requests
+RECOMMENDATION_ORDER = (Recipe.like_count.desc(), Recipe.id.asc())
+
+# Total matches per (budget, cooking_time, diet, catalog version)
+_filter_count_cache = LRUCache(CacheSettings.FILTER_COUNT_CACHE_SIZE, 'filter_counts')
 
 
 def get_filtered_recipes_with_likes(
@@ -17,7 +54,7 @@ def get_filtered_recipes_with_likes(
     offset: int = 0
 ) -> List[Tuple]:
     """
-    Get filtered recipes with like counts in a single optimized query
+    Get filtered recipes with their denormalized like counts
     
     Args:
         db: Database session
@@ -29,29 +66,108 @@ def get_filtered_recipes_with_likes(
         offset: Number of recipes to skip (for pagination)
         
     Returns:
-        List of tuples (Recipe, like_count, user_has_liked)
-    """
-    # Build base query with joins (SQLite-compatible)
-    query = db.query(
-        Recipe,
-        func.count(Like.id).label('like_count'),
-        func.max(func.coalesce(Like.user_id == user_id, 0)).label('user_has_liked')
-    ).outerjoin(Like, Recipe.id == Like.recipe_id)
-    
-    # Apply filters
-    query = query.filter(Recipe.budget <= budget)
-    query = query.filter(Recipe.cooking_time <= cooking_time)
-    
-    if dietary_restrictions != DietaryRestriction.NONE:
-        query = query.filter(Recipe.dietary_restrictions == dietary_restrictions)
-    
-    # Group by recipe to aggregate likes
-    query = query.group_by(Recipe.id)
+        List of tuples (RecipeRecord, like_count, user_has_liked)
+    """
+    # Like counts are denormalized onto Recipe, so no join/group by is needed
+    query = build_filtered_recipes_query(db, budget, cooking_time, dietary_restrictions)
+    query = query.order_by(*RECOMMENDATION_ORDER)
     
     # Add pagination
-    query = query.limit(limit).offset(offset)
+    recipes = records_from_query(db, query.limit(limit).offset(offset))
     
-    return query.all()
+    liked_ids = get_user_liked_recipe_ids(db, user_id, [recipe.id for recipe in recipes])
+    return [(recipe, recipe.like_count, recipe.id in liked_ids) for recipe in recipes]
+
+
+def get_filtered_recipes_page(
+    db: Session,
+    user_id: int,
+    budget: float,
+    cooking_time: int,
+    dietary_restrictions: DietaryRestriction,
+    limit: int = 50,
+    offset: int = 0,
+    include_total: bool = True,
+    exclude_ids: Sequence[int] = ()
+) -> Tuple[List[Tuple], Optional[int], bool]:
+    """
+    Get one page of filtered recipes in global rank order with pagination info
+
+    Rows are ordered by RECOMMENDATION_ORDER inside the query, so consecutive
+    offsets always slice the same ranking. The total is served from a cache
+    keyed by the filter tuple and catalog version; on a miss it is computed
+    with a count that only reads the covering filter index. With
+    include_total=False no total is computed; one extra row is fetched
+    instead to tell whether another page exists. When the catalog snapshot
+    is enabled, filtering and ranking run in memory and only the page's rows
+    are read from the database; that ranking counts likes still queued in the
+    write-behind buffer, while the SQL path ranks by written counts only.
+
+    Args:
+        db: Database session
+        user_id: User ID for like information
+        budget: Maximum budget constraint
+        cooking_time: Maximum cooking time constraint
+        dietary_restrictions: Dietary restriction preference
+        limit: Maximum number of recipes to return
+        offset: Number of recipes to skip (for pagination)
+        include_total: Whether to compute the exact number of matches
+        exclude_ids: Recipes ranked elsewhere (e.g. pinned AI picks). They must
+            match the filters; they are left out of both the page and the total.
+
+    Returns:
+        Tuple of ([(RecipeRecord, like_count, user_has_liked), ...], total_count, has_more).
+        total_count is None when include_total is False.
+    """
+    if CatalogSnapshotSettings.ENABLED:
+        page_ids, total_count = get_catalog_snapshot(db).ranked_page(
+            budget, cooking_time, dietary_restrictions, limit, offset, exclude_ids
+        )
+        recipes = get_recipes_by_ids(db, page_ids)
+        has_more = offset + len(page_ids) < total_count
+        if not include_total:
+            total_count = None
+        liked_ids = get_user_liked_recipe_ids(db, user_id, page_ids)
+        page = [(recipe, recipe.like_count, recipe.id in liked_ids) for recipe in recipes]
+        return page, total_count, has_more
+
+    query = build_filtered_recipes_query(db, budget, cooking_time, dietary_restrictions)
+    if exclude_ids:
+        query = query.filter(Recipe.id.notin_(list(exclude_ids)))
+    query = query.order_by(*RECOMMENDATION_ORDER)
+
+    if not include_total:
+        recipes = records_from_query(db, query.limit(limit + 1).offset(offset))
+        has_more = len(recipes) > limit
+        recipes = recipes[:limit]
+        total_count = None
+    else:
+        recipes = records_from_query(db, query.limit(limit).offset(offset)) if limit else []
+        total_count = get_cached_filter_count(
+            db, budget, cooking_time, dietary_restrictions
+        ) - len(exclude_ids)
+        has_more = offset + len(recipes) < total_count
+
+    liked_ids = get_user_liked_recipe_ids(db, user_id, [recipe.id for recipe in recipes])
+    page = [(recipe, recipe.like_count, recipe.id in liked_ids) for recipe in recipes]
+    return page, total_count, has_more
+
+
+def get_cached_filter_count(
+    db: Session,
+    budget: float,
+    cooking_time: int,
+    dietary_restrictions: DietaryRestriction
+) -> int:
+    """
+    Get the number of recipes matching filters, cached per catalog version
+    """
+    cache_key = (budget, cooking_time, dietary_restrictions, get_catalog_version())
+    total_count = _filter_count_cache.get(cache_key)
+    if total_count is None:
+        total_count = get_recipe_count_by_filters(db, budget, cooking_time, dietary_restrictions)
+        _filter_count_cache.put(cache_key, total_count)
+    return total_count
 
 
 def get_recipe_count_by_filters(
@@ -63,6 +179,18 @@ def get_recipe_count_by_filters(
     """
     Get total count of recipes matching filters (for pagination)
     """
+    return build_filtered_recipes_query(db, budget, cooking_time, dietary_restrictions).count()
+
+
+def build_filtered_recipes_query(
+    db: Session,
+    budget: float,
+    cooking_time: int,
+    dietary_restrictions: DietaryRestriction
+):
+    """
+    Build the recommendation filter query shared by the page and count queries
+    """
     query = db.query(Recipe)
     query = query.filter(Recipe.budget <= budget)
     query = query.filter(Recipe.cooking_time <= cooking_time)
@@ -70,4 +198,204 @@ def get_recipe_count_by_filters(
     if dietary_restrictions != DietaryRestriction.NONE:
         query = query.filter(Recipe.dietary_restrictions == dietary_restrictions)
     
-    return query.count()
\ No newline at end of file
+    return query
+
+
+def encode_cursor(sort: str, order: str, sort_value: Any, recipe_id: int) -> str:
+    """
+    Encode the last row of a page as an opaque keyset cursor
+    """
+    payload = json.dumps([sort, order, sort_value, recipe_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Tuple[Any, int]:
+    """
+    Decode a keyset cursor into its (sort value, recipe id) pair
+
+    Raises:
+        ValueError: If the cursor is malformed, holds values of the wrong type
+            or was issued for another ordering
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, cursor_order, sort_value, recipe_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if cursor_sort != sort or cursor_order != order:
+        raise ValueError("Cursor does not match the requested sort order")
+    if not _is_cursor_value(recipe_id, (int,)) or not _is_cursor_value(sort_value, _CURSOR_VALUE_TYPES.get(sort, ())):
+        raise ValueError("Invalid cursor")
+    return sort_value, recipe_id
+
+
+def _is_cursor_value(value: Any, types: Tuple[type, ...]) -> bool:
+    # bool is an int subclass; NaN and infinities never compare usefully
+    if isinstance(value, bool) or not isinstance(value, types):
+        return False
+    return not isinstance(value, float) or math.isfinite(value)
+
+
+def get_recipe_page(
+    db: Session,
+    sort: str = 'id',
+    order: str = 'asc',
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    columns: Optional[Sequence] = None
+) -> Tuple[List[Tuple[RecipeRecord, int]], Optional[str]]:
+    """
+    Get one page of the recipe catalog using keyset pagination
+
+    Rows are ordered by (sort value, id) so every page boundary is unambiguous.
+    When a cursor is given the query seeks straight to the next key with a
+    row-value comparison instead of skipping rows with OFFSET. With the
+    catalog snapshot enabled the seek is a binary search over the snapshot's
+    presorted columns and only the page's rows are read from the database.
+
+    Args:
+        db: Database session
+        sort: One of RECIPE_SORT_COLUMNS
+        order: 'asc' or 'desc'
+        limit: Maximum number of recipes to return
+        cursor: Cursor returned with the previous page, if any
+        offset: Number of recipes to skip (only used without a cursor)
+        columns: Only read these Recipe columns (plus the sort column);
+            None reads every column
+
+    Returns:
+        Tuple of ([(RecipeRecord, like_count), ...], next_cursor). next_cursor is
+        None when there are no further pages.
+
+    Raises:
+        ValueError: If sort/order are unknown or the cursor is invalid
+    """
+    if sort not in RECIPE_SORT_COLUMNS:
+        raise ValueError(f"Unsupported sort key: {sort}")
+    if order not in SORT_ORDERS:
+        raise ValueError(f"Unsupported sort order: {order}")
+
+    sort_expr = RECIPE_SORT_COLUMNS[sort]
+    after = decode_cursor(cursor, sort, order) if cursor else None
+
+    if CatalogSnapshotSettings.ENABLED:
+        page_ids, sort_values = get_catalog_snapshot(db).keyset_page(
+            sort, order, after, limit + 1, 0 if cursor else offset
+        )
+        has_more = len(page_ids) > limit
+        page_ids, sort_values = page_ids[:limit], sort_values[:limit]
+        next_cursor = None
+        if has_more and page_ids:
+            next_cursor = encode_cursor(sort, order, sort_values[-1], page_ids[-1])
+        recipes = get_recipes_by_ids(db, page_ids, columns)
+        return [(recipe, recipe.like_count) for recipe in recipes], next_cursor
+
+    query = build_recipe_page_query(db, sort, order, after)
+    if columns is not None:
+        # The cursor is built from the last row's sort value
+        columns = [*columns, sort_expr]
+
+    if not cursor and offset:
+        query = query.offset(offset)
+
+    # Fetch one extra row to learn whether another page exists
+    rows = records_from_query(db, query.limit(limit + 1), columns)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last_recipe = rows[-1]
+        last_value = getattr(last_recipe, sort_expr.key)
+        next_cursor = encode_cursor(sort, order, last_value, last_recipe.id)
+
+    return [(recipe, recipe.like_count) for recipe in rows], next_cursor
+
+
+def build_recipe_page_query(
+    db: Session,
+    sort: str,
+    order: str,
+    after: Optional[Tuple[Any, int]] = None
+):
+    """
+    Build the keyset-ordered catalog query, optionally seeking past a key
+
+    Args:
+        after: (sort value, recipe id) of the last row already returned
+    """
+    sort_expr = RECIPE_SORT_COLUMNS[sort]
+    query = db.query(Recipe)
+
+    if after is not None:
+        sort_value, last_id = after
+        if sort == 'id':
+            seek = Recipe.id > last_id if order == 'asc' else Recipe.id < last_id
+        else:
+            key = tuple_(sort_expr, Recipe.id)
+            bound = tuple_(sort_value, last_id)
+            seek = key > bound if order == 'asc' else key < bound
+        query = query.filter(seek)
+
+    if order == 'asc':
+        return query.order_by(sort_expr.asc(), Recipe.id.asc())
+    return query.order_by(sort_expr.desc(), Recipe.id.desc())
+
+
+def get_recipes_by_ids(
+    db: Session,
+    recipe_ids: Sequence[int],
+    columns: Optional[Sequence] = None
+) -> List[RecipeRecord]:
+    """
+    Load recipe records by primary key with one IN query, preserving the
+    given order
+
+    Ids that no longer exist are skipped. With columns, only those Recipe
+    columns are read; the others are None on the records.
+    """
+    if not recipe_ids:
+        return []
+    statement = select_records(columns).where(Recipe.id.in_(list(recipe_ids)))
+    recipes = {recipe.id: recipe for recipe in load_records(db, statement)}
+    return [recipes[recipe_id] for recipe_id in recipe_ids if recipe_id in recipes]
+
+
+def get_recipe_like_counts(db: Session, recipe_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Get the like counts of several recipes with one IN query
+
+    Counts come from the denormalized Recipe.like_count, so no grouping over
+    the likes table is needed. Ids that do not exist are left out. Likes
+    still in the write-behind buffer are included.
+    """
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return {}
+    rows = db.query(Recipe.id, Recipe.like_count).filter(Recipe.id.in_(recipe_ids)).all()
+    like_counts = dict(rows)
+    buffer = get_like_write_buffer()
+    if buffer is not None:
+        for recipe_id, delta in buffer.count_deltas(like_counts).items():
+            like_counts[recipe_id] += delta
+    return like_counts
+
+
+def get_user_liked_recipe_ids(db: Session, user_id: Optional[int], recipe_ids: Iterable[int]) -> Set[int]:
+    """
+    Get which of the given recipes a user has liked
+
+    Membership comes from the user's cached liked set (one query the first
+    time the user is seen). Likes and unlikes still in the write-behind
+    buffer are applied on top.
+    """
+    recipe_ids = list(recipe_ids)
+    if not user_id or not recipe_ids:
+        return set()
+
+    liked = get_user_liked_set(db, user_id)
+    return apply_buffered_likes(user_id, {recipe_id for recipe_id in recipe_ids if recipe_id in liked}, recipe_ids)
@@ -0,0 +1,86 @@
+"""
+Read model for recipes on serialization-only paths
+
+Catalog pages, search, batch, pantry matches, recommendations and liked
+recipes only read recipes to serialize them, so they load RecipeRecord
+objects instead of Recipe entities. A record comes from a column-level
+select run on the session's connection, with one __slots__ object per row
+and no identity map, attribute instrumentation or ORM result processing.
+Records expose the Recipe column attributes, so the serializers and caches
+accept them as they are. Writes and anything that follows relationships
+keep using the ORM.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import starmap
+from sqlalchemy import null, select
+from sqlalchemy.orm import Query, Session
+from typing import List, Optional, Sequence
+
+from core.models import DietaryRestriction, DifficultyLevel, Recipe
+from services.like_buffer import apply_buffered_counts
+
+# Every recipes column, in table order (the RecipeRecord field order)
+RECORD_COLUMNS = tuple(Recipe.__table__.columns)
+
+
+@dataclass(slots=True)
+class RecipeRecord:
+    """One recipes row, fields in RECORD_COLUMNS order"""
+    id: int
+    title: str
+    description: str
+    ingredients: str
+    instructions: str
+    cooking_time: int
+    prep_time: Optional[int]
+    difficulty: Optional[DifficultyLevel]
+    servings: int
+    budget: float
+    calories_per_serving: Optional[int]
+    cuisine: Optional[str]
+    dietary_restrictions: Optional[DietaryRestriction]
+    image_url: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    is_featured: Optional[int]
+    average_rating: Optional[float]
+    like_count: int
+
+
+def record_columns(columns: Optional[Sequence] = None) -> List:
+    """
+    Select list that produces RecipeRecord rows
+
+    Args:
+        columns: Only read these Recipe columns (e.g. from listing_columns);
+            the others are selected as NULL. None reads every column.
+    """
+    if columns is None:
+        return list(RECORD_COLUMNS)
+    keys = {column.key for column in columns}
+    return [column if column.key in keys else null().label(column.key) for column in RECORD_COLUMNS]
+
+
+def select_records(columns: Optional[Sequence] = None):
+    """select() of recipe records, to add filters and ordering to"""
+    return select(*record_columns(columns))
+
+
+def load_records(db: Session, statement) -> List[RecipeRecord]:
+    """
+    Execute a select of record_columns() in the session's transaction and
+    build one record per row
+
+    like_count includes likes still in the write-behind buffer.
+    """
+    records = list(starmap(RecipeRecord, db.connection().execute(statement)))
+    apply_buffered_counts(records)
+    return records
+
+
+def records_from_query(db: Session, query: Query, columns: Optional[Sequence] = None) -> List[RecipeRecord]:
+    """
+    Run a Recipe ORM query (filters, ordering, limit and offset) as records
+    """
+    return load_records(db, query.with_entities(*record_columns(columns)).statement)
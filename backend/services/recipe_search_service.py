@@ -0,0 +1,141 @@
+"""
+Full-text recipe search over the recipes_fts FTS5 index
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from core.config import CacheSettings, PaginationLimits
+from core.models import DietaryRestriction
+from services.catalog_state import get_catalog_version
+from services.lru_cache import LRUCache
+
+# bm25() column weights, in recipes_fts column order:
+# title, description, cuisine, ingredients
+SEARCH_WEIGHTS = (10.0, 1.0, 4.0, 3.0)
+MAX_QUERY_TERMS = 8
+
+# Ranking has to score every match, so the deepest reachable window (plus one
+# row for has_more) is ranked once and cached; later pages are slices of it
+SEARCH_WINDOW = PaginationLimits.MAX_OFFSET + PaginationLimits.MAX_PAGE_SIZE + 1
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Ranked ids per (match expression, filters, catalog version)
+_search_result_cache = LRUCache(CacheSettings.SEARCH_RESULT_CACHE_SIZE, 'search_results')
+
+
+def build_match_expression(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression
+
+    Every word must match (implicit AND) and is matched as a prefix, so
+    partially typed words still find results. Words are quoted, which keeps
+    FTS5 operators and punctuation in user input from being interpreted.
+
+    Returns:
+        The MATCH expression, or None if the query has no searchable words
+    """
+    terms = _TERM_PATTERN.findall(query.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_recipe_ids(
+    db: Session,
+    query: str,
+    limit: int = 50,
+    offset: int = 0,
+    budget: Optional[float] = None,
+    cooking_time: Optional[int] = None,
+    dietary_restrictions: Optional[DietaryRestriction] = None
+) -> Tuple[List[int], bool]:
+    """
+    Find recipes matching a text query, best BM25 match first
+
+    Ties in score are broken by id so offset pages are stable. The first
+    SEARCH_WINDOW ranked ids are cached per query, filters and catalog
+    version, so paging through results and repeated queries skip scoring.
+
+    Args:
+        db: Database session
+        query: Free-text search query
+        limit: Maximum number of recipes to return
+        offset: Number of matches to skip
+        budget: Optional maximum budget
+        cooking_time: Optional maximum cooking time
+        dietary_restrictions: Optional diet; NONE means no diet filter
+
+    Returns:
+        Tuple of (recipe ids in rank order, has_more)
+
+    Raises:
+        ValueError: If the query contains no searchable words, or the page
+            ends beyond SEARCH_WINDOW (routes cap limit and offset first)
+    """
+    match = build_match_expression(query)
+    if match is None:
+        raise ValueError("Search query must contain at least one word")
+    if dietary_restrictions == DietaryRestriction.NONE:
+        dietary_restrictions = None
+
+    if offset + limit >= SEARCH_WINDOW:
+        raise ValueError(f"Search pages must end within the first {SEARCH_WINDOW - 1} matches")
+
+    cache_key = (match, budget, cooking_time, dietary_restrictions, get_catalog_version())
+    ranked_ids = _search_result_cache.get(cache_key)
+    if ranked_ids is None:
+        ranked_ids = _rank_matches(
+            db, match, SEARCH_WINDOW, 0, budget, cooking_time, dietary_restrictions
+        )
+        _search_result_cache.put(cache_key, ranked_ids)
+    window = ranked_ids[offset:offset + limit + 1]
+
+    # The window holds one extra id when another page exists
+    return list(window[:limit]), len(window) > limit
+
+
+def _rank_matches(
+    db: Session,
+    match: str,
+    limit: int,
+    offset: int,
+    budget: Optional[float],
+    cooking_time: Optional[int],
+    dietary_restrictions: Optional[DietaryRestriction]
+) -> Tuple[int, ...]:
+    """Run the ranked FTS query and return one window of recipe ids"""
+    weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+    params: Dict[str, Any] = {'match': match, 'limit': limit, 'offset': offset}
+
+    conditions = []
+    if budget is not None:
+        conditions.append("recipes.budget <= :budget")
+        params['budget'] = budget
+    if cooking_time is not None:
+        conditions.append("recipes.cooking_time <= :cooking_time")
+        params['cooking_time'] = cooking_time
+    if dietary_restrictions is not None:
+        # Enum columns are stored by name
+        conditions.append("recipes.dietary_restrictions = :diet")
+        params['diet'] = dietary_restrictions.name
+
+    if conditions:
+        # Matches come from the FTS index; filters are checked on the recipes
+        # row looked up by primary key
+        sql = (
+            "SELECT recipes_fts.rowid FROM recipes_fts "
+            "JOIN recipes ON recipes.id = recipes_fts.rowid "
+            f"WHERE recipes_fts MATCH :match AND {' AND '.join(conditions)} "
+        )
+    else:
+        # Without filters the recipes table is not needed at all
+        sql = "SELECT rowid FROM recipes_fts WHERE recipes_fts MATCH :match "
+
+    sql += (
+        f"ORDER BY bm25(recipes_fts, {weights}), recipes_fts.rowid "
+        "LIMIT :limit OFFSET :offset"
+    )
+    return tuple(recipe_id for recipe_id, in db.execute(text(sql), params))
@@ -1,12 +1,59 @@
 """
 Recipe data serialization service
 """
-import json
 import logging
-from typing import Dict, List, Any
+from operator import attrgetter
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from core.config import CacheSettings
+from core.models import Recipe
+from core.responses import dumps
+from services.lru_cache import LRUCache
+from services.parsed_recipe_cache import get_parsed_fields
 
 logger = logging.getLogger(__name__)
 
+# Static listing fields and the Recipe columns each one reads. The JSON
+# columns are parsed together (see get_parsed_fields), so either needs both.
+LISTING_FIELD_COLUMNS = {
+    'id': (),
+    'title': (Recipe.title,),
+    'description': (Recipe.description,),
+    'ingredients': (Recipe.ingredients, Recipe.instructions),
+    'instructions': (Recipe.ingredients, Recipe.instructions),
+    'cooking_time': (Recipe.cooking_time,),
+    'prep_time': (Recipe.prep_time,),
+    'difficulty': (Recipe.difficulty,),
+    'servings': (Recipe.servings,),
+    'budget': (Recipe.budget,),
+    'calories_per_serving': (Recipe.calories_per_serving,),
+    'cuisine': (Recipe.cuisine,),
+    'dietary_restrictions': (Recipe.dietary_restrictions,),
+    'image_url': (Recipe.image_url,),
+    'is_featured': (Recipe.is_featured,),
+    'average_rating': (Recipe.average_rating,),
+    'created_at': (Recipe.created_at,),
+}
+
+# What recipe cards show: no ingredient/instruction lists
+SUMMARY_FIELDS = (
+    'id', 'title', 'description', 'cooking_time', 'difficulty', 'servings',
+    'budget', 'cuisine', 'dietary_restrictions', 'image_url',
+)
+
+# Always read: the primary key, the cache version and the like counter
+_PROJECTION_BASE_COLUMNS = (Recipe.id, Recipe.updated_at, Recipe.like_count)
+
+# Encoded static listing fields (the JSON object without its like fields and
+# closing brace) per (recipe_id, hash of the column values they were built
+# from[, projection]). Keying on the values rather than updated_at means
+# writes that bypass the ORM are not served stale; superseded entries age out.
+_listing_fragment_cache = LRUCache(CacheSettings.RECIPE_FRAGMENT_CACHE_SIZE, 'recipe_fragments')
+# Projection (None for the full listing) -> getter of the columns it reads
+_source_getters: Dict[Optional[Tuple[str, ...]], attrgetter] = {}
+
+_LIKED = (b'false}', b'true}')
+
 
 def serialize_recipe_data(recipe, like_count: int, user_has_liked: bool, **extra_fields) -> Dict[str, Any]:
     """
@@ -21,9 +68,8 @@ def serialize_recipe_data(recipe, like_count: int, user_has_liked: bool, **extra
     Returns:
         Dictionary representation of recipe
     """
-    # Parse JSON fields safely
-    ingredients = _parse_json_field(recipe.ingredients, recipe.id, "ingredients")
-    instructions = _parse_json_field(recipe.instructions, recipe.id, "instructions")
+    # Parsed once per recipe version, see services.parsed_recipe_cache
+    ingredients, instructions = get_parsed_fields(recipe)
     
     recipe_data = {
         'id': recipe.id,
@@ -46,15 +92,32 @@ def serialize_recipe_data(recipe, like_count: int, user_has_liked: bool, **extra
     return recipe_data
 
 
-def _parse_json_field(json_str: str, recipe_id: int, field_name: str) -> List:
+def serialize_recipe_listing(recipe, like_count: int, user_has_liked: bool) -> Dict[str, Any]:
     """
-    Safely parse JSON field with error handling
+    Convert recipe model to the catalog listing format used by /api/recipes/
     """
-    try:
-        return json.loads(json_str) if json_str else []
-    except (json.JSONDecodeError, TypeError):
-        logger.warning(f"Invalid {field_name} JSON for recipe {recipe_id}")
-        return []
+    ingredients, instructions = get_parsed_fields(recipe)
+    return {
+        'id': recipe.id,
+        'title': recipe.title,
+        'description': recipe.description,
+        'ingredients': ingredients,
+        'instructions': instructions,
+        'cooking_time': recipe.cooking_time,
+        'prep_time': recipe.prep_time,
+        'difficulty': recipe.difficulty.value,
+        'servings': recipe.servings,
+        'budget': recipe.budget,
+        'calories_per_serving': recipe.calories_per_serving,
+        'cuisine': recipe.cuisine,
+        'dietary_restrictions': recipe.dietary_restrictions.value,
+        'image_url': recipe.image_url,
+        'is_featured': bool(recipe.is_featured),
+        'average_rating': recipe.average_rating,
+        'created_at': recipe.created_at,
+        'like_count': like_count,
+        'user_has_liked': user_has_liked
+    }
 
 
 def serialize_recipe_list(recipe_data_list: List[tuple], **common_extra_fields) -> List[Dict[str, Any]]:
@@ -64,4 +127,140 @@ def serialize_recipe_list(recipe_data_list: List[tuple], **common_extra_fields)
     return [
         serialize_recipe_data(recipe, like_count, user_has_liked, **common_extra_fields)
         for recipe, like_count, user_has_liked in recipe_data_list
-    ]
\ No newline at end of file
+    ]
+
+
+def parse_listing_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a `fields=` query parameter into a listing projection
+
+    Accepts a comma-separated list of listing fields or "summary" for
+    SUMMARY_FIELDS. id, like_count and user_has_liked are always returned.
+
+    Returns:
+        Field names in listing order, or None for the full listing
+
+    Raises:
+        ValueError: If a field is unknown
+    """
+    if fields is None or not fields.strip() or fields.strip() == 'full':
+        return None
+    if fields.strip() == 'summary':
+        return SUMMARY_FIELDS
+
+    requested = {name.strip() for name in fields.split(',') if name.strip()}
+    requested -= {'like_count', 'user_has_liked'}
+    unknown = requested - LISTING_FIELD_COLUMNS.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add('id')
+    return tuple(name for name in LISTING_FIELD_COLUMNS if name in requested)
+
+
+def listing_columns(fields: Optional[Tuple[str, ...]]) -> Optional[List]:
+    """
+    Recipe columns to load for a projection (for load_only), None for all
+    """
+    if fields is None:
+        return None
+    columns = list(_PROJECTION_BASE_COLUMNS)
+    for name in fields:
+        columns.extend(column for column in LISTING_FIELD_COLUMNS[name] if column not in columns)
+    return columns
+
+
+def _project_listing(recipe, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Static listing fields of a recipe, reading only the projected columns"""
+    data = {}
+    for name in fields:
+        if name in ('ingredients', 'instructions'):
+            ingredients, instructions = get_parsed_fields(recipe)
+            data[name] = ingredients if name == 'ingredients' else instructions
+        elif name in ('difficulty', 'dietary_restrictions'):
+            data[name] = getattr(recipe, name).value
+        elif name == 'is_featured':
+            data[name] = bool(recipe.is_featured)
+        else:
+            data[name] = getattr(recipe, name)
+    return data
+
+
+def _source_getter(fields: Optional[Tuple[str, ...]]) -> attrgetter:
+    """Getter of the column values a (projected) listing fragment is built from"""
+    getter = _source_getters.get(fields)
+    if getter is None:
+        names = ['id']
+        for name in (LISTING_FIELD_COLUMNS if fields is None else fields):
+            names.extend(column.key for column in LISTING_FIELD_COLUMNS[name] if column.key not in names)
+        getter = _source_getters[fields] = attrgetter(*names)
+    return getter
+
+
+def _listing_fragment(recipe, fields: Optional[Tuple[str, ...]] = None) -> bytes:
+    """Pre-encoded static part of a recipe's listing JSON, optionally projected"""
+    source = hash(_source_getter(fields)(recipe))
+    key = (recipe.id, source) if fields is None else (recipe.id, source, fields)
+    fragment = _listing_fragment_cache.get(key)
+    if fragment is None:
+        if fields is None:
+            data = serialize_recipe_listing(recipe, 0, False)
+            del data['like_count'], data['user_has_liked']
+        else:
+            data = _project_listing(recipe, fields)
+        fragment = dumps(data)[:-1]
+        _listing_fragment_cache.put(key, fragment)
+    return fragment
+
+
+def encode_recipe_listing(
+    recipe,
+    like_count: int,
+    user_has_liked: bool,
+    fields: Optional[Tuple[str, ...]] = None,
+    **extra_fields
+) -> bytes:
+    """
+    Listing JSON of one recipe as bytes, same content as serialize_recipe_listing
+
+    The static fields come pre-encoded; only like_count, user_has_liked and
+    any extra fields are encoded per call.
+
+    Args:
+        fields: Projection from parse_listing_fields; None for every field
+    """
+    parts = [_listing_fragment(recipe, fields)]
+    for name, value in extra_fields.items():
+        parts.append(b',"%s":%s' % (name.encode(), dumps(value)))
+    parts.append(b',"like_count":%d,"user_has_liked":%s' % (like_count, _LIKED[bool(user_has_liked)]))
+    return b''.join(parts)
+
+
+def encode_recipe_detail(recipe) -> bytes:
+    """
+    Detail JSON of one recipe as bytes (the RecipeResponse fields)
+    """
+    return _listing_fragment(recipe) + b'}'
+
+
+def encode_recipe_listings(
+    items: Iterable[Tuple[Any, int, bool]],
+    fields: Optional[Tuple[str, ...]] = None
+) -> bytes:
+    """
+    JSON array of (recipe, like_count, user_has_liked) listings as bytes
+    """
+    return b'[' + b','.join(
+        encode_recipe_listing(recipe, like_count, user_has_liked, fields)
+        for recipe, like_count, user_has_liked in items
+    ) + b']'
+
+
+def encode_listing_response(recipes: bytes, **fields) -> bytes:
+    """
+    Response body with a pre-encoded recipes array followed by other fields
+    """
+    parts = [b'{"recipes":', recipes]
+    for name, value in fields.items():
+        parts.append(b',"%s":%s' % (name.encode(), dumps(value)))
+    parts.append(b'}')
+    return b''.join(parts)
@@ -2,7 +2,7 @@
 Recommendation service for recipe suggestions
 """
 from sqlalchemy.orm import Session
-from core.models import Recipe, DietaryRestriction, Like
+from core.models import DietaryRestriction
 try:
     from services.ai_recommendation_service import ai_service
     AI_AVAILABLE = True
@@ -10,7 +10,7 @@ except ImportError as e:
     logger.warning(f"AI service not available: {e}")
     ai_service = None
     AI_AVAILABLE = False
-from services.recipe_query_service import get_filtered_recipes_with_likes, get_recipe_count_by_filters
+from services.recipe_query_service import get_filtered_recipes_page, get_user_liked_recipe_ids
 from services.recipe_serializer import serialize_recipe_list, serialize_recipe_data
 import logging
 
@@ -25,7 +25,8 @@ def get_recipe_recommendations(
     final_dietary_restrictions: DietaryRestriction,
     include_ai: bool = True,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    include_total: bool = True
 ) -> dict:
     """
     Get recipe recommendations based on user preferences
@@ -39,89 +40,84 @@ def get_recipe_recommendations(
         include_ai: Whether to include AI-powered recommendations
         limit: Maximum number of recipes to return
         offset: Number of recipes to skip (for pagination)
+        include_total: Whether to compute total_count (has_more is always set)
         
     Returns:
         Dictionary with recipes list and pagination info
     """
-    # Get filtered recipes with optimized query
-    recipe_data_list = get_filtered_recipes_with_likes(
-        db, user_id, final_budget, final_cooking_time, 
-        final_dietary_restrictions, limit, offset
-    )
-    
-    # Convert to standardized format
-    recommended_recipes = serialize_recipe_list(recipe_data_list)
-    
-    # Add AI recommendations if enabled and available
+    # AI/popular picks that match the filters are pinned to the head of the
+    # ranking; everything else follows in SQL order (most liked first).
+    pinned = []
     if include_ai and AI_AVAILABLE:
-        recommended_recipes = _enhance_with_ai_recommendations(
-            db, user_id, recommended_recipes, final_budget, 
-            final_cooking_time, final_dietary_restrictions
+        pinned = _get_pinned_recommendations(
+            db, user_id, final_budget, final_cooking_time, final_dietary_restrictions
         )
     
-    # Sort recommendations
-    recommended_recipes.sort(key=_get_sort_key)
+    # Map the global [offset, offset + limit) window onto pinned + ranked rows
+    pinned_page = pinned[offset:offset + limit]
+    ranked_offset = max(0, offset - len(pinned))
+    ranked_limit = limit - len(pinned_page)
     
-    # Get total count for pagination
-    total_count = get_recipe_count_by_filters(
-        db, final_budget, final_cooking_time, final_dietary_restrictions
+    recipe_data_list, ranked_total, ranked_has_more = get_filtered_recipes_page(
+        db, user_id, final_budget, final_cooking_time, 
+        final_dietary_restrictions, ranked_limit, ranked_offset, include_total,
+        exclude_ids=[recipe_data['id'] for recipe_data in pinned]
     )
     
+    recommended_recipes = pinned_page + serialize_recipe_list(recipe_data_list)
+    
+    if ranked_total is not None:
+        total_count = ranked_total + len(pinned)
+        has_more = offset + len(recommended_recipes) < total_count
+    else:
+        total_count = None
+        has_more = ranked_has_more or offset + len(pinned_page) < len(pinned)
+    
     return {
         'recipes': recommended_recipes,
         'total_count': total_count,
         'limit': limit,
         'offset': offset,
-        'has_more': offset + len(recommended_recipes) < total_count
+        'has_more': has_more
     }
 
 
-def _enhance_with_ai_recommendations(
-    db: Session, user_id: int, existing_recipes: list,
+def _get_pinned_recommendations(
+    db: Session, user_id: int,
     budget: float, cooking_time: int, dietary_restrictions: DietaryRestriction
 ) -> list:
-    """Add AI recommendations to existing recipe list"""
+    """
+    Get serialized AI/popular recommendations that match the filters,
+    best similarity first
+    """
     if not AI_AVAILABLE or ai_service is None:
-        return existing_recipes
+        return []
         
     try:
         ai_recommendations = ai_service.get_ai_recommendations(db, user_id, limit=3)
-        ai_recipe_data = {ai_rec['recipe'].id: ai_rec for ai_rec in ai_recommendations}
-        
-        # Mark existing recipes as AI/popular if they match
-        for recipe_data in existing_recipes:
-            if recipe_data['id'] in ai_recipe_data:
-                ai_rec = ai_recipe_data[recipe_data['id']]
-                recipe_data['recommendation_type'] = ai_rec.get('recommendation_type', 'ai')
-                recipe_data['ai_similarity_score'] = ai_rec['similarity_score']
+        matching = [
+            ai_rec for ai_rec in ai_recommendations
+            if _recipe_matches_filters(ai_rec['recipe'], budget, cooking_time, dietary_restrictions)
+        ]
+        matching.sort(key=lambda ai_rec: (-ai_rec['similarity_score'], ai_rec['recipe'].id))
         
-        # Add new AI recommendations that aren't already included
-        existing_recipe_ids = {r['id'] for r in existing_recipes}
+        liked_ids = get_user_liked_recipe_ids(
+            db, user_id, [ai_rec['recipe'].id for ai_rec in matching]
+        )
         
-        for ai_rec in ai_recommendations:
-            recipe = ai_rec['recipe']
-            
-            if (_recipe_matches_filters(recipe, budget, cooking_time, dietary_restrictions) and
-                recipe.id not in existing_recipe_ids):
-                
-                # Get like information
-                like_count = db.query(Like).filter(Like.recipe_id == recipe.id).count()
-                user_has_liked = db.query(Like).filter(
-                    Like.user_id == user_id, Like.recipe_id == recipe.id
-                ).first() is not None
-                
-                # Serialize with AI fields
-                recipe_data = serialize_recipe_data(
-                    recipe, like_count, user_has_liked,
-                    ai_similarity_score=ai_rec['similarity_score'],
-                    recommendation_type=ai_rec.get('recommendation_type', 'ai')
-                )
-                existing_recipes.append(recipe_data)
+        return [
+            serialize_recipe_data(
+                ai_rec['recipe'], ai_rec['recipe'].like_count,
+                ai_rec['recipe'].id in liked_ids,
+                ai_similarity_score=ai_rec['similarity_score'],
+                recommendation_type=ai_rec.get('recommendation_type', 'ai')
+            )
+            for ai_rec in matching
+        ]
                 
     except Exception as e:
         logger.warning(f"AI recommendations failed: {e}")
-    
-    return existing_recipes
+        return []
 
 
 def _recipe_matches_filters(recipe, budget: float, cooking_time: int, dietary_restrictions: DietaryRestriction) -> bool:
@@ -130,12 +126,3 @@ def _recipe_matches_filters(recipe, budget: float, cooking_time: int, dietary_re
             recipe.cooking_time <= cooking_time and
             (dietary_restrictions == DietaryRestriction.NONE or 
              recipe.dietary_restrictions == dietary_restrictions))
-
-
-def _get_sort_key(recipe: dict) -> tuple:
-    """Sort key for recommendations (AI/popular first, then by scores)"""
-    recommendation_type = recipe.get('recommendation_type')
-    is_ai_or_popular = 1 if recommendation_type in ['ai', 'popular'] else 0
-    ai_score = recipe.get('ai_similarity_score', 0)
-    like_count = recipe.get('like_count', 0)
-    return (-is_ai_or_popular, -ai_score, -like_count)
\ No newline at end of file
@@ -1,9 +1,9 @@
-import json
 from collections import Counter
 from sqlalchemy.orm import Session
 from datetime import datetime
-from core.models import ShoppingList, ShoppingListItem, Recipe
+from core.models import ShoppingList, ShoppingListItem
 from core.schemas import ShoppingListCreate
+from services.ingredient_service import get_recipe_ingredient_names
 from services.meal_planning_service import get_meal_plans_by_date_range
 
 def consolidate_ingredients(ingredient_list):
@@ -35,14 +35,14 @@ def create_list_from_recipes(db: Session, user_id: int, list_data: ShoppingListC
     db.commit()
     db.refresh(shopping_list)
     
+    # Load every recipe's ingredients in one query from recipe_ingredients
+    ingredients_by_recipe = get_recipe_ingredient_names(db, list_data.recipe_ids)
+    
     # Collect all ingredients from recipes (accounting for duplicates)
     all_ingredients = []
     
     for recipe_id in list_data.recipe_ids:  # Process each recipe ID separately
-        recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
-        if recipe:
-            ingredients = json.loads(recipe.ingredients)
-            all_ingredients.extend(ingredients)
+        all_ingredients.extend(ingredients_by_recipe.get(recipe_id, []))
     
     # Consolidate ingredients
     consolidated_ingredients = consolidate_ingredients(all_ingredients)
@@ -0,0 +1,204 @@
+"""
+Trending recipes: like scores with exponential time decay
+
+A like made at time t adds 2^(-(now - t) / half-life) to its recipe's score,
+so recent likes dominate and old ones fade out (TrendingSettings). Scores
+are stored relative to a fixed reference time instead of being decayed as
+time passes: a like adds exp(decay * (t - reference)), which is O(1) per
+like event, and every score shares the same factor exp(-decay * (now -
+reference)), so the stored values rank recipes directly. The reference
+moves forward before the weights could overflow.
+
+The scores are built on first use (at startup) with one vectorized NumPy
+pass over the whole likes table, so they always match the likes that
+exist, whatever was liked or unliked while the process was down. Committed
+likes and unlikes (services.like_service) then update them in place, using
+Like.created_at.
+"""
+from sqlalchemy.orm import Session
+from datetime import datetime
+from itertools import chain
+from threading import Lock
+from typing import List, Optional, Tuple
+import logging
+import math
+import time
+
+import numpy as np
+
+from core.config import TrendingSettings
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+# Move the reference time before weights grow past 2^64
+_MAX_EXPONENT = 64 * math.log(2)
+
+# Like recipe ids and times as Unix seconds, converted by SQLite so no
+# datetime objects are built per row
+_LIKE_TIMES_SQL = (
+    "SELECT recipe_id, (julianday(created_at) - 2440587.5) * 86400.0 FROM likes "
+    "WHERE created_at IS NOT NULL"
+)
+
+
+def _seconds(moment: datetime) -> float:
+    """Naive UTC datetime (as stored in Like.created_at) to Unix seconds"""
+    return (moment - _EPOCH).total_seconds()
+
+
+class TrendingScores:
+    """Decayed like scores indexed by recipe id, with a cached ranking"""
+
+    def __init__(self, scores: np.ndarray, reference: float,
+                 half_life_hours: float = TrendingSettings.HALF_LIFE_HOURS):
+        self.decay = math.log(2) / (half_life_hours * 3600)
+        self.reference = reference
+        self._scores = scores
+        self._lock = Lock()
+        self._order: Optional[np.ndarray] = None
+        self._ranked_at = 0.0
+
+    @classmethod
+    def from_likes(cls, recipe_ids: np.ndarray, times: np.ndarray, now: float) -> "TrendingScores":
+        """Scores of a batch of likes (recipe ids and Unix times), as of now"""
+        trending = cls(np.zeros(0), now)
+        trending.add_likes(recipe_ids, times)
+        return trending
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def record(self, recipe_id: int, at: float, delta: int = 1) -> None:
+        """Add (delta=1) or withdraw (delta=-1) one like made at Unix time `at`"""
+        with self._lock:
+            if self.decay * (at - self.reference) > _MAX_EXPONENT:
+                self._rebase(at)
+            if recipe_id >= len(self._scores):
+                self._grow(recipe_id + 1)
+            self._scores[recipe_id] += delta * math.exp(self.decay * (at - self.reference))
+
+    def add_likes(self, recipe_ids: np.ndarray, times: np.ndarray) -> None:
+        """Add many likes in one vectorized pass"""
+        if not len(recipe_ids):
+            return
+        recipe_ids = recipe_ids.astype(np.int64)
+        with self._lock:
+            latest = float(times.max())
+            if self.decay * (latest - self.reference) > _MAX_EXPONENT:
+                self._rebase(latest)
+            weights = np.exp(self.decay * (times - self.reference))
+            added = np.bincount(recipe_ids, weights=weights)
+            if len(added) > len(self._scores):
+                self._grow(len(added))
+            self._scores[:len(added)] += added
+            self._order = None
+
+    def _rebase(self, reference: float) -> None:
+        self._scores *= math.exp(-self.decay * (reference - self.reference))
+        self.reference = reference
+
+    def _grow(self, size: int) -> None:
+        grown = np.zeros(max(size, 2 * len(self._scores)))
+        grown[:len(self._scores)] = self._scores
+        self._scores = grown
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _factor(self, now: float) -> float:
+        """Multiplier from stored values to scores at `now`"""
+        return math.exp(-self.decay * (now - self.reference))
+
+    def _ranking(self, now: float) -> np.ndarray:
+        """Recipe ids above MIN_SCORE, highest first (id ascending on ties)"""
+        if self._order is None or (
+            time.monotonic() - self._ranked_at >= TrendingSettings.RERANK_INTERVAL_SECONDS
+        ):
+            threshold = TrendingSettings.MIN_SCORE / self._factor(now)
+            ids = np.flatnonzero(self._scores >= threshold)
+            self._order = ids[np.lexsort((ids, -self._scores[ids]))]
+            self._ranked_at = time.monotonic()
+        return self._order
+
+    def page(self, limit: int, offset: int = 0, now: Optional[float] = None) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        A window of the trending order
+
+        Returns:
+            Tuple of ([(recipe_id, score), ...], number of trending recipes).
+            Scores are as of now; the order may lag by RERANK_INTERVAL_SECONDS.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            order = self._ranking(now)
+            ids = order[offset:offset + limit]
+            scores = self._scores[ids] * self._factor(now)
+            return list(zip(ids.tolist(), scores.tolist())), len(order)
+
+    def current_scores(self, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(recipe ids, scores as of now) of every recipe at or above MIN_SCORE"""
+        now = time.time() if now is None else now
+        with self._lock:
+            scores = self._scores * self._factor(now)
+        ids = np.flatnonzero(scores >= TrendingSettings.MIN_SCORE)
+        return ids, scores[ids]
+
+
+_trending: Optional[TrendingScores] = None
+_trending_lock = Lock()
+
+
+def _read_like_times(db: Session) -> Tuple[np.ndarray, np.ndarray]:
+    # Raw DBAPI cursor: building SQLAlchemy rows would cost more than the query
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(_LIKE_TIMES_SQL)
+        table = np.fromiter(chain.from_iterable(cursor), dtype=np.float64).reshape(-1, 2)
+    finally:
+        cursor.close()
+    return table[:, 0].astype(np.int64), table[:, 1]
+
+
+def build_trending_scores(db: Session) -> TrendingScores:
+    """Scores from one vectorized pass over every like"""
+    recipe_ids, times = _read_like_times(db)
+    return TrendingScores.from_likes(recipe_ids, times, time.time())
+
+
+def get_trending_scores(db: Session) -> TrendingScores:
+    """Current scores, loaded on first use"""
+    global _trending
+    trending = _trending
+    if trending is not None:
+        return trending
+    with _trending_lock:
+        if _trending is None:
+            _trending = build_trending_scores(db)
+        return _trending
+
+
+def get_trending_page(db: Session, limit: int, offset: int = 0) -> Tuple[List[Tuple[int, float]], int]:
+    """
+    A window of trending recipes, highest score first
+
+    Returns:
+        Tuple of ([(recipe_id, score), ...], number of trending recipes)
+    """
+    return get_trending_scores(db).page(limit, offset)
+
+
+def record_like_event(recipe_id: int, created_at: Optional[datetime], delta: int) -> None:
+    """Reflect a committed like (delta=1) or unlike (delta=-1) in the scores, if loaded"""
+    trending = _trending
+    if trending is not None and created_at is not None:
+        trending.record(recipe_id, _seconds(created_at), delta)
+
+
+def reset_trending_scores() -> None:
+    """Drop the in-memory scores so the next request builds them again"""
+    global _trending
+    with _trending_lock:
+        _trending = None
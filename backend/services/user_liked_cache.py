@@ -0,0 +1,74 @@
+"""
+Cache of the set of recipe ids each user has liked
+
+"Has this user liked X" is asked for every card of every listing. Each
+user's liked ids are loaded with one query the first time they are needed
+and kept in an LRU cache as a set, so later membership checks are lookups
+in memory. Like writes made by this process (services.like_service) update
+cached sets after they commit. Writes it cannot see, from other worker
+processes or raw SQL, are picked up when an entry is reloaded, at the
+latest CacheSettings.USER_LIKED_SET_TTL_SECONDS after it was loaded.
+
+Sets hold what is committed; likes still in the write-behind buffer are
+applied on top by the callers (services.like_buffer.apply_buffered_likes).
+"""
+from sqlalchemy.orm import Session
+from typing import Iterable, Set, Tuple
+import time
+
+from core.config import CacheSettings
+from core.models import Like
+from services.lru_cache import LRUCache
+
+# user_id -> (load time, set of liked recipe ids); callers must not modify the sets
+_liked_sets = LRUCache(CacheSettings.USER_LIKED_SET_CACHE_SIZE, 'user_liked_sets')
+# Bumped by every write; a set loaded while a write committed is not cached
+_write_count = 0
+
+
+def build_user_liked_set_query(db: Session, user_id: int):
+    """All recipe ids a user has liked (served by the likes (user_id, recipe_id) index)"""
+    return db.query(Like.recipe_id).filter(Like.user_id == user_id)
+
+
+def get_user_liked_set(db: Session, user_id: int) -> Set[int]:
+    """
+    Recipe ids a user has liked, loaded with one query on a cache miss
+
+    Returns:
+        The cached set; do not modify it
+    """
+    entry = _liked_sets.get(user_id)
+    if entry is not None and time.monotonic() - entry[0] < CacheSettings.USER_LIKED_SET_TTL_SECONDS:
+        return entry[1]
+    write_count = _write_count
+    loaded_at = time.monotonic()
+    liked = {recipe_id for recipe_id, in build_user_liked_set_query(db, user_id).all()}
+    if write_count == _write_count:
+        _liked_sets.put(user_id, (loaded_at, liked))
+    return liked
+
+
+def record_like_changes(changes: Iterable[Tuple[int, int, bool]]) -> None:
+    """
+    Apply committed likes and unlikes to the cached sets
+
+    Args:
+        changes: (user_id, recipe_id, liked) per committed change
+    """
+    global _write_count
+    _write_count += 1
+    for user_id, recipe_id, liked in changes:
+        entry = _liked_sets.peek(user_id)
+        if entry is None:
+            continue
+        cached = entry[1]
+        if liked:
+            cached.add(recipe_id)
+        else:
+            cached.discard(recipe_id)
+
+
+def clear_user_liked_sets() -> None:
+    """Forget every cached set (e.g. after writes that bypassed like_service)"""
+    _liked_sets.clear()
@@ -0,0 +1,116 @@
+"""
+Shared fixtures for database-backed tests
+"""
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import get_db
+from core.models import Base, Recipe, User, DietaryRestriction, DifficultyLevel
+from services.catalog_snapshot import reset_catalog_snapshot
+from services.trending import reset_trending_scores
+from services.like_service import add_like
+from services.user_liked_cache import clear_user_liked_sets
+
+
+@pytest.fixture
+def db():
+    """Fresh in-memory SQLite session per test"""
+    engine = create_engine(
+        "sqlite://", connect_args={'check_same_thread': False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    # The catalog snapshot, liked sets and trending scores are process-wide;
+    # never carry them across databases
+    reset_catalog_snapshot()
+    reset_trending_scores()
+    clear_user_liked_sets()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def count_statements(db):
+    """SQL statements executed on the test database; clear() it to start counting"""
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.get_bind(), 'before_cursor_execute', listener)
+    try:
+        yield statements
+    finally:
+        event.remove(db.get_bind(), 'before_cursor_execute', listener)
+
+
+@pytest.fixture
+def client(db):
+    """API client bound to the in-memory test session"""
+    from main import app
+
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def make_recipe(db):
+    """Factory for persisted recipes with sensible defaults"""
+    counter = {'n': 0}
+
+    def _make_recipe(**fields):
+        counter['n'] += 1
+        values = {
+            'title': f"Recipe {counter['n']}",
+            'description': f"Description {counter['n']}",
+            'ingredients': ['salt', 'pepper'],
+            'instructions': ['Cook it'],
+            'cooking_time': 20,
+            'prep_time': 10,
+            'difficulty': DifficultyLevel.EASY,
+            'servings': 2,
+            'budget': 5.0,
+            'calories_per_serving': 400,
+            'cuisine': 'Italian',
+            'dietary_restrictions': DietaryRestriction.NONE,
+        }
+        values.update(fields)
+        values['ingredients'] = json.dumps(values['ingredients'])
+        values['instructions'] = json.dumps(values['instructions'])
+        recipe = Recipe(**values)
+        db.add(recipe)
+        db.commit()
+        db.refresh(recipe)
+        return recipe
+
+    return _make_recipe
+
+
+@pytest.fixture
+def make_user(db):
+    """Factory for persisted users"""
+    def _make_user(username):
+        user = User(username=username, email=f"{username}@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+    return _make_user
+
+
+@pytest.fixture
+def make_like(db):
+    """Factory for persisted likes"""
+    def _make_like(user, recipe):
+        like, _ = add_like(db, user.id, recipe.id)
+        return like
+
+    return _make_like
@@ -22,7 +22,7 @@ def _setup_empty_all_query_mock(mock_db):
 def _setup_popular_recipes_query_mock(mock_db, mock_recipe, like_count=5):
     """Helper to setup complex query chain for popular recipes"""
     query_chain = mock_db.query.return_value
-    query_chain.outerjoin.return_value.group_by.return_value.order_by.return_value.limit.return_value.all.return_value = [
+    query_chain.order_by.return_value.limit.return_value.all.return_value = [
         (mock_recipe, like_count)
     ]
     return mock_db
@@ -0,0 +1,164 @@
+"""
+Unit tests for the in-memory columnar catalog snapshot
+"""
+from threading import Event
+from unittest.mock import patch
+import pytest
+from core.config import CatalogSnapshotSettings
+from core.models import DietaryRestriction, Recipe
+from services import catalog_snapshot
+from services.catalog_snapshot import get_catalog_snapshot
+from services.recipe_query_service import get_filtered_recipes_page, get_recipe_page
+
+
+def _make_catalog(make_recipe, make_user, make_like):
+    users = [make_user(f"user{i}") for i in range(3)]
+    diets = [DietaryRestriction.NONE, DietaryRestriction.VEGAN, DietaryRestriction.VEGETARIAN]
+    recipes = [
+        make_recipe(
+            budget=float(i % 5) * 3,
+            cooking_time=10 + (i % 4) * 10,
+            dietary_restrictions=diets[i % 3],
+            cuisine=None if i % 7 == 0 else f"Cuisine {i % 3}",
+        )
+        for i in range(17)
+    ]
+    for i, recipe in enumerate(recipes):
+        for user in users[: i % 4]:
+            make_like(user, recipe)
+    return recipes
+
+
+def _walk_catalog(db, sort, order):
+    ids, cursor = [], None
+    while True:
+        page, cursor = get_recipe_page(db, sort=sort, order=order, limit=4, cursor=cursor)
+        ids.extend(recipe.id for recipe, _ in page)
+        if cursor is None:
+            return ids
+
+
+def _recommend(db, diet, exclude_ids=()):
+    page, total, has_more = get_filtered_recipes_page(
+        db, None, 9.0, 30, diet, limit=5, offset=2, exclude_ids=exclude_ids
+    )
+    return [recipe.id for recipe, _, _ in page], total, has_more
+
+
+@pytest.mark.parametrize("sort", ["id", "budget", "cooking_time", "likes"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_catalog_pages_match_database_path(db, make_recipe, make_user, make_like, sort, order):
+    """Test that snapshot-backed keyset pages equal the SQL keyset pages"""
+    _make_catalog(make_recipe, make_user, make_like)
+
+    from_snapshot = _walk_catalog(db, sort, order)
+    with patch.object(CatalogSnapshotSettings, 'ENABLED', False):
+        from_database = _walk_catalog(db, sort, order)
+
+    assert from_snapshot == from_database
+    assert len(from_snapshot) == 17
+
+
+@pytest.mark.parametrize("diet", [DietaryRestriction.NONE, DietaryRestriction.VEGAN])
+def test_recommendation_pages_match_database_path(db, make_recipe, make_user, make_like, diet):
+    """Test that snapshot filtering/ranking equals the SQL query, exclusions included"""
+    recipes = _make_catalog(make_recipe, make_user, make_like)
+    pinned = [recipes[1].id]  # matches both filters, as pinned picks must
+
+    from_snapshot = _recommend(db, diet, pinned)
+    with patch.object(CatalogSnapshotSettings, 'ENABLED', False):
+        from_database = _recommend(db, diet, pinned)
+
+    assert from_snapshot == from_database
+
+
+def test_chunked_ranking_walk_matches_database_path(db, make_recipe, make_user, make_like):
+    """Test that pages found over several walk chunks, and their totals, equal the SQL path"""
+    recipes = _make_catalog(make_recipe, make_user, make_like)
+    pinned = [recipes[1].id]  # matches both filters, as pinned picks must
+
+    def pages():
+        return [
+            get_filtered_recipes_page(db, None, 9.0, 30, diet, limit=3, offset=offset, exclude_ids=exclude)[:2]
+            for diet in (DietaryRestriction.NONE, DietaryRestriction.VEGAN)
+            for offset in (0, 4)
+            for exclude in ((), pinned)
+        ]
+
+    with patch.object(catalog_snapshot, '_MIN_WALK_CHUNK', 1):
+        from_snapshot = [([r.id for r, _, _ in page], total) for page, total in pages()]
+    with patch.object(CatalogSnapshotSettings, 'ENABLED', False):
+        from_database = [([r.id for r, _, _ in page], total) for page, total in pages()]
+
+    assert from_snapshot == from_database
+
+
+def test_recipe_edits_are_patched_in(db, make_recipe):
+    """Test that inserts, updates and deletes reach the snapshot without a rebuild"""
+    recipes = [make_recipe(budget=5.0) for _ in range(3)]
+    snapshot = get_catalog_snapshot(db)
+
+    recipes[0].budget = 50.0
+    db.delete(recipes[1])
+    db.commit()
+    added = make_recipe(budget=1.0, cuisine="Thai")
+
+    with patch.object(catalog_snapshot.CatalogSnapshot, 'build') as build:
+        patched = get_catalog_snapshot(db)
+    build.assert_not_called()
+
+    assert patched is not snapshot
+    assert patched.ids.tolist() == [recipes[0].id, recipes[2].id, added.id]
+    assert patched.budget.tolist() == [50.0, 5.0, 1.0]
+    assert patched.cuisines[patched.cuisine[2]] == "Thai"
+
+
+def test_like_deltas_reorder_after_rerank_interval(db, make_recipe, make_user, make_like):
+    """Test that likes patch counts in place and re-rank once the interval allows"""
+    first, second = make_recipe(), make_recipe()
+    snapshot = get_catalog_snapshot(db)
+
+    with patch.object(CatalogSnapshotSettings, 'RERANK_INTERVAL_SECONDS', 3600):
+        make_like(make_user("alice"), second)
+        assert snapshot.like_count.tolist() == [0, 1]
+        # Ranking is allowed to lag behind the counters
+        assert snapshot.ranked_page(10.0, 60, DietaryRestriction.NONE, 2)[0] == [first.id, second.id]
+
+    with patch.object(CatalogSnapshotSettings, 'RERANK_INTERVAL_SECONDS', 0):
+        assert snapshot.ranked_page(10.0, 60, DietaryRestriction.NONE, 2)[0] == [second.id, first.id]
+
+    assert get_catalog_snapshot(db) is snapshot
+    assert db.query(Recipe).count() == 2
+
+
+def test_expired_snapshot_is_rebuilt_in_the_background(db, make_recipe, make_user, make_like):
+    """Test that requests keep the old snapshot during a rebuild and no like is lost"""
+    first, second = make_recipe(), make_recipe()
+    alice = make_user("alice")
+    snapshot = get_catalog_snapshot(db)
+    snapshot.built_at -= CatalogSnapshotSettings.MAX_AGE_SECONDS + 1
+
+    started, release = Event(), Event()
+    build = catalog_snapshot.CatalogSnapshot.build
+
+    def slow_build(*args):
+        built = build(*args)
+        started.set()
+        release.wait(5)
+        return built
+
+    with patch.object(catalog_snapshot.CatalogSnapshot, 'build', side_effect=slow_build):
+        assert get_catalog_snapshot(db) is snapshot
+        assert started.wait(5)
+        # Served stale while building; the like is not in the rows read
+        make_like(alice, second)
+        assert get_catalog_snapshot(db) is snapshot
+        assert snapshot.like_count.tolist() == [0, 1]
+        rebuild = catalog_snapshot._rebuild_thread
+        release.set()
+        rebuild.join(5)
+
+    rebuilt = get_catalog_snapshot(db)
+    assert rebuilt is not snapshot and not rebuilt.is_expired()
+    assert rebuilt.ids.tolist() == [first.id, second.id]
+    assert rebuilt.like_count.tolist() == [0, 1]
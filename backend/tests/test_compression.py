@@ -0,0 +1,33 @@
+"""
+Unit tests for gzip response compression
+"""
+from core.config import CompressionSettings
+
+
+def test_large_listing_is_gzipped(client, make_recipe):
+    """Test that bodies above the threshold are compressed when the client accepts gzip"""
+    for i in range(20):
+        make_recipe(title=f"Recipe {i}", ingredients=['tofu', 'rice', 'soy sauce'], instructions=['Cook'] * 5)
+
+    response = client.get("/api/recipes/", headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'accept-encoding' in response.headers['vary'].lower()
+    assert len(response.json()['recipes']) == 20
+
+    raw = client.get("/api/recipes/", headers={'Accept-Encoding': 'identity'})
+    assert 'content-encoding' not in raw.headers
+    assert int(response.headers['content-length']) < len(raw.content)
+
+
+def test_small_and_not_modified_responses_pass_through(client, make_recipe):
+    """Test that small bodies and 304s are sent uncompressed"""
+    make_recipe()
+    health = client.get("/health", headers={'Accept-Encoding': 'gzip'})
+    assert len(health.content) < CompressionSettings.MINIMUM_SIZE
+    assert 'content-encoding' not in health.headers
+
+    etag = client.get("/api/recipes/").headers['etag']
+    cached = client.get("/api/recipes/", headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert 'content-encoding' not in cached.headers
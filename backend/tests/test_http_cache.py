@@ -0,0 +1,109 @@
+"""
+Unit tests for ETags and conditional GET on catalog endpoints
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from core.config import HttpCacheSettings
+from services.catalog_state import get_stored_versions
+from services.like_buffer import start_like_write_buffer, stop_like_write_buffer
+
+
+def test_list_revalidates_until_catalog_or_likes_change(client, make_recipe, make_user, make_like):
+    """Test 304 on a matching If-None-Match and a new ETag after each kind of change"""
+    recipe = make_recipe()
+    user = make_user("alice")
+
+    first = client.get("/api/recipes/")
+    etag = first.headers['etag']
+    assert first.status_code == 200
+    assert first.headers['cache-control'] == f"public, max-age={HttpCacheSettings.PUBLIC_MAX_AGE_SECONDS}"
+
+    cached = client.get("/api/recipes/", headers={'If-None-Match': etag})
+    assert cached.status_code == 304 and cached.content == b''
+    assert cached.headers['etag'] == etag
+    # Weak comparison and lists of tags
+    assert client.get("/api/recipes/", headers={'If-None-Match': f'"x", {etag[2:]}'}).status_code == 304
+
+    make_like(user, recipe)
+    after_like = client.get("/api/recipes/", headers={'If-None-Match': etag})
+    assert after_like.status_code == 200 and after_like.json()['recipes'][0]['like_count'] == 1
+
+    etag = after_like.headers['etag']
+    make_recipe()
+    assert client.get("/api/recipes/", headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_per_user_responses_are_private(client, make_recipe, make_user):
+    """Test that user-specific listings are never publicly cacheable"""
+    make_recipe()
+    user = make_user("bob")
+
+    response = client.get("/api/recipes/", params={'user_id': user.id})
+    assert response.headers['cache-control'] == "private, no-cache"
+    search = client.get("/api/recipes/search", params={'q': 'recipe', 'user_id': user.id})
+    assert search.headers['cache-control'] == "private, no-cache"
+
+
+def test_detail_and_facets_ignore_likes(client, make_recipe, make_user, make_like):
+    """Test that bodies without like data keep their ETag across likes"""
+    recipe = make_recipe()
+    detail = client.get(f"/api/recipes/{recipe.id}")
+    facets = client.get("/api/recipes/facets")
+
+    make_like(make_user("carol"), recipe)
+
+    for path, response in ((f"/api/recipes/{recipe.id}", detail), ("/api/recipes/facets", facets)):
+        assert client.get(path, headers={'If-None-Match': response.headers['etag']}).status_code == 304
+
+    recipe.title = "Renamed"
+    make_recipe()
+    assert client.get(
+        f"/api/recipes/{recipe.id}", headers={'If-None-Match': detail.headers['etag']}
+    ).json()['title'] == "Renamed"
+
+
+def test_writes_outside_the_orm_change_etags(db, client, make_recipe):
+    """Test that raw SQL writes (as from maintenance commands) are seen by ETags"""
+    recipe = make_recipe()
+    listing = client.get("/api/recipes/").headers['etag']
+    detail = client.get(f"/api/recipes/{recipe.id}").headers['etag']
+
+    db.execute(text("UPDATE recipes SET like_count = 5 WHERE id = :id"), {'id': recipe.id})
+    db.commit()
+    assert client.get("/api/recipes/", headers={'If-None-Match': listing}).status_code == 200
+    assert client.get(f"/api/recipes/{recipe.id}", headers={'If-None-Match': detail}).status_code == 304
+
+    db.execute(text("UPDATE recipes SET title = 'Renamed' WHERE id = :id"), {'id': recipe.id})
+    db.commit()
+    renamed = client.get(f"/api/recipes/{recipe.id}", headers={'If-None-Match': detail})
+    assert renamed.status_code == 200 and renamed.json()['title'] == 'Renamed'
+
+
+def test_etags_come_from_stored_counters(db, client, make_recipe, make_user):
+    """Test that tags depend on database state only, plus buffered likes"""
+    recipe, alice = make_recipe(), make_user("alice")
+    recipes_version, likes_version = get_stored_versions(db)
+    listing = client.get("/api/recipes/").headers['etag']
+    assert listing == f'W/"{recipes_version}-{likes_version}"'
+    assert client.get(f"/api/recipes/{recipe.id}").headers['etag'] == f'W/"{recipes_version}"'
+
+    buffer = start_like_write_buffer(sessionmaker(bind=db.get_bind()), start_thread=False)
+    try:
+        buffer.enqueue(db, alice.id, recipe.id, liked=True)
+        buffered = client.get("/api/recipes/", headers={'If-None-Match': listing})
+        assert buffered.status_code == 200 and buffered.json()['recipes'][0]['like_count'] == 1
+        buffer.flush()
+    finally:
+        stop_like_write_buffer(flush=False)
+    assert client.get("/api/recipes/").headers['etag'] not in (listing, buffered.headers['etag'])
+
+
+def test_wildcard_precondition_on_missing_recipe(client, make_recipe):
+    """Test that If-None-Match never turns a missing recipe into a 304"""
+    recipe = make_recipe()
+    etag = client.get(f"/api/recipes/{recipe.id}").headers['etag']
+
+    assert client.get(f"/api/recipes/{recipe.id}", headers={'If-None-Match': '*'}).status_code == 304
+    assert client.get("/api/recipes/999", headers={'If-None-Match': '*'}).status_code == 404
+    assert client.get("/api/recipes/999", headers={'If-None-Match': etag}).status_code == 404
@@ -0,0 +1,41 @@
+"""
+Unit tests for the orjson response class and the routes that bypass pydantic
+"""
+import json
+from datetime import datetime
+import numpy as np
+from core.models import DietaryRestriction, DifficultyLevel
+from core.responses import FastJSONResponse
+from core.schemas import RecipeResponse
+
+
+def test_renders_datetimes_enums_and_numpy():
+    """Test the types routes hand to the response class"""
+    body = FastJSONResponse({
+        'created_at': datetime(2025, 1, 2, 3, 4, 5, 600000),
+        'dietary': DietaryRestriction.GLUTEN_FREE,
+        'difficulty': DifficultyLevel.HARD,
+        'score': np.float32(0.5),
+        'ids': np.array([1, 2]),
+        'name': 'Crème brûlée',
+    }).body
+    assert json.loads(body) == {
+        'created_at': '2025-01-02T03:04:05.600000',
+        'dietary': 'gluten_free',
+        'difficulty': 'hard',
+        'score': 0.5,
+        'ids': [1, 2],
+        'name': 'Crème brûlée',
+    }
+
+
+def test_detail_endpoint_matches_response_model(client, make_recipe):
+    """Test that the pre-encoded detail body has the RecipeResponse content"""
+    recipe = make_recipe(difficulty=DifficultyLevel.MEDIUM, dietary_restrictions=DietaryRestriction.VEGAN)
+
+    response = client.get(f"/api/recipes/{recipe.id}")
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/json'
+    assert response.json() == RecipeResponse.from_orm(recipe).model_dump(mode='json')
+
+    assert client.get("/api/recipes/999999").status_code == 404
@@ -0,0 +1,42 @@
+"""
+Unit tests for bulk like status
+"""
+from core.config import PaginationLimits
+
+
+def test_bulk_like_status_in_two_queries(db, client, make_recipe, make_user, make_like, count_statements):
+    """Test counts, membership, order and missing ids with a fixed number of queries"""
+    first, second, third = make_recipe(), make_recipe(), make_recipe()
+    alice, bob = make_user("alice"), make_user("bob")
+    make_like(alice, first)
+    make_like(bob, first)
+    make_like(bob, third)
+    ids = [third.id, 999, first.id, second.id, third.id]
+    alice_id = alice.id
+
+    statements = count_statements
+    statements.clear()
+    response = client.post("/api/recipes/likes/bulk", json={'recipe_ids': ids, 'user_id': alice_id})
+    assert response.status_code == 200
+    assert len(statements) == 2
+
+    assert response.json() == {
+        'likes': [
+            {'recipe_id': ids[0], 'like_count': 1, 'user_has_liked': False},
+            {'recipe_id': ids[2], 'like_count': 2, 'user_has_liked': True},
+            {'recipe_id': ids[3], 'like_count': 0, 'user_has_liked': False},
+        ],
+        'missing_ids': [999],
+    }
+
+
+def test_bulk_like_status_without_user_and_limits(client, make_recipe):
+    """Test anonymous requests and request size validation"""
+    recipe = make_recipe()
+
+    anonymous = client.post("/api/recipes/likes/bulk", json={'recipe_ids': [recipe.id]}).json()
+    assert anonymous['likes'] == [{'recipe_id': recipe.id, 'like_count': 0, 'user_has_liked': False}]
+
+    assert client.post("/api/recipes/likes/bulk", json={'recipe_ids': []}).status_code == 422
+    too_many = list(range(1, PaginationLimits.MAX_BATCH_SIZE + 2))
+    assert client.post("/api/recipes/likes/bulk", json={'recipe_ids': too_many}).status_code == 422
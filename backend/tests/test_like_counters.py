@@ -0,0 +1,106 @@
+"""
+Unit tests for the denormalized recipe like counter
+"""
+from core.models import Recipe, Like
+from services.like_service import add_like, remove_like, reconcile_like_counts
+
+
+def test_like_and_unlike_maintain_counter(db, make_recipe, make_user):
+    """Test that like/unlike keep Recipe.like_count equal to the likes rows"""
+    recipe = make_recipe()
+    alice, bob = make_user("alice"), make_user("bob")
+
+    _, created = add_like(db, alice.id, recipe.id)
+    assert created
+    _, created = add_like(db, alice.id, recipe.id)  # duplicate tap
+    assert not created
+    add_like(db, bob.id, recipe.id)
+
+    db.refresh(recipe)
+    assert recipe.like_count == 2
+
+    assert remove_like(db, alice.id, recipe.id)
+    assert not remove_like(db, alice.id, recipe.id)
+
+    db.refresh(recipe)
+    assert recipe.like_count == 1
+    assert db.query(Like).filter(Like.recipe_id == recipe.id).count() == 1
+
+
+def test_like_does_not_touch_updated_at(db, make_recipe, make_user):
+    """Test that counter updates are not treated as recipe edits"""
+    recipe = make_recipe()
+    updated_at = recipe.updated_at
+
+    add_like(db, make_user("alice").id, recipe.id)
+
+    db.refresh(recipe)
+    assert recipe.updated_at == updated_at
+
+
+def test_reconcile_rebuilds_drifted_counters(db, make_recipe, make_user):
+    """Test that reconciliation repairs counters in bulk"""
+    liked, unliked = make_recipe(), make_recipe()
+    add_like(db, make_user("alice").id, liked.id)
+
+    db.query(Recipe).update({Recipe.like_count: 7})
+    db.commit()
+
+    assert reconcile_like_counts(db) == 2
+    db.refresh(liked)
+    db.refresh(unliked)
+    assert (liked.like_count, unliked.like_count) == (1, 0)
+    assert reconcile_like_counts(db) == 0
+
+
+def test_like_info_endpoint_reads_counter(client, make_recipe, make_user):
+    """Test that the like info endpoint reports the denormalized count"""
+    recipe = make_recipe()
+    alice = make_user("alice")
+
+    assert client.post(f"/api/recipes/{recipe.id}/like/{alice.id}").status_code == 200
+    info = client.get(f"/api/recipes/{recipe.id}/likes/{alice.id}").json()
+
+    assert info == {'recipe_id': recipe.id, 'like_count': 1, 'user_has_liked': True}
+
+    assert client.delete(f"/api/recipes/{recipe.id}/unlike/{alice.id}").status_code == 200
+    assert client.get(f"/api/recipes/{recipe.id}/likes/{alice.id}").json()['like_count'] == 0
+
+
+def test_like_and_unlike_are_single_statements(db, make_recipe, make_user, count_statements):
+    """Test that a new like and an unlike each write with one statement plus the counter update"""
+    recipe = make_recipe()
+    alice = make_user("alice")
+    recipe_id, alice_id = recipe.id, alice.id
+
+    statements = count_statements
+    statements.clear()
+
+    like, created = add_like(db, alice_id, recipe_id)
+    assert created and like.id is not None
+    assert [sql.split()[0] for sql in statements] == ['INSERT', 'UPDATE']
+    assert 'ON CONFLICT (user_id, recipe_id) DO NOTHING' in statements[0]
+
+    statements.clear()
+    assert remove_like(db, alice_id, recipe_id)
+    assert [sql.split()[0] for sql in statements] == ['DELETE', 'UPDATE']
+
+
+def test_like_endpoints_report_missing_rows(client, make_recipe, make_user):
+    """Test 404s for unknown recipes, users and likes without writing anything"""
+    recipe = make_recipe()
+    alice = make_user("alice")
+
+    missing_recipe = client.post(f"/api/recipes/999/like/{alice.id}")
+    assert missing_recipe.status_code == 404 and missing_recipe.json()['detail'] == "Recipe not found"
+    missing_user = client.post(f"/api/recipes/{recipe.id}/like/999")
+    assert missing_user.status_code == 404 and missing_user.json()['detail'] == "User not found"
+    assert client.get(f"/api/recipes/{recipe.id}/likes/{alice.id}").json()['like_count'] == 0
+
+    first = client.post(f"/api/recipes/{recipe.id}/like/{alice.id}").json()
+    again = client.post(f"/api/recipes/{recipe.id}/like/{alice.id}").json()
+    assert again['id'] == first['id']
+
+    assert client.delete(f"/api/recipes/999/unlike/{alice.id}").json()['detail'] == "Recipe not found"
+    assert client.delete(f"/api/recipes/{recipe.id}/unlike/{alice.id}").status_code == 200
+    assert client.delete(f"/api/recipes/{recipe.id}/unlike/{alice.id}").json()['detail'] == "Like not found"
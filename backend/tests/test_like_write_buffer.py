@@ -0,0 +1,196 @@
+"""
+Unit tests for write-behind like ingestion
+"""
+import time
+from threading import Thread
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from core.config import CatalogSnapshotSettings
+from core.models import Like, Recipe
+from services import like_buffer
+from services.catalog_state import get_like_version
+from services.like_buffer import LikeWriteBuffer, start_like_write_buffer, stop_like_write_buffer
+from services.recipe_query_service import get_recipes_by_ids
+
+
+@pytest.fixture
+def buffer(db):
+    """Write-behind buffer flushed only when a test asks"""
+    try:
+        yield start_like_write_buffer(sessionmaker(bind=db.get_bind()), start_thread=False)
+    finally:
+        stop_like_write_buffer(flush=False)
+
+
+def _stored_likes(db, recipe):
+    db.expire_all()
+    return db.query(Like).filter(Like.recipe_id == recipe.id).count(), db.get(Recipe, recipe.id).like_count
+
+
+def _like_info(client, recipe, user):
+    return client.get(f"/api/recipes/{recipe.id}/likes/{user.id}").json()
+
+
+def test_buffered_like_is_visible_before_flush(db, client, buffer, make_recipe, make_user):
+    """Test that reads include a queued like and the flush writes it"""
+    recipe, other = make_recipe(), make_recipe()
+    alice = make_user("alice")
+
+    response = client.post(f"/api/recipes/{recipe.id}/like/{alice.id}")
+    assert response.status_code == 202
+    assert response.json() == {'recipe_id': recipe.id, 'user_id': alice.id, 'liked': True, 'changed': True}
+    assert not client.post(f"/api/recipes/{recipe.id}/like/{alice.id}").json()['changed']
+    assert _stored_likes(db, recipe) == (0, 0)
+
+    def reads():
+        bulk = client.post("/api/recipes/likes/bulk", json={'recipe_ids': [recipe.id, other.id], 'user_id': alice.id})
+        return (
+            _like_info(client, recipe, alice),
+            bulk.json()['likes'],
+            [row['id'] for row in client.get(f"/api/recipes/liked/{alice.id}").json()],
+            [record.like_count for record in get_recipes_by_ids(db, [recipe.id, other.id])],
+        )
+
+    expected = (
+        {'recipe_id': recipe.id, 'like_count': 1, 'user_has_liked': True},
+        [
+            {'recipe_id': recipe.id, 'like_count': 1, 'user_has_liked': True},
+            {'recipe_id': other.id, 'like_count': 0, 'user_has_liked': False},
+        ],
+        [recipe.id],
+        [1, 0],
+    )
+    assert reads() == expected
+
+    assert buffer.flush() == 1
+    assert buffer.pending_count() == 0
+    assert _stored_likes(db, recipe) == (1, 1)
+    assert reads() == expected
+
+
+def test_buffered_unlike_and_coalescing(db, client, buffer, make_recipe, make_user, make_like):
+    """Test that an unlike hides a stored like and opposite changes cancel out"""
+    recipe = make_recipe()
+    alice, bob = make_user("alice"), make_user("bob")
+    make_like(alice, recipe)
+
+    assert client.delete(f"/api/recipes/{recipe.id}/unlike/{alice.id}").status_code == 202
+    assert _like_info(client, recipe, alice) == {'recipe_id': recipe.id, 'like_count': 0, 'user_has_liked': False}
+    assert client.get(f"/api/recipes/liked/{alice.id}").json() == []
+    assert client.delete(f"/api/recipes/{recipe.id}/unlike/{alice.id}").status_code == 404
+
+    # Liked and unliked again before a flush: nothing to write
+    client.post(f"/api/recipes/{recipe.id}/like/{bob.id}")
+    client.delete(f"/api/recipes/{recipe.id}/unlike/{bob.id}")
+    assert buffer.pending_count() == 1
+
+    assert buffer.flush() == 1
+    assert _stored_likes(db, recipe) == (0, 0)
+
+
+def test_buffered_likes_reorder_like_rankings(db, client, buffer, make_recipe, make_user):
+    """Test that like orderings count queued likes once, before and after the flush"""
+    first, second = make_recipe(), make_recipe()
+    alice = make_user("alice")
+
+    def most_liked():
+        recipes = client.get("/api/recipes/?sort=likes&order=desc").json()['recipes']
+        return [(recipe['id'], recipe['like_count']) for recipe in recipes]
+
+    with patch.object(CatalogSnapshotSettings, 'RERANK_INTERVAL_SECONDS', 0):
+        assert most_liked() == [(second.id, 0), (first.id, 0)]
+        client.post(f"/api/recipes/{first.id}/like/{alice.id}")
+        assert most_liked() == [(first.id, 1), (second.id, 0)]
+
+        version = get_like_version()
+        assert buffer.flush() == 1
+        assert get_like_version() > version
+        assert most_liked() == [(first.id, 1), (second.id, 0)]
+
+
+def test_buffered_like_reports_missing_rows(client, buffer, make_recipe, make_user):
+    """Test that unknown recipes and users are still rejected up front"""
+    recipe, alice = make_recipe(), make_user("alice")
+
+    missing_recipe = client.post(f"/api/recipes/999/like/{alice.id}")
+    assert (missing_recipe.status_code, missing_recipe.json()['detail']) == (404, "Recipe not found")
+    missing_user = client.post(f"/api/recipes/{recipe.id}/like/999")
+    assert (missing_user.status_code, missing_user.json()['detail']) == (404, "User not found")
+    assert buffer.pending_count() == 0
+
+
+def test_failed_flush_keeps_changes(db, client, buffer, make_recipe, make_user, monkeypatch):
+    """Test that a failed batch goes back in the queue and later changes still apply"""
+    recipe, alice = make_recipe(), make_user("alice")
+    client.post(f"/api/recipes/{recipe.id}/like/{alice.id}")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(like_buffer, 'write_like_batch', fail)
+    assert buffer.flush() == 0
+    assert buffer.pending_count() == 1
+    assert _like_info(client, recipe, alice)['like_count'] == 1
+
+    monkeypatch.undo()
+    assert buffer.flush() == 1
+    assert _stored_likes(db, recipe) == (1, 1)
+
+
+def test_reads_and_likes_do_not_wait_for_a_flush(db, buffer, make_recipe, make_user, monkeypatch):
+    """Test that the buffer lock is free while a flush is writing"""
+    recipe, other = make_recipe(), make_recipe()
+    alice, bob = make_user("alice"), make_user("bob")
+    buffer.enqueue(db, alice.id, recipe.id, liked=True)
+    seen = {}
+
+    def write_while_reading(*args, **kwargs):
+        def read_and_like():
+            seen['delta'] = buffer.count_delta(recipe.id)
+            seen['queued'] = buffer.enqueue(db, bob.id, other.id, liked=True)
+
+        # Would deadlock (and time out) if the flush held the buffer lock
+        reader = Thread(target=read_and_like)
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+        write_like_batch(*args, **kwargs)
+
+    write_like_batch = like_buffer.write_like_batch
+    monkeypatch.setattr(like_buffer, 'write_like_batch', write_while_reading)
+    assert buffer.flush() == 1
+    assert seen == {'delta': 1, 'queued': True}
+    assert buffer.count_deltas([recipe.id, other.id]) == {other.id: 1}
+    assert _stored_likes(db, recipe) == (1, 1)
+
+
+def test_stop_flushes_pending_likes(db, make_recipe, make_user):
+    """Test that a graceful stop writes what is still queued"""
+    recipe, alice = make_recipe(), make_user("alice")
+    buffer = start_like_write_buffer(sessionmaker(bind=db.get_bind()), start_thread=False)
+    buffer.enqueue(db, alice.id, recipe.id, liked=True)
+
+    stop_like_write_buffer(flush=True)
+    assert like_buffer.get_like_write_buffer() is None
+    assert _stored_likes(db, recipe) == (1, 1)
+
+
+def test_background_flush_on_event_threshold(db, make_recipe, make_user):
+    """Test that the flush thread writes once enough changes are waiting"""
+    recipes, alice = [make_recipe() for _ in range(3)], make_user("alice")
+    buffer = LikeWriteBuffer(sessionmaker(bind=db.get_bind()), flush_interval_ms=60_000, max_pending=3)
+    buffer.start()
+    try:
+        for recipe in recipes:
+            buffer.enqueue(db, alice.id, recipe.id, liked=True)
+        deadline = time.monotonic() + 5
+        while buffer.pending_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        buffer.stop(flush=False)
+
+    assert buffer.pending_count() == 0
+    assert [_stored_likes(db, recipe) for recipe in recipes] == [(1, 1)] * 3
@@ -0,0 +1,114 @@
+"""
+Unit tests for pantry matching over ingredient bitsets
+"""
+from unittest.mock import patch
+import pytest
+from core.config import CatalogSnapshotSettings
+from core.models import DietaryRestriction
+from services import catalog_snapshot, pantry_index
+from services.catalog_snapshot import get_catalog_snapshot
+from services.pantry_index import get_ingredient_bitsets, match_pantry
+
+
+@pytest.fixture(params=[True, False], ids=['bitsets', 'sql'])
+def snapshot_enabled(request):
+    """Run a test against the bitset index and the SQL fallback"""
+    with patch.object(CatalogSnapshotSettings, 'ENABLED', request.param):
+        yield request.param
+
+
+def test_ranks_by_coverage_then_missing(db, make_recipe, snapshot_enabled):
+    """Test coverage/missing counts and the ranking they drive"""
+    omelette = make_recipe(ingredients=['Eggs', 'butter', 'salt', 'salt'])
+    fried_rice = make_recipe(ingredients=['rice', 'eggs', 'soy sauce', 'scallions', 'salt'])
+    toast = make_recipe(ingredients=['bread', 'butter'])
+    make_recipe(ingredients=['pasta'])
+
+    page, total, unknown = match_pantry(db, ['eggs', 'SALT', 'butter', 'truffle'])
+
+    # Repeated and differently-cased ingredients count once
+    assert page == [
+        (omelette.id, 3, 0),
+        (fried_rice.id, 2, 3),
+        (toast.id, 1, 1),
+    ]
+    assert total == 3
+    assert unknown == ['truffle']
+
+    page, total, _ = match_pantry(db, ['eggs', 'salt', 'butter'], min_coverage=2, limit=1, offset=1)
+    assert page == [(fried_rice.id, 2, 3)] and total == 2
+
+
+def test_ingredient_names_normalize_alike(db, make_recipe, snapshot_enabled):
+    """Test that both paths treat case and inner whitespace variants as one ingredient"""
+    recipe = make_recipe(ingredients=['Olive  Oil', 'olive oil', 'salt'])
+
+    page, total, unknown = match_pantry(db, ['OLIVE oil'])
+    assert (page, total, unknown) == ([(recipe.id, 1, 1)], 1, [])
+
+
+def test_filters_apply(db, make_recipe, snapshot_enabled):
+    """Test that budget, time and diet filters restrict the matches"""
+    cheap = make_recipe(ingredients=['tofu'], budget=3.0, dietary_restrictions=DietaryRestriction.VEGAN)
+    make_recipe(ingredients=['tofu'], budget=30.0, dietary_restrictions=DietaryRestriction.VEGAN)
+    make_recipe(ingredients=['tofu'], budget=3.0, cooking_time=90)
+    make_recipe(ingredients=['tofu'], budget=3.0)
+
+    page, total, _ = match_pantry(
+        db, ['tofu'], budget=10.0, cooking_time=30,
+        dietary_restrictions=DietaryRestriction.VEGAN
+    )
+    assert [recipe_id for recipe_id, _, _ in page] == [cheap.id] and total == 1
+
+
+def test_bitsets_follow_catalog_changes(db, make_recipe):
+    """Test that recipe edits patch the bitsets, including new vocabulary words"""
+    first = make_recipe(ingredients=['flour', 'eggs'])
+    get_ingredient_bitsets(db)
+
+    first.ingredients = '["flour", "milk"]'
+    db.commit()
+    # More than one 64-bit word of new ingredients
+    spices = [f"spice {i}" for i in range(70)]
+    second = make_recipe(ingredients=['milk'] + spices)
+
+    with patch.object(pantry_index.IngredientBitsets, 'build', wraps=pantry_index.IngredientBitsets.build) as build:
+        page, total, _ = match_pantry(db, ['milk', 'eggs', 'spice 69'])
+    # Only the changed recipes were loaded
+    assert build.call_args.args[3] == [first.id, second.id]
+
+    assert page == [(second.id, 2, 69), (first.id, 1, 1)]
+
+
+def test_pantry_match_endpoint(client, make_recipe):
+    """Test /api/recipes/pantry-match results and validation"""
+    recipe = make_recipe(ingredients=['tofu', 'rice'])
+
+    response = client.get("/api/recipes/pantry-match", params={"ingredients": "tofu, kale"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [r['id'] for r in body['recipes']] == [recipe.id]
+    assert body['recipes'][0]['pantry_match'] == {'covered': 1, 'missing': 1}
+    assert body['unknown_ingredients'] == ['kale']
+    assert body['total_count'] == 1 and body['pagination']['has_more'] is False
+
+    assert client.get("/api/recipes/pantry-match", params={"ingredients": " , "}).status_code == 400
+    assert client.get("/api/recipes/pantry-match").status_code == 422
+
+
+def test_background_rebuild_carries_bitsets(db, make_recipe):
+    """Test that a MAX_AGE rebuild builds the bitsets before it is swapped in"""
+    recipe = make_recipe(ingredients=['tofu', 'rice'])
+    snapshot, _ = get_ingredient_bitsets(db)
+    snapshot.built_at -= CatalogSnapshotSettings.MAX_AGE_SECONDS + 1
+
+    assert get_catalog_snapshot(db) is snapshot
+    rebuild = catalog_snapshot._rebuild_thread
+    if rebuild is not None:
+        rebuild.join(5)
+    rebuilt = get_catalog_snapshot(db)
+    assert rebuilt is not snapshot and rebuilt.ingredient_bitsets is not None
+
+    with patch.object(pantry_index.IngredientBitsets, 'build') as build:
+        assert match_pantry(db, ['tofu'])[0] == [(recipe.id, 1, 1)]
+    build.assert_not_called()
@@ -0,0 +1,58 @@
+"""
+Unit tests for the parsed recipe JSON cache
+"""
+from unittest.mock import patch
+from sqlalchemy import text
+from core import json_columns
+from services import parsed_recipe_cache
+from services.lru_cache import LRUCache
+from services.parsed_recipe_cache import get_parsed_fields
+from services.recipe_serializer import serialize_recipe_listing
+
+
+def test_recipe_parsed_once_per_version(db, make_recipe):
+    """Test that all serializers share one parse until the recipe changes"""
+    parsed_recipe_cache._parsed_recipe_cache.clear()
+    recipe = make_recipe(ingredients=['tofu', 'rice'], instructions=['Boil', 'Serve'])
+
+    with patch.object(json_columns.json, 'loads', wraps=json_columns.json.loads) as loads:
+        assert serialize_recipe_listing(recipe, 0, False)['ingredients'] == ['tofu', 'rice']
+        assert get_parsed_fields(recipe)[1] == ['Boil', 'Serve']
+        assert loads.call_count == 2
+
+        # Callers get their own lists
+        get_parsed_fields(recipe)[0].append('salt')
+        assert get_parsed_fields(recipe)[0] == ['tofu', 'rice']
+
+        recipe.ingredients = '["noodles"]'
+        db.commit()
+        assert get_parsed_fields(recipe)[0] == ['noodles']
+        assert loads.call_count == 4
+
+
+def test_writes_that_skip_updated_at_are_not_served_stale(db, make_recipe):
+    """Test that a cached entry is only used while the raw JSON still matches"""
+    recipe = make_recipe(ingredients=['tofu'])
+    get_parsed_fields(recipe)
+
+    db.execute(text("UPDATE recipes SET ingredients = '[\"tempeh\"]' WHERE id = :id"), {'id': recipe.id})
+    db.commit()
+    assert get_parsed_fields(recipe)[0] == ['tempeh']
+
+    recipe.ingredients = '{"not": "a list"}'
+    db.commit()
+    assert get_parsed_fields(recipe) == ([], ['Cook it'])
+
+
+def test_cache_metrics_reported(client, make_recipe):
+    """Test hit/miss/eviction counters and their /health/caches endpoint"""
+    cache = LRUCache(2)
+    with patch.object(parsed_recipe_cache, '_parsed_recipe_cache', cache):
+        recipes = [make_recipe() for _ in range(3)]
+        for recipe in recipes + recipes[-1:]:
+            get_parsed_fields(recipe)
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 1)
+
+    stats = client.get("/health/caches").json()
+    assert {'parsed_recipes', 'facets', 'filter_counts', 'search_results'} <= stats.keys()
+    assert set(stats['parsed_recipes']) == {'size', 'maxsize', 'hits', 'misses', 'evictions'}
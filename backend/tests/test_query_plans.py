@@ -0,0 +1,30 @@
+"""
+Unit tests for the hot query plan check
+"""
+from core.models import Recipe, DietaryRestriction
+from services.query_plan_check import check_hot_query_plans, explain_query_plan, is_full_scan
+from services.recipe_query_service import build_filtered_recipes_query
+
+
+def test_hot_queries_use_indexes(db):
+    """Test that no hot recipe/like query falls back to a full table scan"""
+    assert check_hot_query_plans(db) == []
+
+
+def test_full_scan_is_detected(db):
+    """Test that an unindexed predicate is reported as a full scan"""
+    plan = explain_query_plan(db, db.query(Recipe).filter(Recipe.description == 'x'))
+
+    assert any(is_full_scan(detail) for detail in plan)
+    assert not is_full_scan('SEARCH likes USING COVERING INDEX ix_likes_recipe_user (recipe_id=?)')
+    assert not is_full_scan('SCAN likes USING COVERING INDEX ix_likes_recipe_user')
+
+
+def test_recommendation_filter_uses_composite_index(db):
+    """Test that diet equality and budget range are both served by one index"""
+    plan = explain_query_plan(
+        db, build_filtered_recipes_query(db, 20.0, 30, DietaryRestriction.VEGAN)
+    )
+
+    assert any('ix_recipes_diet_budget_time' in detail for detail in plan)
+    assert any('budget<' in detail for detail in plan)
@@ -0,0 +1,40 @@
+"""
+Unit tests for the bulk recipe fetch endpoint
+"""
+from sqlalchemy import event
+from core.config import PaginationLimits
+
+
+def test_batch_returns_recipes_in_request_order_with_likes(db, client, make_recipe, make_user, make_like):
+    """Test order, like info, missing ids and the fixed number of queries"""
+    user = make_user("alice")
+    first, second, third = (make_recipe() for _ in range(3))
+    make_like(user, second)
+    first, second, third, user = first.id, second.id, third.id, user.id
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.get_bind(), 'before_cursor_execute', listener)
+    try:
+        response = client.post("/api/recipes/batch", json={
+            'recipe_ids': [third, 999, second, third, first],
+            'user_id': user,
+        })
+    finally:
+        event.remove(db.get_bind(), 'before_cursor_execute', listener)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r['id'] for r in body['recipes']] == [third, second, first]
+    assert [r['user_has_liked'] for r in body['recipes']] == [False, True, False]
+    assert body['recipes'][1]['like_count'] == 1
+    assert body['missing_ids'] == [999]
+    # One IN query for the recipes, one for the user's likes
+    assert len(statements) == 2
+
+
+def test_batch_validates_id_list(client):
+    """Test that empty and oversized id lists are rejected"""
+    assert client.post("/api/recipes/batch", json={'recipe_ids': []}).status_code == 422
+    too_many = list(range(PaginationLimits.MAX_BATCH_SIZE + 1))
+    assert client.post("/api/recipes/batch", json={'recipe_ids': too_many}).status_code == 422
@@ -0,0 +1,94 @@
+"""
+Unit tests for the streaming catalog export
+"""
+import csv
+import io
+import json
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from core.models import Base, Recipe
+from services.recipe_export import iter_recipe_export
+
+
+def test_ndjson_export_streams_every_recipe_in_id_order(client, make_recipe, make_user, make_like):
+    """Test one JSON object per line, full fields plus like_count"""
+    first = make_recipe(title="Tofu bowl", ingredients=['tofu', 'rice'])
+    second = make_recipe()
+    make_like(make_user("alice"), second)
+
+    response = client.get("/api/recipes/export")
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert 'recipes.ndjson' in response.headers['content-disposition']
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line['id'] for line in lines] == [first.id, second.id]
+    assert lines[0]['title'] == "Tofu bowl"
+    assert lines[0]['ingredients'] == ['tofu', 'rice']
+    assert lines[0]['difficulty'] == 'easy'
+    assert [line['like_count'] for line in lines] == [0, 1]
+    assert 'user_has_liked' not in lines[0]
+
+
+def test_csv_export_with_fields(client, make_recipe):
+    """Test the header row, projected columns and JSON-encoded list cells"""
+    recipe = make_recipe(title="Soup, hot", ingredients=['leek'])
+
+    response = client.get("/api/recipes/export", params={'format': 'csv', 'fields': 'title,ingredients'})
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/csv')
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows == [
+        ['id', 'title', 'ingredients', 'like_count'],
+        [str(recipe.id), "Soup, hot", '["leek"]', '0'],
+    ]
+
+
+def test_export_rejects_unknown_format_and_fields(client):
+    """Test that bad parameters fail before streaming starts"""
+    assert client.get("/api/recipes/export", params={'format': 'xml'}).status_code == 400
+    assert client.get("/api/recipes/export", params={'fields': 'secret'}).status_code == 400
+
+
+def test_export_yields_one_chunk_per_batch(db, make_recipe):
+    """Test that rows are fetched and encoded in batches rather than all at once"""
+    for _ in range(5):
+        make_recipe()
+
+    chunks = list(iter_recipe_export(db, 'ndjson', ('id', 'title'), batch_size=2))
+    assert [chunk.count(b'\n') for chunk in chunks] == [2, 2, 1]
+
+    with pytest.raises(ValueError):
+        iter_recipe_export(db, 'xml')
+
+
+def test_export_does_not_block_writers(tmp_path):
+    """Test that another session can commit while an export is mid-stream"""
+    # A file database: the shared in-memory one has a single connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}", connect_args={'timeout': 0})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as setup:
+        setup.add_all(
+            Recipe(title=title, description=title, ingredients='[]', instructions='[]',
+                   cooking_time=10, budget=1.0)
+            for title in 'abc'
+        )
+        setup.commit()
+
+    reader, writer = Session(), Session()
+    try:
+        chunks = iter_recipe_export(reader, 'ndjson', ('id', 'title'), batch_size=2)
+        first = next(chunks)
+        writer.execute(text("UPDATE recipes SET title = 'changed' WHERE id = 3"))
+        writer.commit()
+        rows = [json.loads(line) for line in (first + b''.join(chunks)).splitlines()]
+    finally:
+        reader.close()
+        writer.close()
+        engine.dispose()
+
+    assert [row['title'] for row in rows] == ['a', 'b', 'changed']
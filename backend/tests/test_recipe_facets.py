@@ -0,0 +1,79 @@
+"""
+Unit tests for recipe facet counts
+"""
+from unittest.mock import patch
+from core.models import DietaryRestriction, DifficultyLevel
+from services import facet_service
+from services.facet_service import get_recipe_facets
+
+
+def _counts(facet):
+    return {entry['value']: entry['count'] for entry in facet if entry['count']}
+
+
+def _bucket_counts(facet):
+    return [entry['count'] for entry in facet]
+
+
+def _make_catalog(make_recipe):
+    make_recipe(cuisine='Italian', budget=5.0, cooking_time=15)
+    make_recipe(cuisine='Italian', budget=12.0, cooking_time=40, difficulty=DifficultyLevel.HARD)
+    make_recipe(cuisine='Thai', budget=8.0, cooking_time=30, dietary_restrictions=DietaryRestriction.VEGAN)
+    make_recipe(cuisine='Thai', budget=40.0, cooking_time=120, dietary_restrictions=DietaryRestriction.VEGAN,
+                difficulty=DifficultyLevel.MEDIUM)
+    make_recipe(cuisine='Mexican', budget=19.0, cooking_time=25, dietary_restrictions=DietaryRestriction.KETO)
+
+
+def test_facet_counts_snapshot_and_query_agree(db, make_recipe):
+    """Test every facet histogram, on both the snapshot and the SQL path"""
+    _make_catalog(make_recipe)
+
+    facets = get_recipe_facets(db)
+    assert facets['total_count'] == 5
+    assert [entry['value'] for entry in facets['cuisine']] == ['Italian', 'Thai', 'Mexican']
+    assert _counts(facets['dietary_restrictions']) == {'none': 2, 'vegan': 2, 'keto': 1}
+    assert _counts(facets['difficulty']) == {'easy': 3, 'medium': 1, 'hard': 1}
+    # Upper bounds are inclusive: 5.0 falls in the first bucket
+    assert facets['budget'][0] == {'min': None, 'max': 5.0, 'count': 1}
+    assert _bucket_counts(facets['budget']) == [1, 1, 1, 1, 0, 1]
+    assert _bucket_counts(facets['cooking_time']) == [1, 2, 1, 0, 0, 1]
+
+    filtered = get_recipe_facets(db, budget=20.0, dietary_restrictions=DietaryRestriction.VEGAN)
+    assert filtered['total_count'] == 1
+    assert _counts(filtered['cuisine']) == {'Thai': 1}
+    assert _counts(filtered['difficulty']) == {'easy': 1}
+
+    facet_service._facet_cache.clear()
+    with patch.object(facet_service.CatalogSnapshotSettings, 'ENABLED', False):
+        assert get_recipe_facets(db) == facets
+        assert get_recipe_facets(db, budget=20.0, dietary_restrictions=DietaryRestriction.VEGAN) == filtered
+
+
+def test_facets_cached_per_filter_and_catalog_version(db, make_recipe):
+    """Test that repeated filters hit the cache until the catalog changes"""
+    _make_catalog(make_recipe)
+    facet_service._facet_cache.clear()
+
+    with patch.object(facet_service, '_snapshot_facets', wraps=facet_service._snapshot_facets) as compute:
+        get_recipe_facets(db, cooking_time=30)
+        get_recipe_facets(db, cooking_time=30)
+        assert compute.call_count == 1
+
+        make_recipe(cuisine='Thai', cooking_time=10)
+        assert _counts(get_recipe_facets(db, cooking_time=30)['cuisine']) == {
+            'Italian': 1, 'Thai': 2, 'Mexican': 1
+        }
+        assert compute.call_count == 2
+
+
+def test_facets_endpoint(client, make_recipe):
+    """Test /api/recipes/facets and its diet validation"""
+    _make_catalog(make_recipe)
+
+    response = client.get("/api/recipes/facets", params={"max_cooking_time": 30})
+    assert response.status_code == 200
+    body = response.json()
+    assert body['total_count'] == 3
+    assert _counts(body['dietary_restrictions']) == {'none': 1, 'vegan': 1, 'keto': 1}
+
+    assert client.get("/api/recipes/facets", params={"dietary_restrictions": "paleo-ish"}).status_code == 400
@@ -0,0 +1,60 @@
+"""
+Unit tests for pre-encoded recipe listing fragments
+"""
+import json
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+from services import recipe_serializer
+from services.recipe_serializer import (
+    encode_listing_response,
+    encode_recipe_listing,
+    encode_recipe_listings,
+    serialize_recipe_listing
+)
+
+
+def test_encoded_listing_matches_serialized_dict(db, make_recipe):
+    """Test that spliced bytes decode to the same listing as the dict serializer"""
+    recipe = make_recipe(title='Crème brûlée "classic"', cuisine=None, ingredients=['sugar', 'crème'])
+
+    for like_count, liked in ((0, False), (7, True)):
+        encoded = json.loads(encode_recipe_listing(recipe, like_count, liked))
+        assert encoded == jsonable_encoder(serialize_recipe_listing(recipe, like_count, liked))
+
+    encoded = json.loads(encode_recipe_listing(recipe, 1, False, pantry_match={'covered': 1, 'missing': 0}))
+    assert encoded['pantry_match'] == {'covered': 1, 'missing': 0} and encoded['like_count'] == 1
+
+    body = json.loads(encode_listing_response(
+        encode_recipe_listings([(recipe, 3, True), (recipe, 4, False)]), pagination={'has_more': False}
+    ))
+    assert [r['like_count'] for r in body['recipes']] == [3, 4]
+    assert body['pagination'] == {'has_more': False}
+    assert json.loads(encode_recipe_listings([])) == []
+
+
+def test_fragment_reused_until_recipe_changes(db, make_recipe):
+    """Test that static fields are encoded once per recipe version"""
+    recipe_serializer._listing_fragment_cache.clear()
+    recipe = make_recipe(title='Soup')
+
+    encode_recipe_listing(recipe, 0, False)
+    encode_recipe_listing(recipe, 1, True)
+    assert len(recipe_serializer._listing_fragment_cache) == 1
+
+    recipe.title = 'Stew'
+    db.commit()
+    assert json.loads(encode_recipe_listing(recipe, 0, False))['title'] == 'Stew'
+
+
+def test_fragment_not_reused_after_raw_update(db, make_recipe):
+    """Test that a write bypassing the ORM (same updated_at) is not served stale"""
+    recipe_serializer._listing_fragment_cache.clear()
+    recipe = make_recipe(title='Soup', ingredients=['water'])
+    assert json.loads(encode_recipe_listing(recipe, 0, False))['title'] == 'Soup'
+
+    db.execute(text("UPDATE recipes SET title = 'Broth', ingredients = '[\"stock\"]' WHERE id = :id"),
+               {'id': recipe.id})
+    db.commit()
+    encoded = json.loads(encode_recipe_listing(recipe, 0, False))
+    assert encoded['title'] == 'Broth' and encoded['ingredients'] == ['stock']
+    assert len(recipe_serializer._listing_fragment_cache) == 2
@@ -0,0 +1,75 @@
+"""
+Unit tests for the normalized recipe_ingredients table
+"""
+from core.database import ensure_ingredient_index
+from core.models import RecipeIngredient
+from core.schemas import ShoppingListCreate
+from services.ingredient_service import (
+    find_recipe_ids_by_ingredients,
+    get_recipe_ingredient_names,
+    rebuild_recipe_ingredients
+)
+from services.shopping_service import create_list_from_recipes
+
+
+def test_writes_keep_both_representations_consistent(db, make_recipe):
+    """Test that inserts, updates and deletes on recipes are mirrored by the triggers"""
+    recipe = make_recipe(ingredients=['tofu', ' salt ', 'rice', 'salt'])
+    assert get_recipe_ingredient_names(db, [recipe.id]) == {recipe.id: ['tofu', 'salt', 'rice', 'salt']}
+
+    recipe.ingredients = '["noodles", "tofu"]'
+    db.commit()
+    assert get_recipe_ingredient_names(db, [recipe.id]) == {recipe.id: ['noodles', 'tofu']}
+
+    recipe.ingredients = 'not json'
+    db.commit()
+    assert get_recipe_ingredient_names(db, [recipe.id]) == {}
+
+    recipe.ingredients = '["tofu"]'
+    db.commit()
+    db.delete(recipe)
+    db.commit()
+    assert db.query(RecipeIngredient).count() == 0
+
+
+def test_find_recipes_by_ingredients(db, make_recipe):
+    """Test all/any ingredient lookups through the inverted index"""
+    tofu_rice = make_recipe(ingredients=['tofu', 'rice'])
+    tofu = make_recipe(ingredients=['tofu', 'soy sauce'])
+    make_recipe(ingredients=['pasta'])
+
+    assert find_recipe_ids_by_ingredients(db, ['tofu']) == [tofu_rice.id, tofu.id]
+    assert find_recipe_ids_by_ingredients(db, ['tofu', 'rice']) == [tofu_rice.id]
+    assert find_recipe_ids_by_ingredients(db, ['rice', 'soy sauce'], match_all=False) == [tofu_rice.id, tofu.id]
+    assert find_recipe_ids_by_ingredients(db, ['tofu', 'unicorn']) == []
+
+
+def test_migration_backfills_existing_recipes(db, make_recipe):
+    """Test that the one-shot migration and the rebuild re-derive rows from JSON"""
+    first = make_recipe(ingredients=['eggs', 'flour'])
+    second = make_recipe(ingredients=['milk', 'flour'])
+    expected = get_recipe_ingredient_names(db)
+
+    db.query(RecipeIngredient).delete()
+    db.commit()
+    ensure_ingredient_index(db.get_bind())
+    assert get_recipe_ingredient_names(db) == expected
+
+    assert rebuild_recipe_ingredients(db) == 4
+    assert get_recipe_ingredient_names(db) == {
+        first.id: ['eggs', 'flour'], second.id: ['milk', 'flour']
+    }
+
+
+def test_shopping_list_consolidates_from_recipe_ingredients(db, make_recipe, make_user):
+    """Test that shopping lists count ingredients per recipe occurrence"""
+    user = make_user("alice")
+    pancakes = make_recipe(ingredients=['flour', 'eggs', 'milk'])
+    bread = make_recipe(ingredients=['flour', 'salt'])
+
+    shopping_list = create_list_from_recipes(
+        db, user.id, ShoppingListCreate(name="Week", recipe_ids=[pancakes.id, bread.id, pancakes.id])
+    )
+
+    quantities = {item.ingredient: item.quantity for item in shopping_list.items}
+    assert quantities == {'flour': '3', 'eggs': '2', 'milk': '2', 'salt': '1'}
@@ -0,0 +1,92 @@
+"""
+Unit tests for keyset pagination of the recipe catalog
+"""
+import pytest
+from services.recipe_query_service import get_recipe_page, encode_cursor, decode_cursor
+
+
+def _collect_pages(db, sort, order, limit):
+    """Walk every page with the cursor and return the recipe ids in order"""
+    ids, cursor = [], None
+    while True:
+        page, cursor = get_recipe_page(db, sort=sort, order=order, limit=limit, cursor=cursor)
+        ids.extend(recipe.id for recipe, _ in page)
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("sort", ["id", "budget", "cooking_time", "likes"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_cursor_pages_cover_catalog_in_stable_order(db, make_recipe, make_user, make_like, sort, order):
+    """Test that walking the cursor visits every recipe once in (sort, id) order"""
+    users = [make_user(f"user{i}") for i in range(3)]
+    # Duplicate sort values force the id tie-breaker to matter
+    recipes = [
+        make_recipe(budget=float(i % 3), cooking_time=10 + (i % 4) * 5)
+        for i in range(11)
+    ]
+    for i, recipe in enumerate(recipes):
+        for user in users[: i % 4]:
+            make_like(user, recipe)
+
+    ids = _collect_pages(db, sort, order, limit=4)
+
+    like_counts = {recipe.id: min(i % 4, 3) for i, recipe in enumerate(recipes)}
+    if sort == 'likes':
+        key = lambda r: (like_counts[r.id], r.id)
+    else:
+        key = lambda r: (getattr(r, sort), r.id)
+    expected = [r.id for r in sorted(recipes, key=key, reverse=(order == 'desc'))]
+
+    assert ids == expected
+
+
+def test_cursor_rejects_other_sort_order():
+    """Test that a cursor issued for one ordering cannot be replayed on another"""
+    cursor = encode_cursor('budget', 'asc', 4.5, 12)
+
+    assert decode_cursor(cursor, 'budget', 'asc') == (4.5, 12)
+    assert decode_cursor(encode_cursor('budget', 'asc', 4, 12), 'budget', 'asc') == (4, 12)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 'cooking_time', 'asc')
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", 'budget', 'asc')
+
+
+@pytest.mark.parametrize("sort, sort_value, recipe_id", [
+    ('budget', "4.5", 12),
+    ('likes', True, 12),
+    ('likes', [1], 12),
+    ('id', 3.5, 12),
+    ('budget', 4.5, "12"),
+    ('budget', 4.5, False),
+])
+def test_cursor_rejects_values_of_the_wrong_type(sort, sort_value, recipe_id):
+    """Test that tampered cursors with non-numeric values are rejected"""
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(sort, 'asc', sort_value, recipe_id), sort, 'asc')
+
+
+def test_list_endpoint_returns_page_and_next_cursor(client, make_recipe):
+    """Test that /api/recipes/ returns a bounded page with a usable cursor"""
+    for _ in range(5):
+        make_recipe()
+
+    first = client.get("/api/recipes/", params={"limit": 3}).json()
+    assert len(first['recipes']) == 3
+    assert first['pagination']['has_more'] is True
+
+    second = client.get(
+        "/api/recipes/", params={"limit": 3, "cursor": first['pagination']['next_cursor']}
+    ).json()
+    assert len(second['recipes']) == 2
+    assert second['pagination']['next_cursor'] is None
+
+
+def test_list_endpoint_rejects_deep_offset_and_bad_cursor(client):
+    """Test that deep offsets and malformed cursors return 400"""
+    assert client.get("/api/recipes/", params={"offset": 100000}).status_code == 400
+    assert client.get("/api/recipes/", params={"cursor": "garbage"}).status_code == 400
+    tampered = encode_cursor('budget', 'asc', "cheap", 1)
+    assert client.get("/api/recipes/", params={"cursor": tampered, "sort": "budget"}).status_code == 400
+    assert client.get("/api/recipes/", params={"limit": 0}).status_code == 400
@@ -0,0 +1,56 @@
+"""
+Unit tests for sparse fieldsets on recipe listings
+"""
+from unittest.mock import patch
+import pytest
+from services import recipe_query_service
+from services.recipe_serializer import SUMMARY_FIELDS, parse_listing_fields
+
+
+def test_parse_listing_fields():
+    """Test presets, ordering, implied id and unknown fields"""
+    assert parse_listing_fields(None) is None
+    assert parse_listing_fields('full') is None
+    assert parse_listing_fields('summary') == SUMMARY_FIELDS
+    assert parse_listing_fields('budget, title,like_count') == ('id', 'title', 'budget')
+    with pytest.raises(ValueError, match="secret"):
+        parse_listing_fields('title,secret')
+
+
+@pytest.mark.parametrize("snapshot_enabled", [True, False])
+def test_summary_listing_skips_large_columns(db, client, make_recipe, count_statements, snapshot_enabled):
+    """Test that projected listings neither return nor read the text columns"""
+    make_recipe(ingredients=['tofu'], instructions=['Fry'])
+    make_recipe()
+    db.expunge_all()
+
+    statements = count_statements
+    statements.clear()
+    with patch.object(recipe_query_service.CatalogSnapshotSettings, 'ENABLED', snapshot_enabled):
+        response = client.get("/api/recipes/", params={'fields': 'summary', 'limit': 1})
+    assert response.status_code == 200
+    recipe = response.json()['recipes'][0]
+    assert set(recipe) == set(SUMMARY_FIELDS) | {'like_count', 'user_has_liked'}
+
+    # Recipe row loads (the snapshot build reads only its filter columns)
+    recipe_queries = [sql for sql in statements if sql.startswith('SELECT recipes.id')]
+    assert len(recipe_queries) == 1
+    assert 'recipes.instructions' not in recipe_queries[0]
+    assert 'recipes.ingredients' not in recipe_queries[0]
+    assert response.json()['pagination']['next_cursor'] is not None
+
+
+def test_fields_on_search_and_batch(client, make_recipe):
+    """Test explicit field lists, JSON columns and validation"""
+    recipe = make_recipe(title="Tofu stir fry", ingredients=['tofu', 'rice'])
+
+    found = client.get("/api/recipes/search", params={'q': 'tofu', 'fields': 'title,ingredients'}).json()
+    assert found['recipes'] == [{
+        'id': recipe.id, 'title': "Tofu stir fry", 'ingredients': ['tofu', 'rice'],
+        'like_count': 0, 'user_has_liked': False,
+    }]
+
+    batch = client.post("/api/recipes/batch", json={'recipe_ids': [recipe.id], 'fields': 'budget'}).json()
+    assert batch['recipes'] == [{'id': recipe.id, 'budget': 5.0, 'like_count': 0, 'user_has_liked': False}]
+
+    assert client.get("/api/recipes/", params={'fields': 'title,nope'}).status_code == 400
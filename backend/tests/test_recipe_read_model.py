@@ -0,0 +1,61 @@
+"""
+Unit tests for the recipe read model
+"""
+from dataclasses import fields
+from core.models import DietaryRestriction, Recipe
+from services import recipe_serializer
+from services.recipe_query_service import get_recipes_by_ids
+from services.recipe_read_model import RECORD_COLUMNS, RecipeRecord
+from services.recipe_serializer import encode_recipe_listing, listing_columns
+
+
+def test_record_fields_follow_table_columns():
+    """Test that records can be built positionally from record_columns() rows"""
+    assert [field.name for field in fields(RecipeRecord)] == [column.key for column in RECORD_COLUMNS]
+
+
+def test_records_by_ids_skip_the_identity_map(db, make_recipe):
+    """Test order, missing ids, projections and that no entities are loaded"""
+    first = make_recipe(dietary_restrictions=DietaryRestriction.VEGAN)
+    second = make_recipe()
+    first_id, second_id = first.id, second.id
+    db.expunge_all()
+
+    records = get_recipes_by_ids(db, [second_id, 999, first_id])
+    assert [type(record) for record in records] == [RecipeRecord, RecipeRecord]
+    assert [record.id for record in records] == [second_id, first_id]
+    assert records[1].dietary_restrictions == DietaryRestriction.VEGAN
+    assert len(db.identity_map) == 0
+
+    projected, = get_recipes_by_ids(db, [first_id], [Recipe.id, Recipe.title])
+    assert projected.title == "Recipe 1"
+    assert projected.ingredients is None and projected.budget is None
+
+
+def test_records_serialize_like_entities(db, make_recipe):
+    """Test that a record encodes to the same listing JSON as its entity"""
+    recipe = make_recipe(ingredients=['tofu'], instructions=['Fry', 'Serve'])
+    record, = get_recipes_by_ids(db, [recipe.id])
+
+    recipe_serializer._listing_fragment_cache.clear()
+    from_entity = encode_recipe_listing(recipe, 3, True)
+    recipe_serializer._listing_fragment_cache.clear()
+    assert encode_recipe_listing(record, 3, True) == from_entity
+
+    summary = ('id', 'title', 'difficulty')
+    projected, = get_recipes_by_ids(db, [recipe.id], listing_columns(summary))
+    assert encode_recipe_listing(projected, 0, False, summary) == encode_recipe_listing(recipe, 0, False, summary)
+
+
+def test_liked_recipes_returns_rows(client, make_recipe, make_user, make_like):
+    """Test the liked recipes body keeps the table columns"""
+    user = make_user("alice")
+    recipe = make_recipe(ingredients=['rice'])
+    make_recipe()
+    make_like(user, recipe)
+
+    liked = client.get(f"/api/recipes/liked/{user.id}").json()
+    assert [row['id'] for row in liked] == [recipe.id]
+    assert liked[0]['ingredients'] == '["rice"]'
+    assert liked[0]['difficulty'] == 'easy'
+    assert liked[0]['like_count'] == 1
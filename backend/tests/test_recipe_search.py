@@ -0,0 +1,78 @@
+"""
+Unit tests for FTS5 recipe search
+"""
+import pytest
+from core.models import DietaryRestriction
+from services.recipe_search_service import SEARCH_WINDOW, build_match_expression, search_recipe_ids
+
+
+def test_match_expression_quotes_words_as_prefixes():
+    """Test that user input becomes quoted prefix terms with operators stripped"""
+    assert build_match_expression('Chick "curry" OR NEAR(') == '"chick"* "curry"* "or"* "near"*'
+    assert build_match_expression("  ?! ") is None
+
+
+def test_triggers_keep_index_in_sync(db, make_recipe):
+    """Test that inserts, updates and deletes on recipes reach the FTS index"""
+    recipe = make_recipe(title="Mapo Tofu", ingredients=['tofu', 'ground pork'])
+    assert search_recipe_ids(db, "tofu")[0] == [recipe.id]
+
+    recipe.title = "Sichuan Beancurd"
+    recipe.ingredients = '["beancurd", "ground pork"]'
+    db.commit()
+    assert search_recipe_ids(db, "tofu")[0] == []
+    assert search_recipe_ids(db, "beancurd")[0] == [recipe.id]
+
+    db.delete(recipe)
+    db.commit()
+    assert search_recipe_ids(db, "beancurd")[0] == []
+
+
+def test_prefix_match_and_title_ranking(db, make_recipe):
+    """Test that partial words match and title hits outrank ingredient hits"""
+    in_ingredients = make_recipe(title="Fried Rice", ingredients=['chicken breast', 'rice'])
+    in_title = make_recipe(title="Chicken Curry", ingredients=['onion', 'curry paste'])
+    make_recipe(title="Veggie Bowl", ingredients=['beans'])
+
+    ids, has_more = search_recipe_ids(db, "chick")
+
+    assert ids == [in_title.id, in_ingredients.id]
+    assert not has_more
+
+
+def test_filters_and_pagination(db, make_recipe):
+    """Test that budget/time/diet filters apply and pages follow one ordering"""
+    matches = [
+        make_recipe(title=f"Pasta {i}", budget=5.0, cooking_time=20) for i in range(5)
+    ]
+    make_recipe(title="Pasta Deluxe", budget=50.0)
+    make_recipe(title="Slow Pasta", cooking_time=120)
+    vegan = make_recipe(title="Vegan Pasta", dietary_restrictions=DietaryRestriction.VEGAN)
+
+    first, has_more = search_recipe_ids(db, "pasta", limit=3, budget=10.0, cooking_time=30)
+    second, more_after = search_recipe_ids(db, "pasta", limit=3, offset=3, budget=10.0, cooking_time=30)
+    assert has_more and not more_after
+    assert sorted(first + second) == sorted([r.id for r in matches] + [vegan.id])
+
+    ids, _ = search_recipe_ids(db, "pasta", dietary_restrictions=DietaryRestriction.VEGAN)
+    assert ids == [vegan.id]
+
+    # Every reachable page is a slice of the cached window
+    with pytest.raises(ValueError):
+        search_recipe_ids(db, "pasta", limit=2, offset=SEARCH_WINDOW - 2)
+
+
+def test_search_endpoint(client, make_recipe):
+    """Test /api/recipes/search results and validation"""
+    recipe = make_recipe(title="Overnight Oats", cuisine="Scottish")
+
+    response = client.get("/api/recipes/search", params={"q": "scot"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [r['id'] for r in body['recipes']] == [recipe.id]
+    assert body['pagination']['has_more'] is False
+
+    assert client.get("/api/recipes/search", params={"q": "!!"}).status_code == 400
+    assert client.get(
+        "/api/recipes/search", params={"q": "oats", "dietary_restrictions": "carnivore"}
+    ).status_code == 400
@@ -0,0 +1,112 @@
+"""
+Unit tests for recommendation page/count queries
+"""
+from unittest.mock import patch
+from core.config import CatalogSnapshotSettings
+from core.models import DietaryRestriction
+from services import recipe_query_service
+from services.recipe_query_service import get_filtered_recipes_page
+from services.recommendation_service import get_recipe_recommendations
+
+
+def _make_catalog(make_recipe):
+    for budget in (2.0, 4.0, 6.0, 8.0, 30.0):
+        make_recipe(budget=budget)
+    make_recipe(budget=3.0, dietary_restrictions=DietaryRestriction.VEGAN)
+
+
+def test_page_and_total(db, make_recipe):
+    """Test that the total matches the filter and drives has_more"""
+    recipe_query_service._filter_count_cache.clear()
+    _make_catalog(make_recipe)
+
+    page, total, has_more = get_filtered_recipes_page(
+        db, None, 10.0, 60, DietaryRestriction.NONE, limit=2, offset=0
+    )
+    assert len(page) == 2 and total == 5 and has_more
+
+    page, total, has_more = get_filtered_recipes_page(
+        db, None, 10.0, 60, DietaryRestriction.NONE, limit=2, offset=4
+    )
+    assert len(page) == 1 and total == 5 and not has_more
+
+    _, total, _ = get_filtered_recipes_page(
+        db, None, 10.0, 60, DietaryRestriction.VEGAN, limit=2, offset=0
+    )
+    assert total == 1
+
+
+@patch.object(CatalogSnapshotSettings, 'ENABLED', False)
+def test_total_is_cached_per_catalog_version(db, make_recipe):
+    """Test that database-path totals are reused until the catalog changes"""
+    recipe_query_service._filter_count_cache.clear()
+    _make_catalog(make_recipe)
+
+    get_filtered_recipes_page(db, None, 10.0, 60, DietaryRestriction.NONE, limit=2)
+    hits = recipe_query_service._filter_count_cache.hits
+    _, total, _ = get_filtered_recipes_page(db, None, 10.0, 60, DietaryRestriction.NONE, limit=2, offset=20)
+    assert recipe_query_service._filter_count_cache.hits == hits + 1
+    assert total == 5
+
+    make_recipe(budget=1.0)  # commit bumps the catalog version
+    _, total, _ = get_filtered_recipes_page(db, None, 10.0, 60, DietaryRestriction.NONE, limit=2)
+    assert total == 6
+
+
+def test_skip_total_uses_limit_plus_one(db, make_recipe):
+    """Test that has_more is exact without computing a total"""
+    _make_catalog(make_recipe)
+
+    page, total, has_more = get_filtered_recipes_page(
+        db, None, 10.0, 60, DietaryRestriction.NONE, limit=5, include_total=False
+    )
+    assert total is None and len(page) == 5 and not has_more
+
+    page, total, has_more = get_filtered_recipes_page(
+        db, None, 10.0, 60, DietaryRestriction.NONE, limit=4, include_total=False
+    )
+    assert total is None and len(page) == 4 and has_more
+
+
+def test_pages_follow_global_like_ranking(db, make_recipe, make_user, make_like):
+    """Test that pages slice one ranking: most liked first, then by id"""
+    users = [make_user(f"user{i}") for i in range(4)]
+    recipes = [make_recipe() for _ in range(7)]
+    for recipe, likes in zip(recipes, [0, 3, 1, 3, 0, 2, 1]):
+        for user in users[:likes]:
+            make_like(user, recipe)
+
+    ids = []
+    for offset in range(0, 7, 3):
+        page, _, _ = get_filtered_recipes_page(
+            db, None, 10.0, 60, DietaryRestriction.NONE, limit=3, offset=offset
+        )
+        ids.extend(recipe.id for recipe, _, _ in page)
+
+    expected = [recipes[i].id for i in (1, 3, 5, 2, 6, 0, 4)]
+    assert ids == expected
+
+
+def test_pinned_ai_picks_lead_without_duplicates(db, make_recipe, make_user):
+    """Test that pinned AI picks open the ranking and are not repeated later"""
+    user = make_user("alice")
+    recipes = [make_recipe() for _ in range(5)]
+    too_expensive = make_recipe(budget=99.0)
+    ai_picks = [
+        {'recipe': recipes[3], 'similarity_score': 0.7},
+        {'recipe': too_expensive, 'similarity_score': 0.9},
+        {'recipe': recipes[4], 'similarity_score': 0.8},
+    ]
+
+    with patch('services.recommendation_service.ai_service') as ai_service, \
+            patch('services.recommendation_service.AI_AVAILABLE', True):
+        ai_service.get_ai_recommendations.return_value = ai_picks
+        first = get_recipe_recommendations(db, user.id, 10.0, 60, DietaryRestriction.NONE, limit=3)
+        second = get_recipe_recommendations(
+            db, user.id, 10.0, 60, DietaryRestriction.NONE, limit=3, offset=3
+        )
+
+    ids = [r['id'] for r in first['recipes'] + second['recipes']]
+    assert ids[:2] == [recipes[4].id, recipes[3].id]
+    assert sorted(ids) == sorted(r.id for r in recipes)
+    assert first['total_count'] == 5 and first['has_more'] and not second['has_more']
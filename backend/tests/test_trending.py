@@ -0,0 +1,112 @@
+"""
+Unit tests for time-decayed trending scores
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from core.config import TrendingSettings
+from core.models import Like
+from services import trending
+from services.like_service import add_like, reconcile_like_counts, remove_like, write_like_batch
+from services.trending import TrendingScores
+
+HALF_LIFE = TrendingSettings.HALF_LIFE_HOURS * 3600
+
+
+def test_scores_decay_and_follow_like_events():
+    """Test half-life weighting, O(1) updates and reference rebasing"""
+    now = 1_700_000_000.0
+    scores = TrendingScores.from_likes(np.array([1, 1, 2]), np.array([now, now - HALF_LIFE, now]), now)
+    page, total = scores.page(10, now=now)
+    assert total == 2
+    assert page == [(1, pytest.approx(1.5)), (2, pytest.approx(1.0))]
+
+    scores.record(2, now, 1)
+    scores.record(1, now - HALF_LIFE, -1)
+    with patch.object(TrendingSettings, 'RERANK_INTERVAL_SECONDS', 0):
+        assert scores.page(10, now=now)[0] == [(2, pytest.approx(2.0)), (1, pytest.approx(1.0))]
+
+        # Far beyond the reference: weights are rebased instead of overflowing
+        later = now + 100 * HALF_LIFE
+        scores.record(3, later, 1)
+        assert scores.page(10, now=later)[0] == [(3, pytest.approx(1.0))]
+
+
+def _like_at(db, user, recipe, created_at):
+    db.add(Like(user_id=user.id, recipe_id=recipe.id, created_at=created_at))
+    db.commit()
+
+
+def test_trending_endpoint_prefers_recent_likes(db, client, make_recipe, make_user):
+    """Test that recent likes outrank older ones and new likes are picked up"""
+    old, fresh, unliked = make_recipe(), make_recipe(), make_recipe()
+    users = [make_user(f"user{i}") for i in range(4)]
+    three_half_lives_ago = datetime.utcnow() - timedelta(hours=3 * TrendingSettings.HALF_LIFE_HOURS)
+    for user in users[:3]:
+        _like_at(db, user, old, three_half_lives_ago)
+    _like_at(db, users[0], fresh, datetime.utcnow())
+    old_id, fresh_id, user_id = old.id, fresh.id, users[0].id
+
+    body = client.get(f"/api/recipes/trending?user_id={user_id}").json()
+    assert [recipe['id'] for recipe in body['recipes']] == [fresh_id, old_id]
+    assert body['recipes'][0]['trending_score'] == pytest.approx(1.0, abs=1e-3)
+    assert body['recipes'][1]['trending_score'] == pytest.approx(0.375, abs=1e-3)
+    assert body['recipes'][0]['user_has_liked'] is True
+    assert body['total_count'] == 2
+    assert unliked.id not in [recipe['id'] for recipe in body['recipes']]
+
+    with patch.object(TrendingSettings, 'RERANK_INTERVAL_SECONDS', 0):
+        add_like(db, users[3].id, old_id)
+        assert [r['id'] for r in client.get("/api/recipes/trending").json()['recipes']] == [old_id, fresh_id]
+        remove_like(db, users[3].id, old_id)
+        assert [r['id'] for r in client.get("/api/recipes/trending").json()['recipes']] == [fresh_id, old_id]
+
+    assert client.get("/api/recipes/trending?limit=0").status_code == 400
+
+
+def test_scores_load_from_the_likes_that_exist(db, make_recipe, make_user):
+    """Test that scores built after a restart leave out likes removed before it"""
+    recipe, other = make_recipe(), make_recipe()
+    alice, bob = make_user("alice"), make_user("bob")
+    _like_at(db, alice, recipe, datetime.utcnow() - timedelta(hours=TrendingSettings.HALF_LIFE_HOURS))
+    _like_at(db, bob, other, datetime.utcnow())
+    trending.get_trending_scores(db)
+    remove_like(db, bob.id, other.id)
+
+    trending.reset_trending_scores()
+    page, total = trending.get_trending_page(db, 10)
+    assert total == 1
+    assert page == [(recipe.id, pytest.approx(0.5, rel=1e-3))]
+
+
+def test_batch_records_only_inserted_likes(db, make_recipe, make_user):
+    """Test that likes skipped by the batch insert do not reach the scores"""
+    recipe, alice = make_recipe(), make_user("alice")
+    now = datetime.utcnow()
+    _like_at(db, alice, recipe, now)
+    trending.get_trending_scores(db)
+
+    write_like_batch(db, likes=[(alice.id, recipe.id, now), (alice.id, 999, now), (999, recipe.id, now)], unlikes=[])
+    assert trending.get_trending_page(db, 10)[0] == [(recipe.id, pytest.approx(1.0, abs=1e-3))]
+    assert db.query(Like).count() == 1
+
+
+def test_cold_start_uses_trending_then_all_time(db, make_recipe, make_user):
+    """Test that new users get trending recipes before all-time favourites"""
+    from services.ai_recommendation_service import AIRecommendationService
+
+    classic, recent = make_recipe(), make_recipe()
+    users = [make_user(f"user{i}") for i in range(3)]
+    long_ago = datetime.utcnow() - timedelta(days=365)
+    for user in users[:2]:
+        _like_at(db, user, classic, long_ago)
+    _like_at(db, users[2], recent, datetime.utcnow())
+    reconcile_like_counts(db)
+
+    picks = AIRecommendationService()._get_popular_recipes_for_new_users(db, limit=2)
+    assert [pick['recipe_id'] for pick in picks] == [recent.id, classic.id]
+    assert picks[0]['similarity_score'] > picks[1]['similarity_score']
+    assert picks[1]['trending_score'] == 0.0
@@ -0,0 +1,101 @@
+"""
+Unit tests for the per-user liked-set cache
+"""
+from unittest.mock import patch
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from core.config import CacheSettings
+from services.like_buffer import start_like_write_buffer, stop_like_write_buffer
+from services.like_service import add_like, remove_like
+from services.recipe_query_service import get_user_liked_recipe_ids
+from services.user_liked_cache import get_user_liked_set
+
+
+def test_membership_is_loaded_once_and_follows_writes(db, make_recipe, make_user, make_like, count_statements):
+    """Test that only the first check queries and likes/unlikes update the cached set"""
+    first, second = make_recipe(), make_recipe()
+    alice = make_user("alice")
+    make_like(alice, first)
+    alice_id, ids = alice.id, [first.id, second.id]
+
+    statements = count_statements
+    statements.clear()
+    assert get_user_liked_recipe_ids(db, alice_id, ids) == {ids[0]}
+    assert len(statements) == 1
+    assert get_user_liked_recipe_ids(db, alice_id, ids) == {ids[0]}
+    assert len(statements) == 1
+
+    add_like(db, alice_id, ids[1])
+    remove_like(db, alice_id, ids[0])
+    statements.clear()
+    assert get_user_liked_recipe_ids(db, alice_id, ids) == {ids[1]}
+    assert statements == []
+
+
+def test_cached_sets_expire_to_pick_up_outside_writes(db, make_recipe, make_user):
+    """Test that likes written behind like_service's back appear once the entry expires"""
+    recipe, alice = make_recipe(), make_user("alice")
+    assert get_user_liked_set(db, alice.id) == set()
+
+    db.execute(text("INSERT INTO likes (user_id, recipe_id) VALUES (:user_id, :recipe_id)"),
+               {'user_id': alice.id, 'recipe_id': recipe.id})
+    db.commit()
+    assert get_user_liked_set(db, alice.id) == set()
+    with patch.object(CacheSettings, 'USER_LIKED_SET_TTL_SECONDS', 0):
+        assert get_user_liked_set(db, alice.id) == {recipe.id}
+
+
+def test_like_info_uses_cached_set(db, client, make_recipe, make_user, make_like, count_statements):
+    """Test that the like info route checks membership without a likes query"""
+    recipe, alice = make_recipe(), make_user("alice")
+    make_like(alice, recipe)
+    client.get(f"/api/recipes/{recipe.id}/likes/{alice.id}")
+
+    statements = count_statements
+    statements.clear()
+    info = client.get(f"/api/recipes/{recipe.id}/likes/{alice.id}").json()
+    assert info['user_has_liked'] is True
+    assert not any('FROM likes' in statement for statement in statements)
+
+    stats = client.get("/health/caches").json()['user_liked_sets']
+    assert stats['size'] == 1 and stats['hits'] >= 1
+
+
+def test_buffered_flush_updates_cached_set(db, make_recipe, make_user):
+    """Test that likes written by the write-behind buffer reach cached sets"""
+    recipe, alice = make_recipe(), make_user("alice")
+    assert get_user_liked_set(db, alice.id) == set()
+
+    buffer = start_like_write_buffer(sessionmaker(bind=db.get_bind()), start_thread=False)
+    try:
+        buffer.enqueue(db, alice.id, recipe.id, liked=True)
+        assert get_user_liked_recipe_ids(db, alice.id, [recipe.id]) == {recipe.id}
+        buffer.flush()
+    finally:
+        stop_like_write_buffer(flush=False)
+
+    assert get_user_liked_set(db, alice.id) == {recipe.id}
+
+
+def test_ai_recommendations_see_buffered_likes(db, make_recipe, make_user, make_like):
+    """Test that the AI service's liked set includes queued likes and unlikes"""
+    from services.ai_recommendation_service import AIRecommendationService
+
+    first, second = make_recipe(), make_recipe()
+    alice = make_user("alice")
+    make_like(alice, first)
+    cached = get_user_liked_set(db, alice.id)
+    service = AIRecommendationService()
+
+    buffer = start_like_write_buffer(sessionmaker(bind=db.get_bind()), start_thread=False)
+    try:
+        buffer.enqueue(db, alice.id, second.id, liked=True)
+        buffer.enqueue(db, alice.id, first.id, liked=False)
+        assert service._get_liked_recipe_ids(db, alice.id) == {second.id}
+    finally:
+        stop_like_write_buffer(flush=False)
+
+    assert cached == {first.id}
+    assert service._get_liked_recipe_ids(db, alice.id) == {first.id}
@@ -18,4 +18,12 @@ export const unlikeRecipe = async (recipeId, userId) => {
 export const getUserLikedRecipes = async (userId) => {
   const response = await axios.get(`/api/recipes/liked/${userId}`);
   return response.data;
-};
\ No newline at end of file
+};
+
+// Like counts and user_has_liked for many recipes (e.g. a page of cards) in one request
+export const getRecipeLikesBulk = async (recipeIds, userId = null) => {
+  const body = { recipe_ids: recipeIds };
+  if (userId) body.user_id = userId;
+  const response = await axios.post("/api/recipes/likes/bulk", body);
+  return response.data;
+};
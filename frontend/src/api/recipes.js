@@ -1,11 +1,21 @@
 import axios from "./axios";
 
-export const getAllRecipes = async (userId = null) => {
-  const params = userId ? { user_id: userId } : {};
+// Recipe cards only need the summary projection
+export const getAllRecipes = async (userId = null, cursor = null) => {
+  const params = { fields: "summary" };
+  if (userId) params.user_id = userId;
+  if (cursor) params.cursor = cursor;
   const recipes_res = await axios.get("/api/recipes", { params });
   return recipes_res.data;
 };
 
+export const searchRecipes = async (query, userId = null, offset = 0) => {
+  const params = { q: query, offset, fields: "summary" };
+  if (userId) params.user_id = userId;
+  const search_res = await axios.get("/api/recipes/search", { params });
+  return search_res.data;
+};
+
 export const getRecommendations = async (userId, params = {}) => {
   const recommend_res = await axios.get(`/api/recipes/recommend/${userId}`, { params });
   return recommend_res.data;
@@ -15,3 +25,10 @@ export const getRecipeDetail = async (recipe_id) => {
   const recipeDetail_res = await axios.get(`/api/recipes/${recipe_id}`);
   return recipeDetail_res.data;
 };
+
+export const getRecipesBatch = async (recipeIds, userId = null) => {
+  const body = { recipe_ids: recipeIds };
+  if (userId) body.user_id = userId;
+  const batch_res = await axios.post("/api/recipes/batch", body);
+  return batch_res.data;
+};
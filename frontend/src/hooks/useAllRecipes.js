@@ -1,21 +1,25 @@
 import { useState, useEffect } from "react";
-import { getAllRecipes } from "../api/recipes";
+import { getAllRecipes, searchRecipes } from "../api/recipes";
 import { likeRecipe, unlikeRecipe } from "../api/likes";
 
 export const useAllRecipes = (user) => {
-  // States: recipes, loading, error
+  // States: recipes, loading, error, nextCursor, searchQuery, searchHasMore
   const [recipes, setRecipes] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
+  const [nextCursor, setNextCursor] = useState(null);
+  const [searchQuery, setSearchQuery] = useState("");
+  const [searchHasMore, setSearchHasMore] = useState(false);
 
-  // Functions: fetchAllRecipes
+  // Functions: fetchAllRecipes (first page)
   const fetchAllRecipes = async () => {
     setLoading(true);
     setError(null);
 
     try {
       const response = await getAllRecipes(user?.id);
-      setRecipes(response);
+      setRecipes(response.recipes);
+      setNextCursor(response.pagination.next_cursor);
     } catch (error) {
       setError("Failed to fetch recipes");
       console.error("Error fetching all recipes: ", error);
@@ -24,9 +28,57 @@ export const useAllRecipes = (user) => {
     }
   };
 
+  // Function: search (server-side full-text search; empty query shows all)
+  const search = async (query) => {
+    const trimmed = query.trim();
+    setSearchQuery(trimmed);
+    if (!trimmed) {
+      setSearchHasMore(false);
+      fetchAllRecipes();
+      return;
+    }
+
+    setLoading(true);
+    setError(null);
+
+    try {
+      const response = await searchRecipes(trimmed, user?.id);
+      setRecipes(response.recipes);
+      setSearchHasMore(response.pagination.has_more);
+    } catch (error) {
+      setError("Failed to search recipes");
+      console.error("Error searching recipes: ", error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Function: loadMore (append the next page using the cursor or search offset)
+  const loadMore = async () => {
+    if (searchQuery) {
+      try {
+        const response = await searchRecipes(searchQuery, user?.id, recipes.length);
+        setRecipes((prevRecipes) => [...prevRecipes, ...response.recipes]);
+        setSearchHasMore(response.pagination.has_more);
+      } catch (error) {
+        console.error("Error fetching more search results: ", error);
+      }
+      return;
+    }
+    if (!nextCursor) return;
+
+    try {
+      const response = await getAllRecipes(user?.id, nextCursor);
+      setRecipes((prevRecipes) => [...prevRecipes, ...response.recipes]);
+      setNextCursor(response.pagination.next_cursor);
+    } catch (error) {
+      console.error("Error fetching more recipes: ", error);
+    }
+  };
+
   // Effects: fetch recipes on mount and when user changes
   useEffect(() => {
-    fetchAllRecipes();
+    search(searchQuery);
   }, [user?.id]); //Refetch when user ID changes
 
   // Function: handleToggleLike
@@ -81,6 +133,10 @@ export const useAllRecipes = (user) => {
     recipes,
     loading,
     error,
+    hasMore: searchQuery ? searchHasMore : nextCursor !== null,
+    loadMore,
+    searchQuery,
+    search,
     handleToggleLike,
   };
 };
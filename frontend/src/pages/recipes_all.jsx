@@ -6,7 +6,17 @@ import RecipeDetail from "./recipes_detail";
 
 // 2. Hook and state
 const RecipesAll = ({ user }) => {
-  const { recipes, loading, error, handleToggleLike } = useAllRecipes(user);
+  const {
+    recipes,
+    loading,
+    error,
+    hasMore,
+    loadMore,
+    searchQuery,
+    search,
+    handleToggleLike,
+  } = useAllRecipes(user);
+  const [searchInput, setSearchInput] = useState(searchQuery);
   const [selectedRecipeId, setSelectedRecipeId] = useState(null);
   const [showDetail, setShowDetail] = useState(false);
 
@@ -21,6 +31,11 @@ const RecipesAll = ({ user }) => {
     setShowDetail(false);
   };
 
+  const handleSearch = (e) => {
+    e.preventDefault();
+    search(searchInput);
+  };
+
   // 4. Show recipe detail if selected
   if (showDetail && selectedRecipeId !== null) {
     return (
@@ -54,6 +69,23 @@ const RecipesAll = ({ user }) => {
           </p>
         </div>
 
+        {/* Search */}
+        <form onSubmit={handleSearch} className="flex justify-center gap-2 mb-8">
+          <input
+            type="search"
+            value={searchInput}
+            onChange={(e) => setSearchInput(e.target.value)}
+            placeholder="Search recipes, cuisines or ingredients..."
+            className="w-full max-w-md px-4 py-2 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-red-500"
+          />
+          <button
+            type="submit"
+            className="px-6 py-2 bg-red-600 text-white rounded-lg hover:bg-red-700 transition-colors"
+          >
+            Search
+          </button>
+        </form>
+
         {/* Use existing RecipeGrid component */}
         <div className="w-full overflow-hidden">
           <RecipeGrid
@@ -65,6 +97,18 @@ const RecipesAll = ({ user }) => {
             onViewRecipe={handleViewRecipe}
           />
         </div>
+
+        {/* Load next page */}
+        {hasMore && (
+          <div className="text-center mt-8">
+            <button
+              onClick={loadMore}
+              className="px-6 py-2 bg-red-600 text-white rounded-lg hover:bg-red-700 transition-colors"
+            >
+              Load more recipes
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );